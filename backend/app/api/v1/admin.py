@@ -1,33 +1,29 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from app.schemas.user import UserOut
-from app.repositories import user_repo
-from app.services.auth_service import decode_token
-from typing import List
+from app.repositories import user_repo, analytics_rollup_repo
+from app.services import archive_service
+from app.core.auth import get_admin_user
+from typing import List, Optional
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
-def get_admin_user(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    user = decode_token(token)
-    if not user or 'admin' not in user.roles:
-        raise HTTPException(status_code=403, detail="Admin access required")
-    return user
-
 @router.get("/users", response_model=List[UserOut])
-async def list_users(admin=Depends(get_admin_user)):
-    from app.db.connection import fetch_all
-    rows = await fetch_all("SELECT id, email, full_name, profile_photo, created_at, updated_at FROM users ORDER BY id")
-    users = []
-    for row in rows:
-        user_data = await user_repo.get_user_by_id(row['id'])
-        if user_data:
-            users.append(user_data)
+async def list_users(
+    response: Response,
+    after: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    approved: Optional[bool] = None,
+    role: Optional[str] = None,
+    admin=Depends(get_admin_user)
+):
+    users = await user_repo.list_users(after_id=after, limit=limit, is_approved=approved, role=role)
+    if len(users) == limit:
+        response.headers["X-Next-Cursor"] = str(users[-1].id)
     return users
 
 @router.delete("/users/{user_id}")
 async def delete_user(user_id: int, admin=Depends(get_admin_user)):
-    from app.db.connection import execute
-    await execute("DELETE FROM users WHERE id = $1", user_id)
+    await user_repo.delete_user(user_id)
     return {"message": "User deleted"}
 
 @router.post("/users/{user_id}/approve")
@@ -39,3 +35,18 @@ async def approve_user(user_id: int, admin=Depends(get_admin_user)):
 async def update_roles(user_id: int, roles: List[str], admin=Depends(get_admin_user)):
     await user_repo.update_user_roles(user_id, roles)
     return {"message": "Roles updated"}
+
+@router.post("/auctions/{auction_id}/rebuild-analytics")
+async def rebuild_auction_analytics(auction_id: int, admin=Depends(get_admin_user)):
+    await analytics_rollup_repo.rebuild(auction_id)
+    return {"message": "Analytics rebuilt"}
+
+@router.post("/auctions/{auction_id}/archive")
+async def archive_auction(auction_id: int, admin=Depends(get_admin_user)):
+    """Compact a completed auction's bid and event partitions into the archive"""
+    try:
+        return await archive_service.archive_auction(auction_id)
+    except archive_service.AuctionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except archive_service.ArchiveError as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from app.core.auth import get_current_user
 from app.repositories.analytics_repo import AnalyticsRepository
-from app.core.database import get_db_pool
+from app.repositories import analytics_rollup_repo
+from app.core.database import get_read_db_pool
+from app.services import analytics_service
+from app.config.settings import settings
 import asyncpg
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
@@ -10,8 +13,10 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
 async def get_auction_summary(
     auction_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
+    if await analytics_rollup_repo.has_rollups(auction_id):
+        return await analytics_rollup_repo.get_auction_summary(auction_id)
     repo = AnalyticsRepository(pool)
     return await repo.get_auction_summary(auction_id)
 
@@ -19,8 +24,10 @@ async def get_auction_summary(
 async def get_team_spending(
     auction_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
+    if await analytics_rollup_repo.has_rollups(auction_id):
+        return await analytics_rollup_repo.get_team_spending(auction_id)
     repo = AnalyticsRepository(pool)
     return await repo.get_team_spending(auction_id)
 
@@ -29,8 +36,10 @@ async def get_most_expensive_players(
     auction_id: int,
     limit: int = 10,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
+    if await analytics_rollup_repo.has_rollups(auction_id):
+        return await analytics_rollup_repo.get_most_expensive_players(auction_id, limit)
     repo = AnalyticsRepository(pool)
     return await repo.get_most_expensive_players(auction_id, limit)
 
@@ -38,8 +47,10 @@ async def get_most_expensive_players(
 async def get_position_spending(
     auction_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
+    if await analytics_rollup_repo.has_rollups(auction_id):
+        return await analytics_rollup_repo.get_position_wise_spending(auction_id)
     repo = AnalyticsRepository(pool)
     return await repo.get_position_wise_spending(auction_id)
 
@@ -47,8 +58,10 @@ async def get_position_spending(
 async def get_bidding_activity(
     auction_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
+    if await analytics_rollup_repo.has_rollups(auction_id):
+        return await analytics_rollup_repo.get_bidding_activity(auction_id)
     repo = AnalyticsRepository(pool)
     return await repo.get_bidding_activity(auction_id)
 
@@ -57,7 +70,7 @@ async def get_squad_composition(
     team_id: int,
     auction_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
     repo = AnalyticsRepository(pool)
     return await repo.get_squad_composition(team_id, auction_id)
@@ -66,7 +79,23 @@ async def get_squad_composition(
 async def get_unsold_players(
     auction_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
+    if await analytics_rollup_repo.has_rollups(auction_id):
+        return await analytics_rollup_repo.get_unsold_players(auction_id)
     repo = AnalyticsRepository(pool)
     return await repo.get_unsold_players(auction_id)
+
+@router.get("/auctions/{auction_id}/dashboard")
+async def get_auction_dashboard(
+    auction_id: int,
+    current_user: dict = Depends(get_current_user),
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
+):
+    """Summary, team spending, top players, position spending, bidding activity and unsold players in one response"""
+    body = await analytics_service.get_dashboard(auction_id, pool)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": f"private, max-age={int(settings.analytics_dashboard_cache_seconds)}"}
+    )
@@ -1,19 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends
 from app.schemas.auction import AuctionCreate, AuctionOut, AuctionStateOut
 from app.schemas.snapshot import AuctionSnapshot
 from app.services import auction_service, snapshot_service
-from app.services.auth_service import decode_token
-from typing import Annotated
+from app.core.auth import get_current_user
+from app.core.shard_routing import route_to_owner
 
 router = APIRouter(prefix="/auctions", tags=["auctions"])
 
-def get_current_user(authorization: Annotated[str, Header()]):
-    token = authorization.replace("Bearer ", "")
-    user = decode_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return user
-
 @router.post("", response_model=AuctionOut)
 async def create_auction(auction: AuctionCreate, user=Depends(get_current_user)):
     return await auction_service.create_auction(auction)
@@ -39,31 +32,31 @@ async def get_auction_state(auction_id: int):
         raise HTTPException(status_code=404, detail="Auction not found")
     return state
 
-@router.post("/{auction_id}/start")
+@router.post("/{auction_id}/start", dependencies=[Depends(route_to_owner)])
 async def start_auction(auction_id: int, user=Depends(get_current_user)):
     success = await auction_service.start_auction(auction_id)
     if not success:
         raise HTTPException(status_code=400, detail="Cannot start auction")
     return {"message": "Auction started"}
 
-@router.post("/{auction_id}/next")
+@router.post("/{auction_id}/next", dependencies=[Depends(route_to_owner)])
 async def next_player(auction_id: int, user=Depends(get_current_user)):
     player_id = await auction_service.next_player(auction_id)
     if player_id:
         return {"message": "Moved to next player", "player_id": player_id}
     return {"message": "Auction completed"}
 
-@router.post("/{auction_id}/pause")
+@router.post("/{auction_id}/pause", dependencies=[Depends(route_to_owner)])
 async def pause_auction(auction_id: int, user=Depends(get_current_user)):
     await auction_service.pause_auction(auction_id)
     return {"message": "Auction paused"}
 
-@router.post("/{auction_id}/resume")
+@router.post("/{auction_id}/resume", dependencies=[Depends(route_to_owner)])
 async def resume_auction(auction_id: int, user=Depends(get_current_user)):
     await auction_service.resume_auction(auction_id)
     return {"message": "Auction resumed"}
 
-@router.post("/{auction_id}/complete")
+@router.post("/{auction_id}/complete", dependencies=[Depends(route_to_owner)])
 async def complete_auction(auction_id: int, user=Depends(get_current_user)):
     await auction_service.complete_auction(auction_id)
     return {"message": "Auction completed"}
@@ -1,12 +1,12 @@
-from fastapi import APIRouter, HTTPException, Header, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
 from pydantic import BaseModel
 from app.schemas.auth import LoginRequest, TokenResponse
 from app.schemas.user import UserCreate, UserOut, UserUpdate
 from app.repositories import user_repo
-from app.services.auth_service import hash_password, validate_password, create_tokens, decode_token
+from app.services.auth_service import hash_password, validate_password, create_tokens, PasswordHasherBusy
+from app.core.auth import get_current_user_profile as get_current_user
+from app.services.blob_store import store_image, media_url
 from typing import Annotated
-import base64
-import uuid
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -17,16 +17,17 @@ class PasswordChangeRequest(BaseModel):
     current_password: str
     new_password: str
 
-async def get_current_user(authorization: Annotated[str, Header()]) -> UserOut:
-    token = authorization.replace("Bearer ", "")
-    token_data = decode_token(token)
-    if not token_data:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user = await user_repo.get_user_by_id(token_data.user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
+async def _hash_or_503(password: str) -> str:
+    try:
+        return await hash_password(password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+async def _validate_or_503(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await validate_password(plain_password, hashed_password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 @router.post("/register", response_model=UserOut)
 async def register(user: UserCreate):
@@ -34,7 +35,7 @@ async def register(user: UserCreate):
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    password_hash = hash_password(user.password)
+    password_hash = await _hash_or_503(user.password)
     new_user = await user_repo.create_user(user, password_hash)
     await user_repo.assign_role(new_user.id, "team_owner")
     
@@ -43,7 +44,7 @@ async def register(user: UserCreate):
 @router.post("/login", response_model=TokenResponse)
 async def login(credentials: LoginRequest):
     user = await user_repo.get_user_by_email(credentials.email)
-    if not user or not validate_password(credentials.password, user["password_hash"]):
+    if not user or not await _validate_or_503(credentials.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     if not user.get("is_approved", False):
@@ -74,12 +75,15 @@ async def upload_photo(current_user: Annotated[UserOut, Depends(get_current_user
     if len(contents) > 5 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="File size must be less than 5MB")
     
-    base64_image = base64.b64encode(contents).decode('utf-8')
-    data_url = f"data:{file.content_type};base64,{base64_image}"
-    
-    updated_user = await user_repo.update_user(current_user.id, UserUpdate(profile_photo=data_url))
-    
-    return {"photo_url": data_url}
+    try:
+        key = await store_image(contents)
+    except Exception:
+        raise HTTPException(status_code=400, detail="File must be a valid image")
+
+    photo_url = media_url(key)
+    await user_repo.update_user(current_user.id, UserUpdate(profile_photo=photo_url))
+
+    return {"photo_url": photo_url}
 
 @router.put("/profile", response_model=UserOut)
 async def update_profile_name(
@@ -93,10 +97,10 @@ async def change_password(data: PasswordChangeRequest, current_user: Annotated[U
     user = await user_repo.get_user_by_id(current_user.id)
     user_dict = dict(user)
     
-    if not validate_password(data.current_password, user_dict["password_hash"]):
+    if not await _validate_or_503(data.current_password, user_dict["password_hash"]):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
-    new_hash = hash_password(data.new_password)
+    new_hash = await _hash_or_503(data.new_password)
     await user_repo.update_password(current_user.id, new_hash)
     
     return {"message": "Password changed successfully"}
@@ -1,34 +1,33 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from app.schemas.bid import BidCreate, BidOut, BidWithTeamOut
 from app.services import bidding_service
-from app.repositories import bid_repo, team_repo
-from app.services.auth_service import decode_token
+from app.services.bid_ledger import bid_ledger
+from app.repositories import team_repo
+from app.core.auth import get_current_user
+from app.core.shard_routing import route_to_owner
 from app.websocket.manager import manager
 from app.core.database import get_db_pool
-from typing import List
+from app.core.etag import json_response
+from app.utils.cursor import encode_cursor, decode_cursor
+from typing import List, Optional
 import asyncpg
 
 router = APIRouter(prefix="/bids", tags=["bids"])
 
-def get_current_user(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    user = decode_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return user
-
 @router.post("", response_model=BidOut)
-async def place_bid(bid: BidCreate, user=Depends(get_current_user), pool: asyncpg.Pool = Depends(get_db_pool)):
+async def place_bid(request: Request, bid: BidCreate, user=Depends(get_current_user), pool: asyncpg.Pool = Depends(get_db_pool)):
     # Get user's team for this auction
     from app.repositories import auction_repo
-    auction = await auction_repo.get_auction_by_id(bid.auction_id)
+    auction = await auction_repo.get_auction_ref(bid.auction_id)
     if not auction:
         raise HTTPException(status_code=404, detail="Auction not found")
     
-    team = await team_repo.get_team_by_owner(auction.tournament_id, user.user_id)
+    team = await team_repo.get_team_ref_by_owner(auction.tournament_id, user.user_id)
     if not team:
         raise HTTPException(status_code=403, detail="No team found for this tournament")
     
+    await route_to_owner(request, bid.auction_id)
+    
     try:
         new_bid = await bidding_service.place_bid(bid, team.id, pool)
         
@@ -51,12 +50,28 @@ async def place_bid(bid: BidCreate, user=Depends(get_current_user), pool: asyncp
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/auction/{auction_id}/player/{player_id}", response_model=List[BidWithTeamOut])
-async def get_player_bids(auction_id: int, player_id: int):
-    return await bid_repo.get_bids_for_player(auction_id, player_id)
+async def get_player_bids(
+    request: Request,
+    auction_id: int,
+    player_id: int,
+    after: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Bid history for a lot, newest first, from the lot's bid ledger"""
+    try:
+        before = int(decode_cursor(after, 1)[0]) if after else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Malformed cursor")
+
+    bids, next_before = await bid_ledger.history(auction_id, player_id, before, limit)
+    headers = {}
+    if next_before is not None:
+        headers["X-Next-Cursor"] = encode_cursor(next_before)
+    return json_response(request, bids, headers)
 
 @router.get("/auction/{auction_id}/player/{player_id}/highest", response_model=BidWithTeamOut)
 async def get_highest_bid(auction_id: int, player_id: int):
-    bid = await bid_repo.get_highest_bid(auction_id, player_id)
+    bid = await bid_ledger.highest(auction_id, player_id)
     if not bid:
         raise HTTPException(status_code=404, detail="No bids found")
     return bid
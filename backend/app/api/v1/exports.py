@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Response
 from app.core.auth import get_current_user
 from app.services import export_service
-from app.core.database import get_db_pool
+from app.core.database import get_read_db_pool
 import asyncpg
 
 router = APIRouter(prefix="/exports", tags=["exports"])
@@ -11,7 +11,7 @@ async def export_team_roster(
     team_id: int,
     auction_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
     csv_data = await export_service.export_team_roster(team_id, auction_id, pool)
     return Response(
@@ -24,7 +24,7 @@ async def export_team_roster(
 async def export_transactions(
     auction_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
     csv_data = await export_service.export_all_transactions(auction_id, pool)
     return Response(
@@ -38,7 +38,7 @@ async def export_bid_history(
     auction_id: int,
     player_id: int,
     current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_read_db_pool)
 ):
     csv_data = await export_service.export_bid_history(auction_id, player_id, pool)
     return Response(
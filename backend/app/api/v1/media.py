@@ -0,0 +1,32 @@
+from fastapi import APIRouter, HTTPException, Header, Response
+from app.services.blob_store import get_blob_store, is_valid_key, BlobNotFound, THUMBNAIL_SIZES
+from typing import Optional
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+# Keys are content hashes, so a URL's bytes can never change
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+@router.get("/{key}")
+async def get_media(key: str, size: Optional[int] = None, if_none_match: Optional[str] = Header(None)):
+    if not is_valid_key(key) or "_" in key:
+        raise HTTPException(status_code=404, detail="Media not found")
+    if size is not None:
+        if size not in THUMBNAIL_SIZES:
+            raise HTTPException(status_code=400, detail=f"size must be one of {list(THUMBNAIL_SIZES)}")
+        key = f"{key}_{size}"
+
+    etag = f'"{key}"'
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE})
+
+    try:
+        data, content_type = await get_blob_store().get(key)
+    except BlobNotFound:
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    return Response(
+        content=data,
+        media_type=content_type,
+        headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE}
+    )
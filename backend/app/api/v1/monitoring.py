@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
-from app.core.auth import get_current_user
+from app.core.auth import get_admin_user
 from app.core.database import get_db_pool
+from app.db.connection import acquire_wait_seconds
+from app.services.metrics_sampler import metrics_sampler
 import asyncpg
-import psutil
 import time
 
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
@@ -17,59 +18,65 @@ async def health_check():
     }
 
 @router.get("/metrics")
-async def get_metrics(
-    current_user: dict = Depends(get_current_user),
-    pool: asyncpg.Pool = Depends(get_db_pool)
-):
-    if current_user.get("role") != "admin":
-        return {"error": "Admin only"}
-    
-    # System metrics
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
-    
-    # Database metrics
-    async with pool.acquire() as conn:
-        db_size = await conn.fetchval("SELECT pg_database_size(current_database())")
-        active_connections = await conn.fetchval("""
-            SELECT count(*) FROM pg_stat_activity 
-            WHERE state = 'active'
-        """)
-    
-    return {
-        "system": {
-            "cpu_percent": cpu_percent,
-            "memory_percent": memory.percent,
-            "memory_used_gb": memory.used / (1024**3),
-            "disk_percent": disk.percent,
-            "disk_used_gb": disk.used / (1024**3)
-        },
-        "database": {
-            "size_mb": db_size / (1024**2),
-            "active_connections": active_connections
-        },
+async def get_metrics(history: bool = True, admin=Depends(get_admin_user)):
+    """Latest background sample (see metrics_sampler) plus live pool wait stats"""
+    sample = metrics_sampler.latest() or await metrics_sampler.sample()
+    result = {
+        "system": sample["system"],
+        "database": {**sample["database"], "acquire_wait": acquire_wait_seconds.snapshot()},
+        "redis": sample["redis"],
+        "sampled_at": sample["timestamp"],
         "uptime_seconds": time.time() - start_time
     }
+    if history:
+        result["history"] = metrics_sampler.history()
+    return result
+
+# Planner statistics: n_live_tup is kept current by the stats collector on
+# every commit, reltuples by VACUUM/ANALYZE; either is a catalog lookup rather
+# than a scan of the table
+# bids is partitioned, so its estimate is the sum over its partitions
+ESTIMATED_COUNTS = """
+    SELECT t.relname,
+           SUM(CASE WHEN s.n_live_tup > 0 THEN s.n_live_tup
+                    ELSE GREATEST(c.reltuples, 0)::bigint END)::bigint as estimate
+    FROM pg_class t
+    LEFT JOIN pg_inherits i ON i.inhparent = t.oid
+    JOIN pg_class c ON c.oid = COALESCE(i.inhrelid, t.oid)
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE t.oid = ANY(ARRAY['users', 'auctions', 'bids', 'players']::regclass[])
+    GROUP BY t.relname
+"""
+
+EXACT_COUNTS = """
+    SELECT (SELECT COUNT(*) FROM users) as users,
+           (SELECT COUNT(*) FROM auctions) as auctions,
+           (SELECT COUNT(*) FROM bids) as bids,
+           (SELECT COUNT(*) FROM players) as players
+"""
 
 @router.get("/stats")
 async def get_stats(
-    current_user: dict = Depends(get_current_user),
+    exact: bool = False,
+    admin=Depends(get_admin_user),
     pool: asyncpg.Pool = Depends(get_db_pool)
 ):
+    """Row counts from planner estimates; ``exact=true`` runs full COUNT(*) scans instead"""
     async with pool.acquire() as conn:
-        total_users = await conn.fetchval("SELECT COUNT(*) FROM users")
-        total_auctions = await conn.fetchval("SELECT COUNT(*) FROM auctions")
+        if exact:
+            counts = dict(await conn.fetchrow(EXACT_COUNTS))
+        else:
+            counts = {row['relname']: row['estimate'] for row in await conn.fetch(ESTIMATED_COUNTS)}
+        # Served by idx_auctions_status, and only a handful of auctions are live at once
         active_auctions = await conn.fetchval("SELECT COUNT(*) FROM auctions WHERE status = 'active'")
-        total_bids = await conn.fetchval("SELECT COUNT(*) FROM bids")
-        total_players = await conn.fetchval("SELECT COUNT(*) FROM players")
     
     return {
-        "users": total_users,
+        "users": counts['users'],
         "auctions": {
-            "total": total_auctions,
+            "total": counts['auctions'],
             "active": active_auctions
         },
-        "bids": total_bids,
-        "players": total_players
+        "bids": counts['bids'],
+        "players": counts['players'],
+        "exact": exact
     }
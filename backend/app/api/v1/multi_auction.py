@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from app.core.auth import get_current_user
 from app.repositories.multi_auction_repo import MultiAuctionRepository
 from app.core.database import get_db_pool
+from app.services.auction_shards import shard_registry
 import asyncpg
 
 router = APIRouter(prefix="/multi-auction", tags=["multi-auction"])
@@ -17,7 +18,25 @@ async def get_auctions_overview(
     pool: asyncpg.Pool = Depends(get_db_pool)
 ):
     repo = MultiAuctionRepository(pool)
-    return await repo.get_all_auctions_overview()
+    auctions = await repo.get_all_auctions_overview()
+    # Owning node of each live auction (None when unclaimed or sharding is off)
+    assignments = await shard_registry.assignments([a['id'] for a in auctions if a['status'] == 'active'])
+    for auction in auctions:
+        auction['shard'] = assignments.get(auction['id'])
+    return auctions
+
+@router.get("/shards")
+async def get_shards():
+    return {
+        "enabled": shard_registry.enabled,
+        "node_id": shard_registry.node_id,
+        "nodes": shard_registry.nodes(),
+    }
+
+@router.get("/route/{auction_id}")
+async def route_auction(auction_id: int):
+    """Which node serves an auction; for load balancers and clients choosing where to connect"""
+    return await shard_registry.owner(auction_id)
 
 @router.post("/clone")
 async def clone_auction(
@@ -1,17 +1,10 @@
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends
 from app.repositories import notification_repo
-from app.services.auth_service import decode_token
+from app.core.auth import get_current_user
 from typing import List
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
-def get_current_user(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    user = decode_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return user
-
 @router.get("")
 async def get_notifications(unread_only: bool = False, user=Depends(get_current_user)):
     return await notification_repo.get_user_notifications(user.user_id, unread_only)
@@ -1,25 +1,67 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from app.schemas.player import PlayerCreate, PlayerOut, PlayerUpdate
 from app.repositories import player_repo
-from app.services.auth_service import decode_token
-from typing import List
+from app.core.auth import get_current_user
+from app.core.etag import json_response
+from app.utils.cursor import encode_cursor, decode_cursor
+from decimal import Decimal
+from typing import List, Optional
 
 router = APIRouter(prefix="/players", tags=["players"])
 
-def get_current_user(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    user = decode_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return user
-
 @router.post("", response_model=PlayerOut)
 async def create_player(player: PlayerCreate, user=Depends(get_current_user)):
     return await player_repo.create_player(player)
 
 @router.get("", response_model=List[PlayerOut])
-async def get_players():
-    return await player_repo.list_players()
+async def get_players(
+    request: Request,
+    after: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    sport: Optional[str] = None,
+    position: Optional[str] = None,
+    min_rating: Optional[Decimal] = None,
+    max_rating: Optional[Decimal] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None
+):
+    try:
+        after_key = tuple(decode_cursor(after, 2)) if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    players = await player_repo.list_players_page(
+        after=after_key, limit=limit, sport=sport, position=position,
+        min_rating=min_rating, max_rating=max_rating, min_price=min_price, max_price=max_price
+    )
+    headers = {}
+    if len(players) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(players[-1].name, players[-1].id)
+    return json_response(request, players, headers)
+
+# Relevance-ranked results have no stable keyset, so the cursor wraps an offset
+# and paging stops at MAX_SEARCH_OFFSET
+MAX_SEARCH_OFFSET = 1000
+
+@router.get("/search", response_model=List[PlayerOut])
+async def search_players(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    after: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    sport: Optional[str] = None
+):
+    try:
+        offset = int(decode_cursor(after, 1)[0]) if after else 0
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Malformed cursor")
+    if not 0 <= offset <= MAX_SEARCH_OFFSET:
+        raise HTTPException(status_code=400, detail="Cursor out of range")
+
+    players = await player_repo.search_players(q, limit=limit, offset=offset, sport=sport)
+    if len(players) == limit and offset + limit <= MAX_SEARCH_OFFSET:
+        response.headers["X-Next-Cursor"] = encode_cursor(offset + limit)
+    return players
 
 @router.get("/{player_id}", response_model=PlayerOut)
 async def get_player(player_id: int):
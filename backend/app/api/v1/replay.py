@@ -1,26 +1,78 @@
-from fastapi import APIRouter, HTTPException
-from app.db.connection import fetch_all, fetch_one
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.db.connection import fetch_one_read
+from app.core.etag import json_response
+from app.repositories import event_repo
+from app.services.event_recorder import rebuild_state
+from app.utils.cursor import encode_cursor, decode_cursor
+from datetime import datetime
+from typing import List, Optional, Tuple
+import json
 
 router = APIRouter(prefix="/replay", tags=["replay"])
 
+STREAM_BATCH = 1000
+
+def _after_key(after: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not after:
+        return None
+    try:
+        timestamp, event_id = decode_cursor(after, 2)
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Malformed cursor")
+
 @router.get("/auctions/{auction_id}/events")
-async def get_auction_events(auction_id: int):
-    """Get all events for auction replay"""
-    events = await fetch_all(
-        """
-        SELECT id, event_type, event_data, timestamp
-        FROM auction_events
-        WHERE auction_id = $1
-        ORDER BY timestamp ASC
-        """,
-        auction_id
+async def get_auction_events(
+    request: Request,
+    auction_id: int,
+    after: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+    event_types: Optional[List[str]] = Query(None)
+):
+    """Get auction events in time order, one page at a time"""
+    events = await event_repo.page_events(
+        auction_id, _after_key(after), limit, from_ts=from_ts, to_ts=to_ts, event_types=event_types
     )
-    return events
+    headers = {}
+    if len(events) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(events[-1]['timestamp'], events[-1]['id'])
+    return json_response(request, events, headers)
+
+@router.get("/auctions/{auction_id}/events/stream")
+async def stream_auction_events(
+    auction_id: int,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+    event_types: Optional[List[str]] = Query(None)
+):
+    """Stream the whole (filtered) history as NDJSON, one event per line"""
+    async def lines():
+        after = None
+        while True:
+            events = await event_repo.page_events(
+                auction_id, after, STREAM_BATCH, from_ts=from_ts, to_ts=to_ts, event_types=event_types
+            )
+            if events:
+                yield "".join(json.dumps(jsonable_encoder(event), separators=(",", ":")) + "\n" for event in events)
+            if len(events) < STREAM_BATCH:
+                return
+            after = (events[-1]['timestamp'], events[-1]['id'])
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/auctions/{auction_id}/state")
+async def get_auction_state(auction_id: int, at_seq: Optional[int] = Query(None, ge=0)):
+    """Auction state rebuilt from the event log, as of ``at_seq`` or the latest event"""
+    return await rebuild_state(auction_id, at_seq)
 
 @router.get("/auctions/{auction_id}/summary")
 async def get_auction_summary(auction_id: int):
     """Get auction summary for replay"""
-    auction = await fetch_one(
+    auction = await fetch_one_read(
         """
         SELECT a.*, t.name as tournament_name
         FROM auctions a
@@ -33,12 +85,7 @@ async def get_auction_summary(auction_id: int):
     if not auction:
         raise HTTPException(status_code=404, detail="Auction not found")
     
-    event_count = await fetch_one(
-        "SELECT COUNT(*) as count FROM auction_events WHERE auction_id = $1",
-        auction_id
-    )
-    
     return {
         **auction,
-        "event_count": event_count['count']
+        "event_count": await event_repo.get_head(auction_id)
     }
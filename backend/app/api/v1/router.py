@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, tournaments, teams, players, auctions, bids, timer, admin, undo, notifications, replay, auto_bids, chat, player_stats, analytics, exports, multi_auction, monitoring
+from app.api.v1 import auth, tournaments, teams, players, auctions, bids, timer, admin, undo, notifications, replay, auto_bids, chat, player_stats, analytics, exports, multi_auction, monitoring, media
 
 api_router = APIRouter(prefix="/api/v1")
 
@@ -21,3 +21,4 @@ api_router.include_router(analytics.router)
 api_router.include_router(exports.router)
 api_router.include_router(multi_auction.router)
 api_router.include_router(monitoring.router)
+api_router.include_router(media.router)
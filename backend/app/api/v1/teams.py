@@ -1,18 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from app.schemas.team import TeamCreate, TeamOut
 from app.repositories import team_repo
-from app.services.auth_service import decode_token
-from typing import List
+from app.core.auth import get_current_user
+from app.core.etag import json_response
+from typing import List, Optional
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
-def get_current_user(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    user = decode_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return user
-
 @router.post("", response_model=TeamOut)
 async def create_team(team: TeamCreate, user=Depends(get_current_user)):
     return await team_repo.create_team(team, user.user_id)
@@ -22,8 +16,17 @@ async def get_my_teams(user=Depends(get_current_user)):
     return await team_repo.list_teams_by_owner(user.user_id)
 
 @router.get("/tournament/{tournament_id}", response_model=List[TeamOut])
-async def get_tournament_teams(tournament_id: int):
-    return await team_repo.list_teams_by_tournament(tournament_id)
+async def get_tournament_teams(
+    request: Request,
+    tournament_id: int,
+    after: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000)
+):
+    teams = await team_repo.list_teams_by_tournament(tournament_id, after_id=after, limit=limit)
+    headers = {}
+    if len(teams) == limit:
+        headers["X-Next-Cursor"] = str(teams[-1].id)
+    return json_response(request, teams, headers)
 
 @router.get("/{team_id}", response_model=TeamOut)
 async def get_team(team_id: int):
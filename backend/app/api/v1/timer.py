@@ -1,20 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Request
 from app.schemas.timer import TimerControl, TimerOut
 from app.services.timer_service import timer_service
-from app.services.auth_service import decode_token
-from typing import Annotated
+from app.services.event_recorder import record_event
+from app.services.bidding_service import reopen_lot
+from app.core.auth import get_current_user
+from app.core.shard_routing import route_to_owner
 
 router = APIRouter(prefix="/timer", tags=["timer"])
 
-def get_current_user(authorization: Annotated[str, Header()]):
-    token = authorization.replace("Bearer ", "")
-    user = decode_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return user
+TIMER_EVENTS = {"start": "TIMER_STARTED", "pause": "TIMER_PAUSED", "resume": "TIMER_RESUMED", "stop": "TIMER_STOPPED", "reset": "TIMER_RESET"}
 
 @router.post("/control")
-async def control_timer(control: TimerControl, user=Depends(get_current_user)):
+async def control_timer(request: Request, control: TimerControl, user=Depends(get_current_user)):
+    await route_to_owner(request, control.auction_id)
     if control.action == "start":
         await timer_service.start_timer(control.auction_id, 30)
     elif control.action == "pause":
@@ -26,13 +24,19 @@ async def control_timer(control: TimerControl, user=Depends(get_current_user)):
     else:
         raise HTTPException(status_code=400, detail="Invalid action")
     
+    if control.action == "start":
+        # Through the auction's actor, so a lot closed by expiry accepts bids again
+        await reopen_lot(control.auction_id, TIMER_EVENTS[control.action], {})
+    else:
+        await record_event(control.auction_id, TIMER_EVENTS[control.action], {})
     return {"message": f"Timer {control.action} successful"}
 
 @router.get("/{auction_id}", response_model=TimerOut)
 async def get_timer_state(auction_id: int):
     return await timer_service.get_timer_state(auction_id)
 
-@router.post("/{auction_id}/extend")
+@router.post("/{auction_id}/extend", dependencies=[Depends(route_to_owner)])
 async def extend_timer(auction_id: int, seconds: int, user=Depends(get_current_user)):
     await timer_service.extend(auction_id, seconds)
+    await reopen_lot(auction_id, "TIMER_EXTENDED", {"seconds": seconds})
     return {"message": f"Timer extended by {seconds} seconds"}
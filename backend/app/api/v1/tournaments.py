@@ -1,25 +1,38 @@
-from fastapi import APIRouter, HTTPException, Header, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from app.schemas.tournament import TournamentCreate, TournamentOut, TournamentUpdate
 from app.repositories import tournament_repo
-from app.services.auth_service import decode_token
-from typing import List
+from app.core.auth import get_current_user
+from app.core.etag import json_response
+from app.utils.cursor import encode_cursor, decode_cursor
+from datetime import datetime
+from typing import List, Optional
 
 router = APIRouter(prefix="/tournaments", tags=["tournaments"])
 
-def get_current_user(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    user = decode_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return user
-
 @router.post("", response_model=TournamentOut)
 async def create_tournament(tournament: TournamentCreate, user=Depends(get_current_user)):
     return await tournament_repo.create_tournament(tournament, user.user_id)
 
 @router.get("", response_model=List[TournamentOut])
-async def get_tournaments():
-    return await tournament_repo.list_tournaments()
+async def get_tournaments(
+    request: Request,
+    after: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = None
+):
+    try:
+        after_key = None
+        if after:
+            created_at, tournament_id = decode_cursor(after, 2)
+            after_key = (datetime.fromisoformat(created_at), int(tournament_id))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Malformed cursor")
+
+    tournaments = await tournament_repo.list_tournaments_page(after=after_key, limit=limit, status=status)
+    headers = {}
+    if len(tournaments) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(tournaments[-1].created_at, tournaments[-1].id)
+    return json_response(request, tournaments, headers)
 
 @router.get("/{tournament_id}", response_model=TournamentOut)
 async def get_tournament(tournament_id: int):
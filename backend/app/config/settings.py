@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 
 class Settings(BaseSettings):
     database_url: str
@@ -8,6 +9,67 @@ class Settings(BaseSettings):
     jwt_expiration_minutes: int = 1440
     log_level: str = "INFO"
 
+    # Database pool (per worker)
+    database_replica_url: Optional[str] = None
+    db_pool_min_size: int = 2
+    db_pool_max_size: int = 10
+    db_pool_max_inactive_lifetime: float = 300.0
+    db_acquire_timeout: float = 10.0
+    db_command_timeout: float = 30.0
+    db_statement_timeout_ms: int = 15000
+    db_slow_query_ms: int = 200
+
+    # bcrypt runs on a dedicated executor; beyond max_pending, logins get 503
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 256
+
+    # In-process auth caches (per worker)
+    token_cache_size: int = 10000
+    user_cache_size: int = 5000
+    user_cache_ttl_seconds: float = 30.0
+
+    # Analytics dashboard responses are cached in Redis for this long (and
+    # dropped as soon as a lot closes)
+    analytics_dashboard_cache_seconds: float = 5.0
+
+    # Background sampler behind /monitoring/metrics
+    metrics_sample_interval_seconds: float = 5.0
+    metrics_history_size: int = 120
+    # Bearer token required by the Prometheus /metrics endpoint (open when unset)
+    metrics_token: Optional[str] = None
+
+    # Span tracing: requests carrying "X-Trace: 1" are always traced, others
+    # are sampled at this rate; traces slower than trace_slow_ms are logged
+    trace_sample_rate: float = 0.0
+    trace_slow_ms: float = 250.0
+
+    # Auction sharding: each live auction is owned by one node (one server
+    # process reachable at node_address); other nodes redirect to the owner
+    sharding_enabled: bool = False
+    node_id: Optional[str] = None
+    node_address: Optional[str] = None
+    shard_lease_ttl_seconds: float = 10.0
+    shard_virtual_nodes: int = 64
+
+    # Per-auction actors stop (and drop their lot state) after this long idle
+    auction_actor_idle_seconds: float = 300.0
+
+    # Auction state snapshot every N events in the event log
+    event_snapshot_interval: int = 500
+
+    # Per-lot bid ledgers in Redis expire this long after their last write
+    bid_ledger_ttl_seconds: int = 21600
+
+    # Archived auctions' bid/event partitions move to this tablespace (if set)
+    archive_tablespace: Optional[str] = None
+
+    # Media blob store: "local" (filesystem) or "s3" (any S3-compatible endpoint)
+    blob_store_backend: str = "local"
+    blob_store_path: str = "data/blobs"
+    blob_s3_bucket: Optional[str] = None
+    blob_s3_prefix: str = "media/"
+    blob_s3_endpoint_url: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
@@ -1,9 +1,27 @@
 from fastapi import Header, HTTPException
+from app.repositories import user_repo
+from app.schemas.auth import TokenData
+from app.schemas.user import UserOut
 from app.services.auth_service import decode_token
 
-def get_current_user(authorization: str = Header(...)):
+def get_current_user(authorization: str = Header(...)) -> TokenData:
     token = authorization.replace("Bearer ", "")
     user = decode_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid token")
     return user
+
+def get_admin_user(authorization: str = Header(...)) -> TokenData:
+    token = authorization.replace("Bearer ", "")
+    user = decode_token(token)
+    if not user or 'admin' not in user.roles:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
+
+async def get_current_user_profile(authorization: str = Header(...)) -> UserOut:
+    """Token plus the user's current profile and roles (short-TTL cached)"""
+    token_data = get_current_user(authorization)
+    user = await user_repo.get_user_cached(token_data.user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
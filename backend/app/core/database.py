@@ -1,5 +1,9 @@
-from app.db.connection import get_pool
+from app.db.connection import get_pool, get_read_pool
 import asyncpg
 
 async def get_db_pool() -> asyncpg.Pool:
     return await get_pool()
+
+async def get_read_db_pool() -> asyncpg.Pool:
+    """Pool for reporting routes (analytics, exports, replay): the read replica when configured"""
+    return await get_read_pool()
@@ -0,0 +1,21 @@
+"""Conditional GET support for JSON list endpoints.
+
+The ETag is a hash of the serialized body, so an unchanged page costs the
+query but not the transfer: clients revalidating with If-None-Match get an
+empty 304.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+def json_response(request: Request, payload: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
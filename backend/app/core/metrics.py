@@ -0,0 +1,108 @@
+"""In-process metrics primitives.
+
+Metrics are process-local (one set per uvicorn worker) and cheap enough to
+update on the hot path: an observation is a bisect plus a few integer adds.
+``render_prometheus`` exposes the registry in the Prometheus text format.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Tuple, Union
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY: Dict[str, Union["Histogram", "Gauge"]] = {}
+
+def _register(metric):
+    if metric.name in REGISTRY:
+        raise ValueError(f"Metric {metric.name!r} is already registered")
+    REGISTRY[metric.name] = metric
+
+class Gauge:
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        _register(self)
+
+    def set(self, value: float, *labelvalues: str):
+        self._values[labelvalues] = value
+
+    def inc(self, amount: float = 1, *labelvalues: str):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, amount: float = 1, *labelvalues: str):
+        self.inc(-amount, *labelvalues)
+
+    def snapshot(self) -> List[dict]:
+        return [
+            {"labels": dict(zip(self.labelnames, labelvalues)), "value": value}
+            for labelvalues, value in self._values.items()
+        ]
+
+class Histogram:
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        _register(self)
+
+    def observe(self, value: float, *labelvalues: str):
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def snapshot(self) -> List[dict]:
+        result = []
+        for labelvalues, (counts, total, count) in self._series.items():
+            cumulative, running = [], 0
+            for upper, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                running += bucket_count
+                cumulative.append((upper, running))
+            result.append({
+                "labels": dict(zip(self.labelnames, labelvalues)),
+                "buckets": cumulative,
+                "sum": total,
+                "count": count,
+            })
+        return result
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_prometheus() -> str:
+    """Every registered metric in Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+    for name, metric in sorted(REGISTRY.items()):
+        lines.append(f"# HELP {name} {_escape(metric.description)}")
+        if isinstance(metric, Gauge):
+            lines.append(f"# TYPE {name} gauge")
+            for labelvalues, value in list(metric._values.items()):
+                lines.append(f"{name}{_labels(list(zip(metric.labelnames, labelvalues)))} {_number(value)}")
+            continue
+
+        lines.append(f"# TYPE {name} histogram")
+        for labelvalues, (counts, total, count) in list(metric._series.items()):
+            pairs = list(zip(metric.labelnames, labelvalues))
+            running = 0
+            for upper, bucket_count in zip(metric.buckets + (float("inf"),), counts):
+                running += bucket_count
+                lines.append(f"{name}_bucket{_labels(pairs + [('le', _number(upper))])} {running}")
+            lines.append(f"{name}_sum{_labels(pairs)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(pairs)} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,30 @@
+"""Redis client that records per-command latency.
+
+Every service connects through ``connect_redis`` so ``redis_command_seconds``
+covers rate limiting, the bid path, timers and caching alike.
+"""
+import time
+
+import redis.asyncio as redis
+
+from app.config.settings import settings
+from app.core import tracing
+from app.core.metrics import Histogram
+
+redis_command_seconds = Histogram(
+    "redis_command_seconds", "Redis command round-trip time", ("command",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+
+class InstrumentedRedis(redis.Redis):
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        start = time.perf_counter()
+        try:
+            with tracing.span("redis", command=command):
+                return await super().execute_command(*args, **options)
+        finally:
+            redis_command_seconds.observe(time.perf_counter() - start, command)
+
+async def connect_redis(url: str = None) -> InstrumentedRedis:
+    return await InstrumentedRedis.from_url(url or settings.redis_url)
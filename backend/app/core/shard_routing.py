@@ -0,0 +1,19 @@
+from fastapi import HTTPException, Request
+from app.services.auction_shards import shard_registry
+
+async def route_to_owner(request: Request, auction_id: int):
+    """Send an auction mutation to the auction's owning node (307) unless that is this node.
+
+    Usable as a route dependency for routes with an ``auction_id`` path parameter,
+    or awaited directly when the auction id is in the body.
+    """
+    owner = await shard_registry.owner(auction_id)
+    if owner["local"]:
+        return
+    if not owner["address"]:
+        raise HTTPException(status_code=503, detail="Auction owner is unavailable, retry shortly")
+    url = f"{owner['address']}{request.url.path}"
+    if request.url.query:
+        url += f"?{request.url.query}"
+    # 307 keeps the method and body, so the client replays the request on the owning node
+    raise HTTPException(status_code=307, detail="Auction is owned by another node", headers={"Location": url})
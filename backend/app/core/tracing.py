@@ -0,0 +1,142 @@
+"""Lightweight per-request span tracing.
+
+A trace is started for a request (``X-Trace: 1`` header, or sampled at
+``trace_sample_rate``) and the active span lives in a context variable, so
+pool acquires, SQL statements, Redis commands and WebSocket sends nest under
+whatever the request was doing at the time. When nothing is being traced,
+``span`` is a context-variable read and nothing more.
+
+Traces slower than ``trace_slow_ms`` (and every forced trace) are written to
+the log as a span tree.
+"""
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TRACE_HEADER = "x-trace"
+MAX_SPANS = 1000
+
+class Span:
+    __slots__ = ("name", "start", "end", "attrs", "children", "trace")
+
+    def __init__(self, name: str, trace: "Trace", attrs: Dict[str, Any], start: Optional[float] = None):
+        self.name = name
+        self.trace = trace
+        self.attrs = attrs
+        self.start = time.perf_counter() if start is None else start
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+
+    def child(self, name: str, attrs: Dict[str, Any], start: Optional[float] = None) -> Optional["Span"]:
+        trace = self.trace
+        if trace.span_count >= MAX_SPANS:
+            trace.dropped += 1
+            return None
+        trace.span_count += 1
+        span = Span(name, trace, attrs, start)
+        self.children.append(span)
+        return span
+
+    def to_dict(self, origin: float) -> dict:
+        end = self.end if self.end is not None else time.perf_counter()
+        node = {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+        }
+        if self.attrs:
+            node["attrs"] = self.attrs
+        if self.children:
+            node["children"] = [child.to_dict(origin) for child in sorted(self.children, key=lambda c: c.start)]
+        return node
+
+class Trace:
+    __slots__ = ("root", "forced", "span_count", "dropped")
+
+    def __init__(self, name: str, forced: bool, attrs: Dict[str, Any]):
+        self.forced = forced
+        self.span_count = 1
+        self.dropped = 0
+        self.root = Span(name, self, attrs)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.root.end if self.root.end is not None else time.perf_counter()
+        return (end - self.root.start) * 1000
+
+    def to_dict(self) -> dict:
+        tree = self.root.to_dict(self.root.start)
+        if self.dropped:
+            tree["dropped_spans"] = self.dropped
+        return tree
+
+_current: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+def should_trace(forced: bool = False) -> bool:
+    return forced or (settings.trace_sample_rate > 0 and random.random() < settings.trace_sample_rate)
+
+@contextmanager
+def trace(name: str, forced: bool = False, **attrs):
+    """Root span for one request or message; yields the Trace, or None when not sampled"""
+    if _current.get() is not None or not should_trace(forced):
+        yield None
+        return
+
+    current = Trace(name, forced, attrs)
+    token = _current.set(current.root)
+    try:
+        yield current
+    finally:
+        current.root.end = time.perf_counter()
+        _current.reset(token)
+        if forced or current.duration_ms >= settings.trace_slow_ms:
+            logger.warning(
+                "Trace %s took %.1f ms: %s", name, current.duration_ms, json.dumps(current.to_dict(), default=str),
+                extra={"trace": current.to_dict()}
+            )
+
+@contextmanager
+def span(name: str, **attrs):
+    """Child span of the active span; a no-op outside a trace"""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+
+    current = parent.child(name, attrs)
+    if current is None:
+        yield None
+        return
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        current.end = time.perf_counter()
+        _current.reset(token)
+
+def record_span(name: str, elapsed: float, **attrs):
+    """Attach an already-finished operation (e.g. from a query logger) to the active span"""
+    parent = _current.get()
+    if parent is None:
+        return
+    end = time.perf_counter()
+    current = parent.child(name, attrs, start=end - elapsed)
+    if current is not None:
+        current.end = end
+
+def record_query(sql: str, elapsed: float, error: Optional[BaseException]):
+    """``add_query_hook`` callback: one span per SQL statement"""
+    if _current.get() is None:
+        return
+    attrs = {"sql": " ".join(sql.split())[:200]}
+    if error is not None:
+        attrs["error"] = type(error).__name__
+    record_span("db.query", elapsed, **attrs)
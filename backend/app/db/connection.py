@@ -1,21 +1,111 @@
 import asyncpg
+import dataclasses
+import json
+import logging
+import time
+from functools import lru_cache
+from pydantic import BaseModel
 from app.config.settings import settings
-from typing import Optional, List, Any
+from app.core import tracing
+from app.core.metrics import Histogram
+from app.db.statements import STATEMENTS, Statement
+from typing import Optional, List, Any, Callable
+
+logger = logging.getLogger(__name__)
 
 pool: asyncpg.Pool = None
+replica_pool: Optional[asyncpg.Pool] = None
+
+acquire_wait_seconds = Histogram(
+    "db_pool_acquire_wait_seconds", "Time spent waiting for a pooled connection", ("pool",)
+)
+query_duration_seconds = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("statement",)
+)
+
+QueryHook = Callable[[str, float, Optional[BaseException]], None]
+_query_hooks: List[QueryHook] = []
+_STATEMENT_BY_SQL = {statement.sql: statement for statement in STATEMENTS.values()}
+
+def add_query_hook(hook: QueryHook):
+    """Register a callback invoked with (sql, elapsed_seconds, error) after every query"""
+    _query_hooks.append(hook)
+
+add_query_hook(tracing.record_query)
+
+def _statement_label(sql: str) -> str:
+    statement = _STATEMENT_BY_SQL.get(sql)
+    return statement.name if statement else "adhoc"
+
+def _observe_query(sql: str, elapsed: float, error: Optional[BaseException]):
+    query_duration_seconds.observe(elapsed, _statement_label(sql))
+    if elapsed * 1000 >= settings.db_slow_query_ms:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(sql.split())[:200])
+    for hook in _query_hooks:
+        hook(sql, elapsed, error)
+
+def _log_query(record):
+    _observe_query(record.query, record.elapsed, record.exception)
+
+class PreparedConnection(asyncpg.Connection):
+    """Connection carrying the registry statements prepared by the pool init hook"""
+    __slots__ = ('prepared',)
+
+class InstrumentedPool(asyncpg.Pool):
+    """Pool that records acquire wait time and applies the configured acquire timeout"""
+    __slots__ = ('label',)
+
+    async def _acquire(self, timeout):
+        start = time.perf_counter()
+        try:
+            with tracing.span("db.acquire", pool=self.label):
+                return await super()._acquire(timeout if timeout is not None else settings.db_acquire_timeout)
+        finally:
+            acquire_wait_seconds.observe(time.perf_counter() - start, self.label)
+
+async def _init_connection(conn: PreparedConnection):
+    conn.add_query_logger(_log_query)
+    conn.prepared = {}
+    for statement in STATEMENTS.values():
+        conn.prepared[statement.name] = await conn.prepare(statement.sql)
+
+async def _create_pool(dsn: str, label: str) -> asyncpg.Pool:
+    new_pool = InstrumentedPool(
+        dsn,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        max_queries=50000,
+        max_inactive_connection_lifetime=settings.db_pool_max_inactive_lifetime,
+        setup=None,
+        init=_init_connection,
+        loop=None,
+        connection_class=PreparedConnection,
+        record_class=asyncpg.Record,
+        command_timeout=settings.db_command_timeout,
+        server_settings={"statement_timeout": str(settings.db_statement_timeout_ms)}
+    )
+    new_pool.label = label
+    return await new_pool
 
 async def init_db():
-    global pool
-    pool = await asyncpg.create_pool(settings.database_url, min_size=5, max_size=20)
+    global pool, replica_pool
+    pool = await _create_pool(settings.database_url, "primary")
+    if settings.database_replica_url:
+        replica_pool = await _create_pool(settings.database_replica_url, "replica")
 
 async def close_db():
-    global pool
+    if replica_pool:
+        await replica_pool.close()
     if pool:
         await pool.close()
 
 def get_pool() -> asyncpg.Pool:
     return pool
 
+def get_read_pool() -> asyncpg.Pool:
+    """Read-replica pool for reporting queries; falls back to the primary"""
+    return replica_pool or pool
+
 async def get_connection():
     async with pool.acquire() as conn:
         yield conn
@@ -30,6 +120,16 @@ async def fetch_all(sql: str, *params) -> List[dict]:
         rows = await conn.fetch(sql, *params)
         return [dict(row) for row in rows]
 
+async def fetch_one_read(sql: str, *params) -> Optional[dict]:
+    async with get_read_pool().acquire() as conn:
+        row = await conn.fetchrow(sql, *params)
+        return dict(row) if row else None
+
+async def fetch_all_read(sql: str, *params) -> List[dict]:
+    async with get_read_pool().acquire() as conn:
+        rows = await conn.fetch(sql, *params)
+        return [dict(row) for row in rows]
+
 async def execute(sql: str, *params) -> str:
     async with pool.acquire() as conn:
         return await conn.execute(sql, *params)
@@ -38,3 +138,65 @@ async def execute_returning(sql: str, *params) -> Optional[dict]:
     async with pool.acquire() as conn:
         row = await conn.fetchrow(sql, *params)
         return dict(row) if row else None
+
+@lru_cache(maxsize=None)
+def record_decoder(target: Optional[type], json_fields: tuple = ()) -> Callable[[Any], Any]:
+    """Build a row decoder that skips the Record -> dict -> validated model round trip.
+
+    Pydantic models are built with ``model_construct`` (the row is already typed by
+    asyncpg, so re-validation is wasted work) and dataclasses are called directly.
+    ``json_fields`` are JSONB columns that asyncpg hands back as text.
+    """
+    if target is None:
+        build = dict
+    elif isinstance(target, type) and issubclass(target, BaseModel):
+        build = lambda data: target.model_construct(**data)
+    elif dataclasses.is_dataclass(target):
+        names = tuple(f.name for f in dataclasses.fields(target) if f.init)
+        build = lambda data: target(**{name: data[name] for name in names if name in data})
+    else:
+        raise TypeError(f"Cannot decode records into {target!r}")
+
+    if not json_fields:
+        return build
+
+    def decode(row):
+        data = dict(row)
+        for field in json_fields:
+            value = data.get(field)
+            if isinstance(value, str):
+                data[field] = json.loads(value)
+        return build(data)
+    return decode
+
+async def _run_prepared(conn, statement: Statement, method: str, *params):
+    stmt = conn.prepared.get(statement.name)
+    if stmt is None:
+        stmt = conn.prepared[statement.name] = await conn.prepare(statement.sql)
+    # Prepared statements bypass asyncpg's query loggers, so time them here
+    start = time.perf_counter()
+    error = None
+    try:
+        try:
+            return await getattr(stmt, method)(*params)
+        except asyncpg.exceptions.InvalidCachedStatementError:
+            # Schema changed under the prepared plan (e.g. a migration added a column)
+            stmt = conn.prepared[statement.name] = await conn.prepare(statement.sql)
+            return await getattr(stmt, method)(*params)
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        _observe_query(statement.sql, time.perf_counter() - start, error)
+
+async def fetch_prepared(statement: Statement, *params, model: Optional[type] = None) -> List[Any]:
+    decode = record_decoder(model, statement.json_fields)
+    async with pool.acquire() as conn:
+        rows = await _run_prepared(conn, statement, 'fetch', *params)
+        return [decode(row) for row in rows]
+
+async def fetch_one_prepared(statement: Statement, *params, model: Optional[type] = None) -> Optional[Any]:
+    decode = record_decoder(model, statement.json_fields)
+    async with pool.acquire() as conn:
+        row = await _run_prepared(conn, statement, 'fetchrow', *params)
+        return decode(row) if row else None
@@ -0,0 +1,98 @@
+"""Batched point lookups scoped to a request or an auction event.
+
+Repository ``get_*`` helpers route through a ``DataLoader`` when a scope is
+active: lookups issued in the same event-loop tick are coalesced into one
+``WHERE id = ANY($1)`` query, and repeated keys within the scope are served
+from the scope's cache. Outside a scope the repositories query directly.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+BatchFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+_loaders: ContextVar[Optional[Dict[str, "DataLoader"]]] = ContextVar("dataloaders", default=None)
+
+class DataLoader:
+    def __init__(self, batch_fn: BatchFn):
+        self.batch_fn = batch_fn
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._pending: List[Hashable] = []
+        self._scheduled = False
+
+    async def load(self, key: Hashable) -> Any:
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            self._pending.append(key)
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        # Shield so one cancelled waiter does not fail every caller sharing the key
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self, key: Hashable):
+        self._cache.pop(key, None)
+
+    def prime(self, key: Hashable, value: Any):
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def _dispatch(self):
+        keys, self._pending, self._scheduled = self._pending, [], False
+        asyncio.ensure_future(self._run_batch(keys))
+
+    async def _run_batch(self, keys: List[Hashable]):
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._cache.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        for key in keys:
+            future = self._cache.get(key)
+            if future is not None and not future.done():
+                future.set_result(results.get(key))
+
+@asynccontextmanager
+async def loader_scope():
+    """Open a loader scope; nested scopes reuse the outermost one"""
+    if _loaders.get() is not None:
+        yield
+        return
+
+    token = _loaders.set({})
+    try:
+        yield
+    finally:
+        _loaders.reset(token)
+
+def get_loader(name: str, batch_fn: BatchFn) -> Optional[DataLoader]:
+    loaders = _loaders.get()
+    if loaders is None:
+        return None
+
+    loader = loaders.get(name)
+    if loader is None:
+        loader = loaders[name] = DataLoader(batch_fn)
+    return loader
+
+def detach_scope():
+    """Leave the current scope, so the next ``loader_scope()`` opens a fresh one"""
+    _loaders.set(None)
+
+def invalidate(name: str, key: Hashable):
+    loaders = _loaders.get()
+    if loaders and name in loaders:
+        loaders[name].clear(key)
@@ -0,0 +1,55 @@
+"""Slim, slotted row types for hot-path reads.
+
+These carry only the columns the bid path actually uses and are decoded
+straight from records (see ``record_decoder``), skipping pydantic entirely.
+JSONB columns are kept as text and decoded on first access.
+"""
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+@dataclass(slots=True)
+class TeamRef:
+    id: int
+    tournament_id: int
+    name: str
+    owner_id: int
+    budget: Decimal
+    remaining_budget: Decimal
+
+@dataclass(slots=True)
+class PlayerRef:
+    id: int
+    name: str
+    sport: str
+    position: Optional[str]
+    base_price: Decimal
+    reserve_price: Optional[Decimal]
+    rating: Optional[Decimal]
+
+@dataclass(slots=True)
+class AuctionRef:
+    id: int
+    tournament_id: int
+    status: str
+    current_player_id: Optional[int]
+    timer_seconds: int
+    bid_increment: Optional[Decimal]
+    started_at: Optional[datetime] = None
+
+@dataclass(slots=True)
+class TournamentRules:
+    id: int
+    squad_rules_json: Optional[str]
+    _squad_rules: Any = field(default=None, init=False, repr=False)
+    _decoded: bool = field(default=False, init=False, repr=False)
+
+    @property
+    def squad_rules(self) -> Optional[dict]:
+        if not self._decoded:
+            raw = self.squad_rules_json
+            self._squad_rules = json.loads(raw) if isinstance(raw, str) else raw
+            self._decoded = True
+        return self._squad_rules
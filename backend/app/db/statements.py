@@ -0,0 +1,104 @@
+"""Central registry of hot SQL statements.
+
+Every statement registered here is prepared once per pooled connection by the
+pool ``init`` hook in ``app.db.connection`` and executed by name through
+``fetch_prepared`` / ``fetch_one_prepared``.
+"""
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+@dataclass(frozen=True, slots=True)
+class Statement:
+    name: str
+    sql: str
+    json_fields: Tuple[str, ...] = ()
+
+STATEMENTS: Dict[str, Statement] = {}
+
+def register(name: str, sql: str, json_fields: Tuple[str, ...] = ()) -> Statement:
+    if name in STATEMENTS:
+        raise ValueError(f"Statement {name!r} is already registered")
+    statement = Statement(name, sql, json_fields)
+    STATEMENTS[name] = statement
+    return statement
+
+USER_WITH_ROLES = """
+    SELECT u.id, u.email, u.full_name, u.profile_photo, u.is_approved, u.created_at, u.updated_at,
+           COALESCE(array_agg(r.name ORDER BY r.name) FILTER (WHERE r.name IS NOT NULL), '{}') AS roles
+    FROM users u
+    LEFT JOIN user_roles ur ON ur.user_id = u.id
+    LEFT JOIN roles r ON r.id = ur.role_id
+"""
+
+USER_BY_ID = register("user_by_id", f"{USER_WITH_ROLES} WHERE u.id = $1 GROUP BY u.id")
+USERS_BY_IDS = register("users_by_ids", f"{USER_WITH_ROLES} WHERE u.id = ANY($1::int[]) GROUP BY u.id")
+
+TEAM_BY_ID = register("team_by_id", "SELECT * FROM teams WHERE id = $1")
+TEAMS_BY_IDS = register("teams_by_ids", "SELECT * FROM teams WHERE id = ANY($1::int[])")
+
+PLAYER_BY_ID = register("player_by_id", "SELECT * FROM players WHERE id = $1", json_fields=("metadata",))
+PLAYERS_BY_IDS = register("players_by_ids", "SELECT * FROM players WHERE id = ANY($1::int[])", json_fields=("metadata",))
+PLAYERS_ALL = register("players_all", "SELECT * FROM players ORDER BY name", json_fields=("metadata",))
+
+TOURNAMENT_BY_ID = register("tournament_by_id", "SELECT * FROM tournaments WHERE id = $1", json_fields=("squad_rules",))
+TOURNAMENTS_BY_IDS = register(
+    "tournaments_by_ids",
+    "SELECT * FROM tournaments WHERE id = ANY($1::int[])",
+    json_fields=("squad_rules",)
+)
+
+# Slim projections for the bid path (see app.db.records)
+TEAM_REF_COLUMNS = "id, tournament_id, name, owner_id, budget, remaining_budget"
+PLAYER_REF_COLUMNS = "id, name, sport, position, base_price, reserve_price, rating"
+
+TEAM_REF_BY_ID = register("team_ref_by_id", f"SELECT {TEAM_REF_COLUMNS} FROM teams WHERE id = $1")
+TEAM_REFS_BY_IDS = register("team_refs_by_ids", f"SELECT {TEAM_REF_COLUMNS} FROM teams WHERE id = ANY($1::int[])")
+TEAM_REF_BY_OWNER = register(
+    "team_ref_by_owner",
+    f"SELECT {TEAM_REF_COLUMNS} FROM teams WHERE tournament_id = $1 AND owner_id = $2"
+)
+PLAYER_REF_BY_ID = register("player_ref_by_id", f"SELECT {PLAYER_REF_COLUMNS} FROM players WHERE id = $1")
+PLAYER_REFS_BY_IDS = register("player_refs_by_ids", f"SELECT {PLAYER_REF_COLUMNS} FROM players WHERE id = ANY($1::int[])")
+AUCTION_REF_BY_ID = register(
+    "auction_ref_by_id",
+    "SELECT id, tournament_id, status, current_player_id, timer_seconds, bid_increment, started_at FROM auctions WHERE id = $1"
+)
+TOURNAMENT_RULES_BY_ID = register(
+    "tournament_rules_by_id",
+    "SELECT id, squad_rules::text AS squad_rules_json FROM tournaments WHERE id = $1"
+)
+
+AUCTION_BY_ID = register("auction_by_id", "SELECT * FROM auctions WHERE id = $1")
+
+HIGHEST_BID = register("highest_bid", """
+    SELECT b.*, t.name as team_name
+    FROM bids b
+    JOIN teams t ON b.team_id = t.id
+    WHERE b.auction_id = $1 AND b.player_id = $2
+    ORDER BY b.amount DESC, b.created_at ASC
+    LIMIT 1
+""")
+
+TEAM_BUDGETS = register("team_budgets", """
+    SELECT
+        t.id as team_id,
+        t.name as team_name,
+        t.budget,
+        t.remaining_budget,
+        (t.budget - t.remaining_budget) as spent
+    FROM teams t
+    WHERE t.tournament_id = $1
+    ORDER BY t.name
+""")
+
+QUEUE_SUMMARY = register("queue_summary", """
+    SELECT
+        ap.player_id,
+        p.name as player_name,
+        ap.order_index,
+        ap.status
+    FROM auction_players ap
+    JOIN players p ON ap.player_id = p.id
+    WHERE ap.auction_id = $1
+    ORDER BY ap.order_index
+""")
@@ -1,14 +1,27 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from app.db.connection import init_db, close_db
 from app.api.v1.router import api_router
 from app.websocket.auction_ws import router as ws_router
+from app.websocket.replay_ws import router as replay_ws_router
 from app.services.timer_service import timer_service
+from app.services.auth_service import password_hasher
+from app.services.metrics_sampler import metrics_sampler
+from app.services.auction_shards import shard_registry
+from app.services.auction_actor import auction_actors
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
+from app.middleware.dataloader import DataLoaderMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.config.settings import settings
+from app.core.metrics import render_prometheus
 from app.core.logging import setup_logging
 from contextlib import asynccontextmanager
+from typing import Optional
+import secrets
 import logging
 
 # Setup logging
@@ -20,13 +33,19 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up application...")
     await init_db()
+    await shard_registry.start_background_task()
     await timer_service.connect()
     timer_service.start_background_task()
+    metrics_sampler.start_background_task()
     yield
     # Shutdown
     logger.info("Shutting down application...")
     await timer_service.stop_background_task()
+    await auction_actors.stop_all()
+    await metrics_sampler.stop_background_task()
+    await shard_registry.stop_background_task()
     await close_db()
+    password_hasher.shutdown()
 
 app = FastAPI(title="Sports Auction Platform", lifespan=lifespan)
 
@@ -34,10 +53,19 @@ import os
 
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173,http://localhost").split(",")
 
+# Request-scoped batched lookups (innermost, so the scope wraps the route handler)
+app.add_middleware(DataLoaderMiddleware)
+
 # Security middleware
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(RateLimitMiddleware)
 
+# Span traces (outside rate limiting so its Redis calls show up in the tree)
+app.add_middleware(TracingMiddleware)
+
+# Request latency by route template (outside rate limiting so 429s are timed too)
+app.add_middleware(MetricsMiddleware)
+
 # Compression middleware
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
@@ -54,6 +82,7 @@ app.add_middleware(
 
 app.include_router(api_router)
 app.include_router(ws_router)
+app.include_router(replay_ws_router)
 
 @app.get("/")
 async def root():
@@ -62,3 +91,12 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus scrape endpoint; metrics are per worker process"""
+    if settings.metrics_token:
+        expected = f"Bearer {settings.metrics_token}"
+        if not authorization or not secrets.compare_digest(authorization, expected):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
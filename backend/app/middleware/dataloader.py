@@ -0,0 +1,15 @@
+from app.db.dataloader import loader_scope
+
+class DataLoaderMiddleware:
+    """Open a request-scoped DataLoader scope for every HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with loader_scope():
+            await self.app(scope, receive, send)
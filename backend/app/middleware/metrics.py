@@ -0,0 +1,44 @@
+import time
+
+from app.core.metrics import Histogram
+
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+
+class MetricsMiddleware:
+    """Time every HTTP request, labelled by its route template rather than the raw path"""
+
+    def __init__(self, app):
+        self.app = app
+        self._templates = None
+
+    def _route_template(self, scope) -> str:
+        # Starlette records the matched endpoint in the scope; map it back to its path template
+        if self._templates is None:
+            self._templates = {
+                route.endpoint: route.path_format
+                for route in scope["app"].routes if hasattr(route, "endpoint")
+            }
+        return self._templates.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_duration_seconds.observe(
+                time.perf_counter() - start, scope["method"], self._route_template(scope), str(status)
+            )
@@ -1,7 +1,7 @@
 from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
-import redis.asyncio as redis
 from app.config.settings import settings
+from app.core.redis_client import connect_redis
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, redis_url: str = None):
@@ -11,11 +11,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
     async def get_redis(self):
         if not self.redis_client:
-            self.redis_client = await redis.from_url(self.redis_url)
+            self.redis_client = await connect_redis(self.redis_url)
         return self.redis_client
 
     async def dispatch(self, request: Request, call_next):
-        if request.url.path in ["/health", "/"]:
+        if request.url.path in ["/health", "/", "/metrics"]:
             return await call_next(request)
 
         client_ip = request.client.host
@@ -0,0 +1,28 @@
+from app.core import tracing
+
+class TracingMiddleware:
+    """Start a span trace for requests that ask for one (X-Trace: 1) or are sampled"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        forced = any(
+            name == tracing.TRACE_HEADER.encode() and value.strip() in (b"1", b"true")
+            for name, value in scope["headers"]
+        )
+        with tracing.trace(f'{scope["method"]} {scope["path"]}', forced=forced) as current:
+            if current is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    current.root.attrs["status"] = message["status"]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -1,24 +1,50 @@
 import asyncpg
 from typing import List, Dict
 
+# Shared tail of the dashboard queries: every section is serialized to JSON
+# in Postgres from CTEs named summary_row, team_rows, top_rows, position_rows
+# and unsold_rows, so the whole dashboard is one round trip and one string.
+DASHBOARD_JSON = """
+    SELECT json_build_object(
+        'summary', (SELECT row_to_json(s) FROM summary_row s),
+        'team_spending', (SELECT COALESCE(json_agg(json_build_object(
+            'team_id', team_id, 'team_name', team_name, 'total_budget', total_budget,
+            'remaining_budget', remaining_budget, 'spent', spent, 'players_bought', players_won,
+            'avg_player_price', CASE WHEN players_won > 0 THEN spent / players_won ELSE 0 END
+        ) ORDER BY spent DESC), '[]') FROM team_rows),
+        'bidding_activity', (SELECT COALESCE(json_agg(json_build_object(
+            'team_id', team_id, 'team_name', team_name, 'total_bids', total_bids,
+            'players_bid_on', players_bid_on, 'players_won', players_won
+        ) ORDER BY total_bids DESC), '[]') FROM team_rows),
+        'top_players', (SELECT COALESCE(json_agg(t ORDER BY t.sold_price DESC), '[]') FROM top_rows t),
+        'position_spending', (SELECT COALESCE(json_agg(p ORDER BY p.total_spent DESC), '[]') FROM position_rows p),
+        'unsold_players', (SELECT COALESCE(json_agg(u ORDER BY u.base_price DESC), '[]') FROM unsold_rows u)
+    )::text
+"""
+
 class AnalyticsRepository:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
     async def get_auction_summary(self, auction_id: int) -> Dict:
         async with self.pool.acquire() as conn:
+            # Lots and bids are aggregated separately; joining them first would
+            # multiply every lot by its bid count
             summary = await conn.fetchrow("""
-                SELECT 
-                    COUNT(DISTINCT ap.id) as total_players,
-                    COUNT(DISTINCT CASE WHEN ap.status = 'sold' THEN ap.id END) as players_sold,
-                    COUNT(DISTINCT CASE WHEN ap.status = 'unsold' THEN ap.id END) as players_unsold,
-                    COALESCE(SUM(ap.sold_price), 0) as total_spent,
-                    COALESCE(AVG(ap.sold_price), 0) as avg_price,
-                    COALESCE(MAX(ap.sold_price), 0) as highest_price,
-                    COUNT(DISTINCT b.id) as total_bids
-                FROM auction_players ap
-                LEFT JOIN bids b ON b.auction_id = ap.auction_id AND b.player_id = ap.player_id
-                WHERE ap.auction_id = $1
+                WITH lots AS (
+                    SELECT 
+                        COUNT(*) as total_players,
+                        COUNT(*) FILTER (WHERE status = 'completed') as players_sold,
+                        COUNT(*) FILTER (WHERE status = 'unsold') as players_unsold,
+                        COALESCE(SUM(final_price), 0) as total_spent,
+                        COALESCE(AVG(final_price), 0) as avg_price,
+                        COALESCE(MAX(final_price), 0) as highest_price
+                    FROM auction_players
+                    WHERE auction_id = $1
+                ), bid_totals AS (
+                    SELECT COUNT(*) as total_bids FROM bids WHERE auction_id = $1
+                )
+                SELECT lots.*, bid_totals.total_bids FROM lots, bid_totals
             """, auction_id)
             return dict(summary)
 
@@ -30,11 +56,11 @@ class AnalyticsRepository:
                     t.name as team_name,
                     t.budget as total_budget,
                     t.remaining_budget,
-                    COALESCE(SUM(ap.sold_price), 0) as spent,
+                    COALESCE(SUM(ap.final_price), 0) as spent,
                     COUNT(ap.id) as players_bought,
-                    COALESCE(AVG(ap.sold_price), 0) as avg_player_price
+                    COALESCE(AVG(ap.final_price), 0) as avg_player_price
                 FROM teams t
-                LEFT JOIN auction_players ap ON ap.sold_to_team_id = t.id AND ap.auction_id = $1
+                LEFT JOIN auction_players ap ON ap.sold_to_team_id = t.id AND ap.auction_id = $1 AND ap.status = 'completed'
                 WHERE t.tournament_id = (SELECT tournament_id FROM auctions WHERE id = $1)
                 GROUP BY t.id, t.name, t.budget, t.remaining_budget
                 ORDER BY spent DESC
@@ -43,20 +69,29 @@ class AnalyticsRepository:
 
     async def get_most_expensive_players(self, auction_id: int, limit: int = 10) -> List[Dict]:
         async with self.pool.acquire() as conn:
+            # Pick the top lots first, then count bids only for those
             rows = await conn.fetch("""
+                WITH top_lots AS (
+                    SELECT player_id, sold_to_team_id, final_price
+                    FROM auction_players
+                    WHERE auction_id = $1 AND status = 'completed'
+                    ORDER BY final_price DESC
+                    LIMIT $2
+                )
                 SELECT 
                     p.id, p.name, p.position, p.sport,
-                    ap.sold_price,
+                    tl.final_price as sold_price,
                     t.name as team_name,
-                    COUNT(b.id) as bid_count
-                FROM auction_players ap
-                JOIN players p ON ap.player_id = p.id
-                JOIN teams t ON ap.sold_to_team_id = t.id
-                LEFT JOIN bids b ON b.auction_id = ap.auction_id AND b.player_id = ap.player_id
-                WHERE ap.auction_id = $1 AND ap.status = 'sold'
-                GROUP BY p.id, p.name, p.position, p.sport, ap.sold_price, t.name
-                ORDER BY ap.sold_price DESC
-                LIMIT $2
+                    bc.bid_count
+                FROM top_lots tl
+                JOIN players p ON tl.player_id = p.id
+                JOIN teams t ON tl.sold_to_team_id = t.id
+                CROSS JOIN LATERAL (
+                    SELECT COUNT(*) as bid_count
+                    FROM bids b
+                    WHERE b.auction_id = $1 AND b.player_id = tl.player_id
+                ) bc
+                ORDER BY tl.final_price DESC
             """, auction_id, limit)
             return [dict(row) for row in rows]
 
@@ -66,12 +101,12 @@ class AnalyticsRepository:
                 SELECT 
                     p.position,
                     COUNT(ap.id) as players_count,
-                    COALESCE(SUM(ap.sold_price), 0) as total_spent,
-                    COALESCE(AVG(ap.sold_price), 0) as avg_price,
-                    COALESCE(MAX(ap.sold_price), 0) as max_price
+                    COALESCE(SUM(ap.final_price), 0) as total_spent,
+                    COALESCE(AVG(ap.final_price), 0) as avg_price,
+                    COALESCE(MAX(ap.final_price), 0) as max_price
                 FROM auction_players ap
                 JOIN players p ON ap.player_id = p.id
-                WHERE ap.auction_id = $1 AND ap.status = 'sold'
+                WHERE ap.auction_id = $1 AND ap.status = 'completed'
                 GROUP BY p.position
                 ORDER BY total_spent DESC
             """, auction_id)
@@ -79,18 +114,30 @@ class AnalyticsRepository:
 
     async def get_bidding_activity(self, auction_id: int) -> List[Dict]:
         async with self.pool.acquire() as conn:
+            # Bids and wins are aggregated per team before joining, so a team's
+            # bids are not repeated once per player it won
             rows = await conn.fetch("""
+                WITH bid_stats AS (
+                    SELECT team_id, COUNT(*) as total_bids, COUNT(DISTINCT player_id) as players_bid_on
+                    FROM bids
+                    WHERE auction_id = $1
+                    GROUP BY team_id
+                ), wins AS (
+                    SELECT sold_to_team_id as team_id, COUNT(*) as players_won
+                    FROM auction_players
+                    WHERE auction_id = $1 AND status = 'completed'
+                    GROUP BY sold_to_team_id
+                )
                 SELECT 
                     t.id as team_id,
                     t.name as team_name,
-                    COUNT(b.id) as total_bids,
-                    COUNT(DISTINCT b.player_id) as players_bid_on,
-                    COUNT(DISTINCT ap.id) as players_won
+                    COALESCE(bs.total_bids, 0) as total_bids,
+                    COALESCE(bs.players_bid_on, 0) as players_bid_on,
+                    COALESCE(w.players_won, 0) as players_won
                 FROM teams t
-                LEFT JOIN bids b ON b.team_id = t.id AND b.auction_id = $1
-                LEFT JOIN auction_players ap ON ap.sold_to_team_id = t.id AND ap.auction_id = $1
+                LEFT JOIN bid_stats bs ON bs.team_id = t.id
+                LEFT JOIN wins w ON w.team_id = t.id
                 WHERE t.tournament_id = (SELECT tournament_id FROM auctions WHERE id = $1)
-                GROUP BY t.id, t.name
                 ORDER BY total_bids DESC
             """, auction_id)
             return [dict(row) for row in rows]
@@ -101,10 +148,10 @@ class AnalyticsRepository:
                 SELECT 
                     p.position,
                     COUNT(*) as count,
-                    COALESCE(SUM(ap.sold_price), 0) as total_spent
+                    COALESCE(SUM(ap.final_price), 0) as total_spent
                 FROM auction_players ap
                 JOIN players p ON ap.player_id = p.id
-                WHERE ap.sold_to_team_id = $1 AND ap.auction_id = $2 AND ap.status = 'sold'
+                WHERE ap.sold_to_team_id = $1 AND ap.auction_id = $2 AND ap.status = 'completed'
                 GROUP BY p.position
                 ORDER BY count DESC
             """, team_id, auction_id)
@@ -115,13 +162,87 @@ class AnalyticsRepository:
             rows = await conn.fetch("""
                 SELECT 
                     p.id, p.name, p.position, p.base_price, p.sport,
-                    COUNT(b.id) as bid_count,
-                    COALESCE(MAX(b.amount), 0) as highest_bid
+                    bs.bid_count,
+                    COALESCE(bs.highest_bid, 0) as highest_bid
                 FROM auction_players ap
                 JOIN players p ON ap.player_id = p.id
-                LEFT JOIN bids b ON b.auction_id = ap.auction_id AND b.player_id = ap.player_id
+                CROSS JOIN LATERAL (
+                    SELECT COUNT(*) as bid_count, MAX(b.amount) as highest_bid
+                    FROM bids b
+                    WHERE b.auction_id = ap.auction_id AND b.player_id = ap.player_id
+                ) bs
                 WHERE ap.auction_id = $1 AND ap.status = 'unsold'
-                GROUP BY p.id, p.name, p.position, p.base_price, p.sport
                 ORDER BY p.base_price DESC
             """, auction_id)
             return [dict(row) for row in rows]
+
+    async def get_dashboard_json(self, auction_id: int, top_limit: int = 10) -> str:
+        """Every dashboard section as one JSON document, from a single scan of the auction's bids"""
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(f"""
+                WITH lot_team_bids AS (
+                    SELECT player_id, team_id, COUNT(*) as bids, MAX(amount) as highest
+                    FROM bids
+                    WHERE auction_id = $1
+                    GROUP BY player_id, team_id
+                ), lot_bids AS (
+                    SELECT player_id, SUM(bids) as bid_count, MAX(highest) as highest_bid
+                    FROM lot_team_bids
+                    GROUP BY player_id
+                ), team_bids AS (
+                    SELECT team_id, SUM(bids) as total_bids, COUNT(*) as players_bid_on
+                    FROM lot_team_bids
+                    GROUP BY team_id
+                ), lots AS (
+                    SELECT ap.player_id, ap.status, ap.sold_to_team_id, ap.final_price,
+                           p.name, p.position, p.sport, p.base_price
+                    FROM auction_players ap
+                    JOIN players p ON p.id = ap.player_id
+                    WHERE ap.auction_id = $1
+                ), wins AS (
+                    SELECT sold_to_team_id as team_id, COUNT(*) as players_won, SUM(final_price) as spent
+                    FROM lots
+                    WHERE status = 'completed'
+                    GROUP BY sold_to_team_id
+                ), summary_row AS (
+                    SELECT 
+                        COUNT(*) as total_players,
+                        COUNT(*) FILTER (WHERE status = 'completed') as players_sold,
+                        COUNT(*) FILTER (WHERE status = 'unsold') as players_unsold,
+                        COALESCE(SUM(final_price), 0) as total_spent,
+                        COALESCE(AVG(final_price), 0) as avg_price,
+                        COALESCE(MAX(final_price), 0) as highest_price,
+                        (SELECT COALESCE(SUM(bid_count), 0) FROM lot_bids) as total_bids
+                    FROM lots
+                ), team_rows AS (
+                    SELECT t.id as team_id, t.name as team_name, t.budget as total_budget, t.remaining_budget,
+                           COALESCE(w.spent, 0) as spent, COALESCE(w.players_won, 0) as players_won,
+                           COALESCE(tb.total_bids, 0) as total_bids, COALESCE(tb.players_bid_on, 0) as players_bid_on
+                    FROM teams t
+                    LEFT JOIN wins w ON w.team_id = t.id
+                    LEFT JOIN team_bids tb ON tb.team_id = t.id
+                    WHERE t.tournament_id = (SELECT tournament_id FROM auctions WHERE id = $1)
+                ), top_rows AS (
+                    SELECT l.player_id as id, l.name, l.position, l.sport, l.final_price as sold_price,
+                           t.name as team_name, COALESCE(lb.bid_count, 0) as bid_count
+                    FROM lots l
+                    JOIN teams t ON t.id = l.sold_to_team_id
+                    LEFT JOIN lot_bids lb ON lb.player_id = l.player_id
+                    WHERE l.status = 'completed'
+                    ORDER BY l.final_price DESC
+                    LIMIT $2
+                ), position_rows AS (
+                    SELECT position, COUNT(*) as players_count, COALESCE(SUM(final_price), 0) as total_spent,
+                           COALESCE(AVG(final_price), 0) as avg_price, COALESCE(MAX(final_price), 0) as max_price
+                    FROM lots
+                    WHERE status = 'completed'
+                    GROUP BY position
+                ), unsold_rows AS (
+                    SELECT l.player_id as id, l.name, l.position, l.base_price, l.sport,
+                           COALESCE(lb.bid_count, 0) as bid_count, COALESCE(lb.highest_bid, 0) as highest_bid
+                    FROM lots l
+                    LEFT JOIN lot_bids lb ON lb.player_id = l.player_id
+                    WHERE l.status = 'unsold'
+                )
+                {DASHBOARD_JSON}
+            """, auction_id, top_limit)
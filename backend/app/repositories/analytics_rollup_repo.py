@@ -0,0 +1,363 @@
+"""Incrementally maintained per-auction analytics (see migrations/add_analytics_rollups.sql).
+
+Writers bump counters as bids are accepted and lots close, so the analytics
+endpoints read O(teams + positions) rows instead of re-aggregating bids. The
+repositories that write bids and lot outcomes pass their connection, so each
+counter update commits in the same transaction as the row it counts.
+"""
+from app.db.connection import execute, fetch_one_read, fetch_all_read, get_pool, get_read_pool
+from app.repositories.analytics_repo import DASHBOARD_JSON
+from decimal import Decimal
+from typing import Dict, List, Optional, Set
+
+# Auctions known to have rollups; rows are only ever removed by rebuild(),
+# which recreates them in the same transaction
+_rollup_auctions: Set[int] = set()
+
+async def has_rollups(auction_id: int) -> bool:
+    if auction_id in _rollup_auctions:
+        return True
+    row = await fetch_one_read("SELECT 1 FROM auction_stats WHERE auction_id = $1", auction_id)
+    if row:
+        _rollup_auctions.add(auction_id)
+    return row is not None
+
+async def record_lots(auction_id: int, count: int, conn=None):
+    """Open (or extend) an auction's rollups; pass ``conn`` to join the caller's transaction"""
+    await (conn.execute if conn else execute)(
+        """
+        INSERT INTO auction_stats (auction_id, total_players) VALUES ($1, $2)
+        ON CONFLICT (auction_id) DO UPDATE SET total_players = auction_stats.total_players + EXCLUDED.total_players
+        """,
+        auction_id, count
+    )
+
+async def record_bid(auction_id: int, player_id: int, team_id: int, amount: Decimal, conn=None):
+    await (conn.execute if conn else execute)(
+        """
+        WITH pair AS (
+            INSERT INTO auction_lot_team_stats (auction_id, player_id, team_id, bids_count)
+            VALUES ($1, $2, $3, 1)
+            ON CONFLICT (auction_id, player_id, team_id)
+            DO UPDATE SET bids_count = auction_lot_team_stats.bids_count + 1
+            RETURNING (xmax = 0) AS first_bid
+        ), lot AS (
+            INSERT INTO auction_lot_stats (auction_id, player_id, bids_count, highest_bid)
+            VALUES ($1, $2, 1, $4)
+            ON CONFLICT (auction_id, player_id)
+            DO UPDATE SET bids_count = auction_lot_stats.bids_count + 1,
+                          highest_bid = GREATEST(auction_lot_stats.highest_bid, EXCLUDED.highest_bid)
+        ), auction AS (
+            UPDATE auction_stats SET total_bids = total_bids + 1 WHERE auction_id = $1
+        )
+        INSERT INTO auction_team_stats (auction_id, team_id, bids_count, players_bid_on)
+        SELECT $1, $3, 1, first_bid::int FROM pair
+        ON CONFLICT (auction_id, team_id)
+        DO UPDATE SET bids_count = auction_team_stats.bids_count + 1,
+                      players_bid_on = auction_team_stats.players_bid_on + EXCLUDED.players_bid_on
+        """,
+        auction_id, player_id, team_id, amount
+    )
+
+async def record_undo(auction_id: int, player_id: int, team_id: int, new_highest: Optional[Decimal], conn=None):
+    """Reverse record_bid for an undone bid; ``new_highest`` is the lot's highest bid after the undo"""
+    await (conn.execute if conn else execute)(
+        """
+        WITH gone AS (
+            -- The team's only bid on the lot: the pair disappears, as it would in rebuild()
+            DELETE FROM auction_lot_team_stats
+            WHERE auction_id = $1 AND player_id = $2 AND team_id = $3 AND bids_count <= 1
+            RETURNING 1
+        ), pair AS (
+            UPDATE auction_lot_team_stats SET bids_count = bids_count - 1
+            WHERE auction_id = $1 AND player_id = $2 AND team_id = $3 AND bids_count > 1
+        ), lot AS (
+            UPDATE auction_lot_stats SET bids_count = GREATEST(bids_count - 1, 0), highest_bid = $4
+            WHERE auction_id = $1 AND player_id = $2
+        ), auction AS (
+            UPDATE auction_stats SET total_bids = GREATEST(total_bids - 1, 0) WHERE auction_id = $1
+        )
+        UPDATE auction_team_stats
+        SET bids_count = GREATEST(bids_count - 1, 0),
+            players_bid_on = players_bid_on - (SELECT COUNT(*) FROM gone)
+        WHERE auction_id = $1 AND team_id = $3
+        """,
+        auction_id, player_id, team_id, new_highest
+    )
+
+async def record_sale(auction_id: int, player_id: int, team_id: int, amount: Decimal, position: Optional[str], conn=None):
+    # Applied at most once per lot; a lot re-auctioned after going unsold moves
+    # from the unsold count to the sold one
+    await (conn.execute if conn else execute)(
+        """
+        WITH prev AS (
+            SELECT status FROM auction_lot_stats WHERE auction_id = $1 AND player_id = $2 FOR UPDATE
+        ), lot AS (
+            INSERT INTO auction_lot_stats (auction_id, player_id, status, sold_to_team_id, sold_price)
+            VALUES ($1, $2, 'sold', $3, $4)
+            ON CONFLICT (auction_id, player_id)
+            DO UPDATE SET status = 'sold', sold_to_team_id = EXCLUDED.sold_to_team_id, sold_price = EXCLUDED.sold_price
+            WHERE auction_lot_stats.status <> 'sold'
+            RETURNING 1
+        ), team AS (
+            INSERT INTO auction_team_stats (auction_id, team_id, players_won, spent)
+            SELECT $1, $3, 1, $4 FROM lot
+            ON CONFLICT (auction_id, team_id)
+            DO UPDATE SET players_won = auction_team_stats.players_won + 1,
+                          spent = auction_team_stats.spent + EXCLUDED.spent
+        ), pos AS (
+            INSERT INTO auction_position_stats (auction_id, position, players_count, total_spent, max_price)
+            SELECT $1, COALESCE($5, ''), 1, $4, $4 FROM lot
+            ON CONFLICT (auction_id, position)
+            DO UPDATE SET players_count = auction_position_stats.players_count + 1,
+                          total_spent = auction_position_stats.total_spent + EXCLUDED.total_spent,
+                          max_price = GREATEST(auction_position_stats.max_price, EXCLUDED.max_price)
+        )
+        UPDATE auction_stats
+        SET players_sold = players_sold + 1,
+            players_unsold = players_unsold - (SELECT COUNT(*) FROM prev WHERE status = 'unsold'),
+            total_spent = total_spent + $4,
+            highest_price = GREATEST(highest_price, $4)
+        WHERE auction_id = $1 AND EXISTS (SELECT 1 FROM lot)
+        """,
+        auction_id, player_id, team_id, amount, position
+    )
+
+async def record_unsold(auction_id: int, player_id: int, conn=None):
+    await (conn.execute if conn else execute)(
+        """
+        WITH lot AS (
+            INSERT INTO auction_lot_stats (auction_id, player_id, status)
+            VALUES ($1, $2, 'unsold')
+            ON CONFLICT (auction_id, player_id)
+            DO UPDATE SET status = 'unsold'
+            WHERE auction_lot_stats.status = 'open'
+            RETURNING 1
+        )
+        UPDATE auction_stats SET players_unsold = players_unsold + 1
+        WHERE auction_id = $1 AND EXISTS (SELECT 1 FROM lot)
+        """,
+        auction_id, player_id
+    )
+
+async def rebuild(auction_id: int):
+    """Recompute an auction's rollups from bids and auction_players.
+
+    Used to backfill auctions created before the rollups existed, or to repair
+    drift; run it while the auction is not taking bids.
+    """
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            for table in ("auction_stats", "auction_team_stats", "auction_position_stats",
+                          "auction_lot_stats", "auction_lot_team_stats"):
+                await conn.execute(f"DELETE FROM {table} WHERE auction_id = $1", auction_id)
+
+            await conn.execute(
+                """
+                INSERT INTO auction_lot_team_stats (auction_id, player_id, team_id, bids_count)
+                SELECT auction_id, player_id, team_id, COUNT(*)
+                FROM bids WHERE auction_id = $1
+                GROUP BY auction_id, player_id, team_id
+                """,
+                auction_id
+            )
+            await conn.execute(
+                """
+                INSERT INTO auction_lot_stats (auction_id, player_id, status, bids_count, highest_bid, sold_to_team_id, sold_price)
+                SELECT ap.auction_id, ap.player_id,
+                       CASE ap.status WHEN 'completed' THEN 'sold' WHEN 'unsold' THEN 'unsold' ELSE 'open' END,
+                       COALESCE(b.bids_count, 0), b.highest_bid, ap.sold_to_team_id, ap.final_price
+                FROM auction_players ap
+                LEFT JOIN (
+                    SELECT player_id, COUNT(*) AS bids_count, MAX(amount) AS highest_bid
+                    FROM bids WHERE auction_id = $1
+                    GROUP BY player_id
+                ) b ON b.player_id = ap.player_id
+                WHERE ap.auction_id = $1
+                """,
+                auction_id
+            )
+            await conn.execute(
+                """
+                INSERT INTO auction_team_stats (auction_id, team_id, bids_count, players_bid_on, players_won, spent)
+                SELECT $1::int, t.id, COALESCE(b.bids_count, 0), COALESCE(b.lots, 0), COALESCE(w.won, 0), COALESCE(w.spent, 0)
+                FROM teams t
+                LEFT JOIN (
+                    SELECT team_id, SUM(bids_count) AS bids_count, COUNT(*) AS lots
+                    FROM auction_lot_team_stats WHERE auction_id = $1
+                    GROUP BY team_id
+                ) b ON b.team_id = t.id
+                LEFT JOIN (
+                    SELECT sold_to_team_id AS team_id, COUNT(*) AS won, SUM(sold_price) AS spent
+                    FROM auction_lot_stats WHERE auction_id = $1 AND status = 'sold'
+                    GROUP BY sold_to_team_id
+                ) w ON w.team_id = t.id
+                WHERE t.tournament_id = (SELECT tournament_id FROM auctions WHERE id = $1)
+                """,
+                auction_id
+            )
+            await conn.execute(
+                """
+                INSERT INTO auction_position_stats (auction_id, position, players_count, total_spent, max_price)
+                SELECT $1::int, COALESCE(p.position, ''), COUNT(*), COALESCE(SUM(l.sold_price), 0), COALESCE(MAX(l.sold_price), 0)
+                FROM auction_lot_stats l
+                JOIN players p ON p.id = l.player_id
+                WHERE l.auction_id = $1 AND l.status = 'sold'
+                GROUP BY COALESCE(p.position, '')
+                """,
+                auction_id
+            )
+            await conn.execute(
+                """
+                INSERT INTO auction_stats (auction_id, total_players, players_sold, players_unsold, total_spent, highest_price, total_bids)
+                SELECT $1::int,
+                       COUNT(*),
+                       COUNT(*) FILTER (WHERE status = 'sold'),
+                       COUNT(*) FILTER (WHERE status = 'unsold'),
+                       COALESCE(SUM(sold_price) FILTER (WHERE status = 'sold'), 0),
+                       COALESCE(MAX(sold_price) FILTER (WHERE status = 'sold'), 0),
+                       (SELECT COUNT(*) FROM bids WHERE auction_id = $1)
+                FROM auction_lot_stats
+                WHERE auction_id = $1
+                """,
+                auction_id
+            )
+    _rollup_auctions.add(auction_id)
+
+async def get_auction_summary(auction_id: int) -> Optional[Dict]:
+    return await fetch_one_read(
+        """
+        SELECT total_players, players_sold, players_unsold, total_spent,
+               CASE WHEN players_sold > 0 THEN total_spent / players_sold ELSE 0 END AS avg_price,
+               highest_price, total_bids
+        FROM auction_stats
+        WHERE auction_id = $1
+        """,
+        auction_id
+    )
+
+async def get_team_spending(auction_id: int) -> List[Dict]:
+    return await fetch_all_read(
+        """
+        SELECT
+            t.id as team_id,
+            t.name as team_name,
+            t.budget as total_budget,
+            t.remaining_budget,
+            COALESCE(s.spent, 0) as spent,
+            COALESCE(s.players_won, 0) as players_bought,
+            CASE WHEN s.players_won > 0 THEN s.spent / s.players_won ELSE 0 END as avg_player_price
+        FROM teams t
+        LEFT JOIN auction_team_stats s ON s.auction_id = $1 AND s.team_id = t.id
+        WHERE t.tournament_id = (SELECT tournament_id FROM auctions WHERE id = $1)
+        ORDER BY spent DESC
+        """,
+        auction_id
+    )
+
+async def get_most_expensive_players(auction_id: int, limit: int = 10) -> List[Dict]:
+    return await fetch_all_read(
+        """
+        SELECT
+            p.id, p.name, p.position, p.sport,
+            l.sold_price,
+            t.name as team_name,
+            l.bids_count as bid_count
+        FROM auction_lot_stats l
+        JOIN players p ON p.id = l.player_id
+        JOIN teams t ON t.id = l.sold_to_team_id
+        WHERE l.auction_id = $1 AND l.status = 'sold'
+        ORDER BY l.sold_price DESC
+        LIMIT $2
+        """,
+        auction_id, limit
+    )
+
+async def get_position_wise_spending(auction_id: int) -> List[Dict]:
+    return await fetch_all_read(
+        """
+        SELECT
+            NULLIF(position, '') as position,
+            players_count,
+            total_spent,
+            total_spent / players_count as avg_price,
+            max_price
+        FROM auction_position_stats
+        WHERE auction_id = $1
+        ORDER BY total_spent DESC
+        """,
+        auction_id
+    )
+
+async def get_bidding_activity(auction_id: int) -> List[Dict]:
+    return await fetch_all_read(
+        """
+        SELECT
+            t.id as team_id,
+            t.name as team_name,
+            COALESCE(s.bids_count, 0) as total_bids,
+            COALESCE(s.players_bid_on, 0) as players_bid_on,
+            COALESCE(s.players_won, 0) as players_won
+        FROM teams t
+        LEFT JOIN auction_team_stats s ON s.auction_id = $1 AND s.team_id = t.id
+        WHERE t.tournament_id = (SELECT tournament_id FROM auctions WHERE id = $1)
+        ORDER BY total_bids DESC
+        """,
+        auction_id
+    )
+
+async def get_unsold_players(auction_id: int) -> List[Dict]:
+    return await fetch_all_read(
+        """
+        SELECT
+            p.id, p.name, p.position, p.base_price, p.sport,
+            l.bids_count as bid_count,
+            COALESCE(l.highest_bid, 0) as highest_bid
+        FROM auction_lot_stats l
+        JOIN players p ON p.id = l.player_id
+        WHERE l.auction_id = $1 AND l.status = 'unsold'
+        ORDER BY p.base_price DESC
+        """,
+        auction_id
+    )
+
+async def get_dashboard_json(auction_id: int, top_limit: int = 10) -> str:
+    """Every dashboard section as one JSON document, read from the rollups"""
+    async with get_read_pool().acquire() as conn:
+        return await conn.fetchval(f"""
+            WITH summary_row AS (
+                SELECT total_players, players_sold, players_unsold, total_spent,
+                       CASE WHEN players_sold > 0 THEN total_spent / players_sold ELSE 0 END AS avg_price,
+                       highest_price, total_bids
+                FROM auction_stats
+                WHERE auction_id = $1
+            ), team_rows AS (
+                SELECT t.id as team_id, t.name as team_name, t.budget as total_budget, t.remaining_budget,
+                       COALESCE(s.spent, 0) as spent, COALESCE(s.players_won, 0) as players_won,
+                       COALESCE(s.bids_count, 0) as total_bids, COALESCE(s.players_bid_on, 0) as players_bid_on
+                FROM teams t
+                LEFT JOIN auction_team_stats s ON s.auction_id = $1 AND s.team_id = t.id
+                WHERE t.tournament_id = (SELECT tournament_id FROM auctions WHERE id = $1)
+            ), top_rows AS (
+                SELECT p.id, p.name, p.position, p.sport, l.sold_price, t.name as team_name, l.bids_count as bid_count
+                FROM auction_lot_stats l
+                JOIN players p ON p.id = l.player_id
+                JOIN teams t ON t.id = l.sold_to_team_id
+                WHERE l.auction_id = $1 AND l.status = 'sold'
+                ORDER BY l.sold_price DESC
+                LIMIT $2
+            ), position_rows AS (
+                SELECT NULLIF(position, '') as position, players_count, total_spent,
+                       total_spent / players_count as avg_price, max_price
+                FROM auction_position_stats
+                WHERE auction_id = $1
+            ), unsold_rows AS (
+                SELECT p.id, p.name, p.position, p.base_price, p.sport,
+                       l.bids_count as bid_count, COALESCE(l.highest_bid, 0) as highest_bid
+                FROM auction_lot_stats l
+                JOIN players p ON p.id = l.player_id
+                WHERE l.auction_id = $1 AND l.status = 'unsold'
+            )
+            {DASHBOARD_JSON}
+        """, auction_id, top_limit)
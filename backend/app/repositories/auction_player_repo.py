@@ -1,6 +1,7 @@
 from app.db.connection import fetch_all, execute, get_pool
+from app.repositories import analytics_rollup_repo
 from app.schemas.auction import AuctionPlayerOut
-from typing import List
+from typing import List, Optional
 from decimal import Decimal
 
 async def insert_queue(auction_id: int, ordered_player_ids: List[int]):
@@ -15,6 +16,7 @@ async def insert_queue(auction_id: int, ordered_player_ids: List[int]):
                     """,
                     auction_id, player_id, idx
                 )
+            await analytics_rollup_repo.record_lots(auction_id, len(ordered_player_ids), conn)
 
 async def list_queue(auction_id: int) -> List[AuctionPlayerOut]:
     rows = await fetch_all(
@@ -29,22 +31,30 @@ async def update_queue_order(auction_id: int, player_id: int, new_order: int):
         new_order, auction_id, player_id
     )
 
-async def mark_sold(auction_id: int, player_id: int, team_id: int, final_price: Decimal):
-    await execute(
-        """
-        UPDATE auction_players
-        SET status = 'completed', sold_to_team_id = $1, final_price = $2, ended_at = CURRENT_TIMESTAMP
-        WHERE auction_id = $3 AND player_id = $4
-        """,
-        team_id, final_price, auction_id, player_id
-    )
+async def mark_sold(auction_id: int, player_id: int, team_id: int, final_price: Decimal, position: Optional[str]):
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                """
+                UPDATE auction_players
+                SET status = 'completed', sold_to_team_id = $1, final_price = $2, ended_at = CURRENT_TIMESTAMP
+                WHERE auction_id = $3 AND player_id = $4
+                """,
+                team_id, final_price, auction_id, player_id
+            )
+            await analytics_rollup_repo.record_sale(auction_id, player_id, team_id, final_price, position, conn)
 
 async def mark_unsold(auction_id: int, player_id: int):
-    await execute(
-        """
-        UPDATE auction_players
-        SET status = 'unsold', ended_at = CURRENT_TIMESTAMP
-        WHERE auction_id = $1 AND player_id = $2
-        """,
-        auction_id, player_id
-    )
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                """
+                UPDATE auction_players
+                SET status = 'unsold', ended_at = CURRENT_TIMESTAMP
+                WHERE auction_id = $1 AND player_id = $2
+                """,
+                auction_id, player_id
+            )
+            await analytics_rollup_repo.record_unsold(auction_id, player_id, conn)
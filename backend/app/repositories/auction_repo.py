@@ -1,6 +1,8 @@
-from app.db.connection import fetch_one, execute_returning, execute, get_pool
+from app.db.connection import fetch_one, execute_returning, execute, get_pool, fetch_one_prepared
+from app.db import statements
+from app.db.records import AuctionRef
 from app.schemas.auction import AuctionCreate, AuctionOut
-from app.repositories import auction_player_repo
+from app.repositories import auction_player_repo, analytics_rollup_repo
 from typing import Optional
 
 async def create_auction(auction: AuctionCreate) -> AuctionOut:
@@ -16,6 +18,7 @@ async def create_auction(auction: AuctionCreate) -> AuctionOut:
                 auction.tournament_id, auction.name, auction.timer_seconds
             )
             auction_id = row['id']
+            await conn.execute("SELECT ensure_auction_partitions($1)", auction_id)
             
             for idx, player_id in enumerate(auction.player_ids):
                 await conn.execute(
@@ -25,12 +28,16 @@ async def create_auction(auction: AuctionCreate) -> AuctionOut:
                     """,
                     auction_id, player_id, idx
                 )
+            await analytics_rollup_repo.record_lots(auction_id, len(auction.player_ids), conn)
             
             return AuctionOut(**dict(row))
 
 async def get_auction(auction_id: int) -> Optional[AuctionOut]:
-    row = await fetch_one("SELECT * FROM auctions WHERE id = $1", auction_id)
-    return AuctionOut(**row) if row else None
+    return await fetch_one_prepared(statements.AUCTION_BY_ID, auction_id, model=AuctionOut)
+
+async def get_auction_ref(auction_id: int) -> Optional[AuctionRef]:
+    """Auction state columns only, for the bid path"""
+    return await fetch_one_prepared(statements.AUCTION_REF_BY_ID, auction_id, model=AuctionRef)
 
 async def update_status(auction_id: int, status: str):
     await execute(
@@ -1,58 +1,77 @@
-from app.db.connection import get_pool
+from app.db.connection import get_pool, fetch_one_prepared
+from app.db import statements
+from app.repositories import analytics_rollup_repo, event_repo
 from app.schemas.bid import BidCreate, BidOut, BidWithTeamOut
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from decimal import Decimal
 
-async def create_bid(bid: BidCreate, team_id: int) -> BidOut:
+# Re-checked under the auction's lock: each worker's actor validates against
+# its own cached view, which can lag bids and sales made by another worker
+BID_LIMITS = """
+    SELECT COALESCE(
+               (SELECT MAX(amount) FROM bids WHERE auction_id = $1 AND player_id = $2)
+                   + COALESCE(a.bid_increment, 10000),
+               p.base_price
+           ) AS min_bid,
+           t.budget - COALESCE(
+               (SELECT SUM(final_price) FROM auction_players WHERE auction_id = $1 AND sold_to_team_id = $3), 0
+           ) AS available
+    FROM auctions a, players p, teams t
+    WHERE a.id = $1 AND p.id = $2 AND t.id = $3
+"""
+
+async def create_bid(bid: BidCreate, team_id: int, event_data: dict) -> Tuple[BidOut, int]:
+    """Insert a bid validated by its auction's actor, with its BID_PLACED event.
+
+    The minimum bid and the team's budget are checked again in the database
+    while holding the auction's advisory lock, so bids on an auction are
+    serialized across workers; a bid that no longer qualifies raises
+    ValueError. Both rows commit in one transaction, so the event log never
+    misses a bid (or records one that was not stored), and the analytics
+    rollups are bumped in the same transaction. Returns the bid and the
+    event's seq.
+    """
     pool = get_pool()
     async with pool.acquire() as conn:
-        # Get auction bid increment
-        auction = await conn.fetchrow("SELECT bid_increment FROM auctions WHERE id = $1", bid.auction_id)
-        bid_increment = auction['bid_increment'] if auction else Decimal(10000)
-        
-        # Get highest bid
-        highest = await conn.fetchrow(
-            "SELECT amount FROM bids WHERE auction_id = $1 AND player_id = $2 ORDER BY amount DESC LIMIT 1",
-            bid.auction_id, bid.player_id
-        )
-        
-        # Get player base price
-        player = await conn.fetchrow("SELECT base_price FROM players WHERE id = $1", bid.player_id)
-        min_bid = player['base_price'] if player else Decimal(0)
-        
-        if highest:
-            min_bid = highest['amount'] + bid_increment
-        
-        if bid.amount < min_bid:
-            raise ValueError(f"Bid must be at least {min_bid}")
-        
-        row = await conn.fetchrow(
-            """
-            INSERT INTO bids (auction_id, player_id, team_id, amount)
-            VALUES ($1, $2, $3, $4)
-            RETURNING *
-            """,
-            bid.auction_id, bid.player_id, team_id, bid.amount
-        )
-        return BidOut(**dict(row))
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", bid.auction_id)
+            limits = await conn.fetchrow(BID_LIMITS, bid.auction_id, bid.player_id, team_id)
+            if not limits:
+                raise ValueError("Auction, player or team not found")
+            if bid.amount < limits['min_bid']:
+                raise ValueError(f"Bid must be at least {limits['min_bid']}")
+            if bid.amount > limits['available']:
+                raise ValueError("Insufficient budget")
+            row = await conn.fetchrow(
+                """
+                INSERT INTO bids (auction_id, player_id, team_id, amount)
+                VALUES ($1, $2, $3, $4)
+                RETURNING *
+                """,
+                bid.auction_id, bid.player_id, team_id, bid.amount
+            )
+            seq = await event_repo.append_event(bid.auction_id, "BID_PLACED", event_data, conn=conn)
+            await analytics_rollup_repo.record_bid(bid.auction_id, bid.player_id, team_id, bid.amount, conn)
+        return BidOut(**dict(row)), seq
 
-async def get_highest_bid(auction_id: int, player_id: int) -> Optional[BidWithTeamOut]:
+async def delete_bid(auction_id: int, player_id: int, bid_id: int, team_id: int):
+    """Remove an undone bid and reverse its rollup counters in one transaction"""
     pool = get_pool()
     async with pool.acquire() as conn:
-        row = await conn.fetchrow(
-            """
-            SELECT b.*, t.name as team_name
-            FROM bids b
-            JOIN teams t ON b.team_id = t.id
-            WHERE b.auction_id = $1 AND b.player_id = $2
-            ORDER BY b.amount DESC, b.created_at ASC
-            LIMIT 1
-            """,
-            auction_id, player_id
-        )
-        return BidWithTeamOut(**dict(row)) if row else None
+        async with conn.transaction():
+            # bids is partitioned by auction, so the key is (auction_id, id)
+            await conn.execute("DELETE FROM bids WHERE auction_id = $1 AND id = $2", auction_id, bid_id)
+            new_highest = await conn.fetchval(
+                "SELECT MAX(amount) FROM bids WHERE auction_id = $1 AND player_id = $2",
+                auction_id, player_id
+            )
+            await analytics_rollup_repo.record_undo(auction_id, player_id, team_id, new_highest, conn)
+
+async def get_highest_bid(auction_id: int, player_id: int) -> Optional[BidWithTeamOut]:
+    return await fetch_one_prepared(statements.HIGHEST_BID, auction_id, player_id, model=BidWithTeamOut)
 
 async def get_bids_for_player(auction_id: int, player_id: int) -> List[BidWithTeamOut]:
+    """All bids on a lot in placement order (the order of its bid ledger)"""
     pool = get_pool()
     async with pool.acquire() as conn:
         rows = await conn.fetch(
@@ -61,7 +80,7 @@ async def get_bids_for_player(auction_id: int, player_id: int) -> List[BidWithTe
             FROM bids b
             JOIN teams t ON b.team_id = t.id
             WHERE b.auction_id = $1 AND b.player_id = $2
-            ORDER BY b.created_at DESC
+            ORDER BY b.id
             """,
             auction_id, player_id
         )
@@ -0,0 +1,120 @@
+"""Auction event log storage (see migrations/add_event_log.sql)."""
+from app.db.connection import execute, execute_returning, fetch_all, fetch_all_read, fetch_one, fetch_one_read
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+import json
+
+def _decode(row: dict) -> dict:
+    # asyncpg hands JSONB back as text
+    if isinstance(row.get('event_data'), str):
+        row['event_data'] = json.loads(row['event_data'])
+    return row
+
+def _naive_utc(value: datetime) -> datetime:
+    # auction_events.timestamp is a naive UTC TIMESTAMP (written with utcnow)
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+APPEND_EVENT = """
+    WITH head AS (
+        INSERT INTO auction_event_heads (auction_id, last_seq) VALUES ($1, 1)
+        ON CONFLICT (auction_id) DO UPDATE SET last_seq = auction_event_heads.last_seq + 1
+        RETURNING last_seq
+    )
+    INSERT INTO auction_events (auction_id, seq, event_type, event_data, timestamp)
+    SELECT $1, last_seq, $2, $3, $4 FROM head
+    RETURNING seq
+"""
+
+async def append_event(auction_id: int, event_type: str, event_data: dict, conn=None) -> int:
+    """Append an event under the auction's next sequence number and return it.
+
+    Pass ``conn`` to append inside the caller's transaction.
+    """
+    params = (auction_id, event_type, json.dumps(event_data), datetime.utcnow())
+    if conn is not None:
+        return await conn.fetchval(APPEND_EVENT, *params)
+    row = await execute_returning(APPEND_EVENT, *params)
+    return row['seq']
+
+async def list_events(auction_id: int, after_seq: int = 0, limit: int = 500, until_seq: Optional[int] = None,
+                      primary: bool = False) -> List[dict]:
+    """Events in sequence order, keyset-paged on seq; ``primary`` skips replica lag for recovery"""
+    rows = await (fetch_all if primary else fetch_all_read)(
+        """
+        SELECT id, seq, event_type, event_data, timestamp
+        FROM auction_events
+        WHERE auction_id = $1 AND seq > $2 AND ($3::bigint IS NULL OR seq <= $3)
+        ORDER BY seq
+        LIMIT $4
+        """,
+        auction_id, after_seq, until_seq, limit
+    )
+    return [_decode(row) for row in rows]
+
+async def page_events(
+    auction_id: int,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 500,
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+    event_types: Optional[Sequence[str]] = None
+) -> List[dict]:
+    """Replay page ordered by (timestamp, id), served by idx_events_auction_timestamp"""
+    conditions = ["auction_id = $1"]
+    params = [auction_id]
+
+    def param(value) -> str:
+        params.append(value)
+        return f"${len(params)}"
+
+    # Only filters that are set reach the SQL, as in player_repo.list_players_page
+    if after:
+        conditions.append(f"(timestamp, id) > ({param(after[0])}::timestamp, {param(after[1])}::int)")
+    if from_ts is not None:
+        conditions.append(f"timestamp >= {param(_naive_utc(from_ts))}")
+    if to_ts is not None:
+        conditions.append(f"timestamp <= {param(_naive_utc(to_ts))}")
+    if event_types:
+        conditions.append(f"event_type = ANY({param(list(event_types))}::text[])")
+
+    rows = await fetch_all_read(
+        f"""
+        SELECT id, seq, event_type, event_data, timestamp
+        FROM auction_events
+        WHERE {' AND '.join(conditions)}
+        ORDER BY timestamp, id
+        LIMIT {param(limit)}
+        """,
+        *params
+    )
+    return [_decode(row) for row in rows]
+
+async def get_head(auction_id: int) -> int:
+    row = await fetch_one_read("SELECT last_seq FROM auction_event_heads WHERE auction_id = $1", auction_id)
+    return row['last_seq'] if row else 0
+
+async def get_latest_snapshot(auction_id: int, at_seq: Optional[int] = None, primary: bool = False) -> Optional[dict]:
+    row = await (fetch_one if primary else fetch_one_read)(
+        """
+        SELECT seq, state::text AS state
+        FROM auction_snapshots
+        WHERE auction_id = $1 AND ($2::bigint IS NULL OR seq <= $2)
+        ORDER BY seq DESC
+        LIMIT 1
+        """,
+        auction_id, at_seq
+    )
+    if not row:
+        return None
+    return {"seq": row['seq'], "state": json.loads(row['state'])}
+
+async def save_snapshot(auction_id: int, seq: int, state: dict):
+    await execute(
+        """
+        INSERT INTO auction_snapshots (auction_id, seq, state) VALUES ($1, $2, $3)
+        ON CONFLICT (auction_id, seq) DO NOTHING
+        """,
+        auction_id, seq, json.dumps(state)
+    )
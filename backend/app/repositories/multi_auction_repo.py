@@ -1,4 +1,5 @@
 import asyncpg
+from app.repositories import analytics_rollup_repo
 from typing import List, Dict
 
 class MultiAuctionRepository:
@@ -12,8 +13,8 @@ class MultiAuctionRepository:
                     a.id, a.name, a.status, a.created_at,
                     t.name as tournament_name,
                     COUNT(DISTINCT ap.id) as total_players,
-                    COUNT(DISTINCT CASE WHEN ap.status = 'sold' THEN ap.id END) as sold_count,
-                    COALESCE(SUM(ap.sold_price), 0) as total_spent
+                    COUNT(DISTINCT CASE WHEN ap.status = 'completed' THEN ap.id END) as sold_count,
+                    COALESCE(SUM(ap.final_price), 0) as total_spent
                 FROM auctions a
                 JOIN tournaments t ON a.tournament_id = t.id
                 LEFT JOIN auction_players ap ON ap.auction_id = a.id
@@ -35,14 +36,16 @@ class MultiAuctionRepository:
                 VALUES ($1, $2, 'pending', $3, $4)
                 RETURNING id, tournament_id, name, status, created_at
             """, tournament_id, new_name, original['timer_seconds'], original['bid_increment'])
+            await conn.execute("SELECT ensure_auction_partitions($1)", new_auction['id'])
             
             # Copy players
-            await conn.execute("""
+            copied = await conn.execute("""
                 INSERT INTO auction_players (auction_id, player_id, status, order_index)
                 SELECT $1, player_id, 'pending', order_index
                 FROM auction_players
                 WHERE auction_id = $2
             """, new_auction['id'], auction_id)
+            await analytics_rollup_repo.record_lots(new_auction['id'], int(copied.split()[-1]), conn)
             
             return dict(new_auction)
 
@@ -1,9 +1,14 @@
-from app.db.connection import fetch_one, fetch_all, execute_returning, execute, get_pool
+from app.db.connection import fetch_all, execute_returning, execute, get_pool, fetch_one_prepared, fetch_prepared, record_decoder
+from app.db import statements
+from app.db.dataloader import get_loader, invalidate
+from app.db.records import PlayerRef
 from app.schemas.player import PlayerCreate, PlayerOut, PlayerUpdate
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from decimal import Decimal
 import json
 import csv
 import io
+import re
 
 async def create_player(player: PlayerCreate) -> PlayerOut:
     row = await execute_returning(
@@ -17,13 +22,97 @@ async def create_player(player: PlayerCreate) -> PlayerOut:
     )
     return PlayerOut(**row)
 
+async def get_players_by_ids(player_ids: List[int]) -> Dict[int, PlayerOut]:
+    players = await fetch_prepared(statements.PLAYERS_BY_IDS, list(player_ids), model=PlayerOut)
+    return {player.id: player for player in players}
+
 async def get_player(player_id: int) -> Optional[PlayerOut]:
-    row = await fetch_one("SELECT * FROM players WHERE id = $1", player_id)
-    return PlayerOut(**row) if row else None
+    loader = get_loader("player", get_players_by_ids)
+    if loader:
+        return await loader.load(player_id)
+    return await fetch_one_prepared(statements.PLAYER_BY_ID, player_id, model=PlayerOut)
+
+async def get_player_refs_by_ids(player_ids: List[int]) -> Dict[int, PlayerRef]:
+    players = await fetch_prepared(statements.PLAYER_REFS_BY_IDS, list(player_ids), model=PlayerRef)
+    return {player.id: player for player in players}
+
+async def get_player_ref(player_id: int) -> Optional[PlayerRef]:
+    """Slim player lookup without image_url/metadata for the bid path"""
+    loader = get_loader("player_ref", get_player_refs_by_ids)
+    if loader:
+        return await loader.load(player_id)
+    return await fetch_one_prepared(statements.PLAYER_REF_BY_ID, player_id, model=PlayerRef)
 
 async def list_players() -> List[PlayerOut]:
-    rows = await fetch_all("SELECT * FROM players ORDER BY name")
-    return [PlayerOut(**row) for row in rows]
+    return await fetch_prepared(statements.PLAYERS_ALL, model=PlayerOut)
+
+async def list_players_page(
+    after: Optional[Tuple[str, int]] = None,
+    limit: int = 100,
+    sport: Optional[str] = None,
+    position: Optional[str] = None,
+    min_rating: Optional[Decimal] = None,
+    max_rating: Optional[Decimal] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None
+) -> List[PlayerOut]:
+    """Keyset-paginated player listing ordered by (name, id)"""
+    conditions = []
+    params = []
+
+    def param(value) -> str:
+        params.append(value)
+        return f"${len(params)}"
+
+    # Only filters that are set reach the SQL, so each combination gets a plan
+    # that can use the matching composite index
+    if after:
+        conditions.append(f"(name, id) > ({param(after[0])}::text, {param(after[1])}::int)")
+    if sport is not None:
+        conditions.append(f"sport = {param(sport)}")
+    if position is not None:
+        conditions.append(f"position = {param(position)}")
+    if min_rating is not None:
+        conditions.append(f"rating >= {param(min_rating)}")
+    if max_rating is not None:
+        conditions.append(f"rating <= {param(max_rating)}")
+    if min_price is not None:
+        conditions.append(f"base_price >= {param(min_price)}")
+    if max_price is not None:
+        conditions.append(f"base_price <= {param(max_price)}")
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = await fetch_all(f"SELECT * FROM players {where} ORDER BY name, id LIMIT {param(limit)}", *params)
+    decode = record_decoder(PlayerOut, statements.PLAYERS_ALL.json_fields)
+    return [decode(row) for row in rows]
+
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+async def search_players(query: str, limit: int = 20, offset: int = 0, sport: Optional[str] = None) -> List[PlayerOut]:
+    """Ranked player search: prefix full-text match or fuzzy (trigram) name match"""
+    tokens = _SEARCH_TOKEN.findall(query.lower())
+    if not tokens:
+        return []
+    # Every token may be a partial word while the user is still typing
+    tsquery = " & ".join(f"{token}:*" for token in tokens)
+    phrase = " ".join(tokens)
+
+    rows = await fetch_all(
+        """
+        SELECT p.*
+        FROM players p, to_tsquery('simple', $2) AS q
+        WHERE (player_search_document(p.name, p.position, p.sport, p.metadata) @@ q OR $1 <% p.name)
+          AND ($3::text IS NULL OR p.sport = $3)
+        ORDER BY GREATEST(
+                     ts_rank(player_search_document(p.name, p.position, p.sport, p.metadata), q),
+                     word_similarity($1, p.name)
+                 ) DESC, p.id
+        LIMIT $4 OFFSET $5
+        """,
+        phrase, tsquery, sport, limit, offset
+    )
+    decode = record_decoder(PlayerOut, statements.PLAYERS_ALL.json_fields)
+    return [decode(row) for row in rows]
 
 async def update_player(player_id: int, update: PlayerUpdate) -> Optional[PlayerOut]:
     updates = {k: v for k, v in update.model_dump(exclude_unset=True).items()}
@@ -37,10 +126,14 @@ async def update_player(player_id: int, update: PlayerUpdate) -> Optional[Player
     query = f"UPDATE players SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE id = $1 RETURNING *"
     
     row = await execute_returning(query, player_id, *updates.values())
+    invalidate("player", player_id)
+    invalidate("player_ref", player_id)
     return PlayerOut(**row) if row else None
 
 async def delete_player(player_id: int) -> bool:
     result = await execute("DELETE FROM players WHERE id = $1", player_id)
+    invalidate("player", player_id)
+    invalidate("player_ref", player_id)
     return result == "DELETE 1"
 
 async def bulk_insert_from_csv(csv_content: str) -> int:
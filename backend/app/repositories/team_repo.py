@@ -1,6 +1,9 @@
-from app.db.connection import fetch_one, fetch_all, execute_returning, execute
+from app.db.connection import fetch_one, fetch_all, execute_returning, execute, fetch_one_prepared, fetch_prepared
+from app.db import statements
+from app.db.dataloader import get_loader, invalidate
+from app.db.records import TeamRef
 from app.schemas.team import TeamCreate, TeamOut
-from typing import List, Optional
+from typing import Dict, List, Optional
 from decimal import Decimal
 
 async def create_team(team: TeamCreate, owner_id: int) -> TeamOut:
@@ -14,12 +17,33 @@ async def create_team(team: TeamCreate, owner_id: int) -> TeamOut:
     )
     return TeamOut(**row)
 
+async def get_teams_by_ids(team_ids: List[int]) -> Dict[int, TeamOut]:
+    teams = await fetch_prepared(statements.TEAMS_BY_IDS, list(team_ids), model=TeamOut)
+    return {team.id: team for team in teams}
+
 async def get_team(team_id: int) -> Optional[TeamOut]:
-    row = await fetch_one("SELECT * FROM teams WHERE id = $1", team_id)
-    return TeamOut(**row) if row else None
+    loader = get_loader("team", get_teams_by_ids)
+    if loader:
+        return await loader.load(team_id)
+    return await fetch_one_prepared(statements.TEAM_BY_ID, team_id, model=TeamOut)
+
+async def get_team_refs_by_ids(team_ids: List[int]) -> Dict[int, TeamRef]:
+    teams = await fetch_prepared(statements.TEAM_REFS_BY_IDS, list(team_ids), model=TeamRef)
+    return {team.id: team for team in teams}
 
-async def list_teams_by_tournament(tournament_id: int) -> List[TeamOut]:
-    rows = await fetch_all("SELECT * FROM teams WHERE tournament_id = $1", tournament_id)
+async def get_team_ref(team_id: int) -> Optional[TeamRef]:
+    """Slim team lookup (name and budget columns only) for the bid path"""
+    loader = get_loader("team_ref", get_team_refs_by_ids)
+    if loader:
+        return await loader.load(team_id)
+    return await fetch_one_prepared(statements.TEAM_REF_BY_ID, team_id, model=TeamRef)
+
+async def list_teams_by_tournament(tournament_id: int, after_id: Optional[int] = None, limit: int = 100) -> List[TeamOut]:
+    """Keyset-paginated teams of a tournament ordered by id"""
+    rows = await fetch_all(
+        "SELECT * FROM teams WHERE tournament_id = $1 AND id > $2 ORDER BY id LIMIT $3",
+        tournament_id, after_id or 0, limit
+    )
     return [TeamOut(**row) for row in rows]
 
 async def list_teams_by_owner(owner_id: int) -> List[TeamOut]:
@@ -31,6 +55,8 @@ async def update_team_budget(team_id: int, amount: Decimal) -> bool:
         "UPDATE teams SET remaining_budget = remaining_budget - $1 WHERE id = $2",
         amount, team_id
     )
+    invalidate("team", team_id)
+    invalidate("team_ref", team_id)
     return result == "UPDATE 1"
 
 async def get_team_by_owner(tournament_id: int, owner_id: int) -> Optional[TeamOut]:
@@ -39,3 +65,6 @@ async def get_team_by_owner(tournament_id: int, owner_id: int) -> Optional[TeamO
         tournament_id, owner_id
     )
     return TeamOut(**row) if row else None
+
+async def get_team_ref_by_owner(tournament_id: int, owner_id: int) -> Optional[TeamRef]:
+    return await fetch_one_prepared(statements.TEAM_REF_BY_OWNER, tournament_id, owner_id, model=TeamRef)
@@ -1,6 +1,10 @@
-from app.db.connection import fetch_one, fetch_all, execute_returning
+from app.db.connection import fetch_all, execute_returning, fetch_one_prepared, fetch_prepared, record_decoder
+from app.db import statements
+from app.db.dataloader import get_loader, invalidate
+from app.db.records import TournamentRules
 from app.schemas.tournament import TournamentCreate, TournamentOut, TournamentUpdate
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 async def create_tournament(tournament: TournamentCreate, user_id: int) -> TournamentOut:
     import json
@@ -18,18 +22,19 @@ async def create_tournament(tournament: TournamentCreate, user_id: int) -> Tourn
         data['squad_rules'] = json.loads(data['squad_rules'])
     return TournamentOut(**data)
 
+async def get_tournaments_by_ids(tournament_ids: List[int]) -> Dict[int, TournamentOut]:
+    tournaments = await fetch_prepared(statements.TOURNAMENTS_BY_IDS, list(tournament_ids), model=TournamentOut)
+    return {tournament.id: tournament for tournament in tournaments}
+
 async def get_tournament(tournament_id: int) -> Optional[TournamentOut]:
-    import json
-    row = await fetch_one(
-        "SELECT * FROM tournaments WHERE id = $1",
-        tournament_id
-    )
-    if row:
-        data = dict(row)
-        if data.get('squad_rules') and isinstance(data['squad_rules'], str):
-            data['squad_rules'] = json.loads(data['squad_rules'])
-        return TournamentOut(**data)
-    return None
+    loader = get_loader("tournament", get_tournaments_by_ids)
+    if loader:
+        return await loader.load(tournament_id)
+    return await fetch_one_prepared(statements.TOURNAMENT_BY_ID, tournament_id, model=TournamentOut)
+
+async def get_tournament_rules(tournament_id: int) -> Optional[TournamentRules]:
+    """Squad rules only; the JSONB is decoded on first access"""
+    return await fetch_one_prepared(statements.TOURNAMENT_RULES_BY_ID, tournament_id, model=TournamentRules)
 
 async def list_tournaments() -> List[TournamentOut]:
     import json
@@ -42,6 +47,30 @@ async def list_tournaments() -> List[TournamentOut]:
         result.append(TournamentOut(**data))
     return result
 
+async def list_tournaments_page(
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 100,
+    status: Optional[str] = None
+) -> List[TournamentOut]:
+    """Keyset-paginated tournament listing, newest first"""
+    conditions = []
+    params = []
+    if after:
+        params.extend(after)
+        conditions.append(f"(created_at, id) < (${len(params) - 1}, ${len(params)})")
+    if status is not None:
+        params.append(status)
+        conditions.append(f"status = ${len(params)}")
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit)
+    rows = await fetch_all(
+        f"SELECT * FROM tournaments {where} ORDER BY created_at DESC, id DESC LIMIT ${len(params)}",
+        *params
+    )
+    decode = record_decoder(TournamentOut, statements.TOURNAMENTS_BY_IDS.json_fields)
+    return [decode(row) for row in rows]
+
 async def update_tournament(tournament_id: int, update: TournamentUpdate) -> Optional[TournamentOut]:
     updates = {k: v for k, v in update.model_dump(exclude_unset=True).items()}
     if not updates:
@@ -51,4 +80,5 @@ async def update_tournament(tournament_id: int, update: TournamentUpdate) -> Opt
     query = f"UPDATE tournaments SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE id = $1 RETURNING *"
     
     row = await execute_returning(query, tournament_id, *updates.values())
+    invalidate("tournament", tournament_id)
     return TournamentOut(**row) if row else None
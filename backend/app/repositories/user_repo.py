@@ -1,6 +1,10 @@
-from app.db.connection import fetch_one, fetch_all, execute_returning, execute
+from app.db.connection import fetch_one, fetch_all, execute_returning, execute, fetch_one_prepared, fetch_prepared
+from app.db import statements
+from app.db.dataloader import get_loader, invalidate
+from app.config.settings import settings
 from app.schemas.user import UserCreate, UserOut, UserUpdate
-from typing import Optional
+from app.utils.lru import LRUCache
+from typing import Dict, Optional, List
 
 async def create_user(user: UserCreate, password_hash: str) -> UserOut:
     row = await execute_returning(
@@ -19,23 +23,62 @@ async def get_user_by_email(email: str) -> Optional[dict]:
         email
     )
 
+# Short-TTL cache behind per-request authentication; writes below invalidate it
+_user_cache = LRUCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl_seconds)
+
+def _invalidate_user(user_id: int):
+    invalidate("user", user_id)
+    _user_cache.pop(user_id)
+
+async def _load_users(user_ids: List[int]) -> Dict[int, UserOut]:
+    return {user.id: user for user in await get_users_by_ids(user_ids)}
+
 async def get_user_by_id(user_id: int) -> Optional[UserOut]:
-    row = await fetch_one(
-        "SELECT id, email, full_name, profile_photo, is_approved, created_at, updated_at FROM users WHERE id = $1",
-        user_id
-    )
-    if not row:
-        return None
-    
-    roles = await fetch_all(
-        """
-        SELECT r.name FROM roles r
-        JOIN user_roles ur ON r.id = ur.role_id
-        WHERE ur.user_id = $1
+    loader = get_loader("user", _load_users)
+    if loader:
+        return await loader.load(user_id)
+    return await fetch_one_prepared(statements.USER_BY_ID, user_id, model=UserOut)
+
+async def get_user_cached(user_id: int) -> Optional[UserOut]:
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = await get_user_by_id(user_id)
+        if user:
+            _user_cache.set(user_id, user)
+    return user
+
+async def get_users_by_ids(user_ids: List[int]) -> List[UserOut]:
+    """Load many users with their roles in a single query, preserving input order"""
+    if not user_ids:
+        return []
+    users = await fetch_prepared(statements.USERS_BY_IDS, list(set(user_ids)), model=UserOut)
+    by_id = {user.id: user for user in users}
+    return [by_id[uid] for uid in user_ids if uid in by_id]
+
+async def list_users(
+    after_id: Optional[int] = None,
+    limit: int = 100,
+    is_approved: Optional[bool] = None,
+    role: Optional[str] = None
+) -> List[UserOut]:
+    """Keyset-paginated user listing ordered by id, with roles aggregated in the same query"""
+    rows = await fetch_all(
+        f"""
+        {statements.USER_WITH_ROLES}
+        WHERE u.id > $1
+          AND ($2::boolean IS NULL OR u.is_approved = $2)
+          AND ($3::text IS NULL OR EXISTS (
+              SELECT 1 FROM user_roles fur
+              JOIN roles fr ON fr.id = fur.role_id
+              WHERE fur.user_id = u.id AND fr.name = $3
+          ))
+        GROUP BY u.id
+        ORDER BY u.id
+        LIMIT $4
         """,
-        user_id
+        after_id or 0, is_approved, role, limit
     )
-    return UserOut(**row, roles=[r['name'] for r in roles])
+    return [UserOut(**row) for row in rows]
 
 async def update_user(user_id: int, user_update: UserUpdate) -> UserOut:
     updates = []
@@ -59,6 +102,8 @@ async def update_user(user_id: int, user_update: UserUpdate) -> UserOut:
         f"UPDATE users SET {', '.join(updates)} WHERE id = ${param_count} RETURNING id, email, full_name, profile_photo, is_approved, created_at, updated_at",
         *params
     )
+    # After the write, so a concurrent lookup cannot re-cache the old row
+    _invalidate_user(user_id)
     
     roles = await fetch_all(
         "SELECT r.name FROM roles r JOIN user_roles ur ON r.id = ur.role_id WHERE ur.user_id = $1",
@@ -75,14 +120,21 @@ async def assign_role(user_id: int, role_name: str):
         """,
         user_id, role_name
     )
+    _invalidate_user(user_id)
 
 async def approve_user(user_id: int):
     await execute("UPDATE users SET is_approved = TRUE WHERE id = $1", user_id)
+    _invalidate_user(user_id)
 
 async def update_user_roles(user_id: int, role_names: list[str]):
     await execute("DELETE FROM user_roles WHERE user_id = $1", user_id)
     for role_name in role_names:
         await assign_role(user_id, role_name)
+    _invalidate_user(user_id)
 
 async def update_password(user_id: int, password_hash: str):
     await execute("UPDATE users SET password_hash = $1, updated_at = CURRENT_TIMESTAMP WHERE id = $2", password_hash, user_id)
+
+async def delete_user(user_id: int):
+    await execute("DELETE FROM users WHERE id = $1", user_id)
+    _invalidate_user(user_id)
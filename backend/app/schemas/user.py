@@ -19,7 +19,8 @@ class UserCreate(UserBase):
 
 class UserUpdate(BaseSchema):
     full_name: Optional[str] = Field(None, min_length=1, max_length=255)
-    profile_photo: Optional[str] = None
+    # Photos are uploaded via /auth/upload-photo; only the short media URL is stored
+    profile_photo: Optional[str] = Field(None, max_length=500)
     password: Optional[str] = Field(None, min_length=6)
 
 class UserOut(UserBase, TimestampMixin):
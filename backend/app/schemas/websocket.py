@@ -11,7 +11,7 @@ class WSClientMessage(BaseSchema):
     @field_validator('type')
     @classmethod
     def validate_type(cls, v: str) -> str:
-        allowed = ['PLACE_BID', 'JOIN_AUCTION', 'LEAVE_AUCTION']
+        allowed = ['PLACE_BID', 'JOIN_AUCTION', 'LEAVE_AUCTION', 'CHAT_MESSAGE', 'SUBSCRIBE_ANALYTICS', 'UNSUBSCRIBE_ANALYTICS']
         if v not in allowed:
             raise ValueError(f'Invalid message type: {v}')
         return v
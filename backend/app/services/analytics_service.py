@@ -0,0 +1,72 @@
+"""Analytics dashboard assembly and caching.
+
+The dashboard is rendered to JSON by Postgres in one query (from the rollups
+when the auction has them, otherwise from the live tables) and cached in Redis
+as that exact string, so a cache hit never touches the database or re-encodes.
+"""
+import asyncio
+from typing import Dict, Optional
+
+import asyncpg
+import redis.asyncio as redis
+
+from app.config.settings import settings
+from app.core.redis_client import connect_redis
+from app.repositories import analytics_rollup_repo
+from app.repositories.analytics_repo import AnalyticsRepository
+
+redis_client: Optional[redis.Redis] = None
+
+# Concurrent misses for the same auction share one query
+_inflight: Dict[int, asyncio.Future] = {}
+
+def _dashboard_key(auction_id: int) -> str:
+    return f"analytics:dashboard:{auction_id}"
+
+async def get_redis() -> redis.Redis:
+    global redis_client
+    if not redis_client:
+        redis_client = await connect_redis()
+    return redis_client
+
+async def build_dashboard_json(auction_id: int, pool: asyncpg.Pool) -> str:
+    if await analytics_rollup_repo.has_rollups(auction_id):
+        return await analytics_rollup_repo.get_dashboard_json(auction_id)
+    return await AnalyticsRepository(pool).get_dashboard_json(auction_id)
+
+async def get_dashboard(auction_id: int, pool: asyncpg.Pool) -> bytes:
+    r = await get_redis()
+    cached = await r.get(_dashboard_key(auction_id))
+    if cached is not None:
+        return cached
+
+    future = _inflight.get(auction_id)
+    if future is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The building request was cancelled, not this one: take over the build
+            if not future.cancelled() or asyncio.current_task().cancelling():
+                raise
+            return await get_dashboard(auction_id, pool)
+
+    future = _inflight[auction_id] = asyncio.get_running_loop().create_future()
+    try:
+        body = (await build_dashboard_json(auction_id, pool)).encode()
+        await r.set(_dashboard_key(auction_id), body, px=int(settings.analytics_dashboard_cache_seconds * 1000))
+        future.set_result(body)
+        return body
+    except Exception as e:
+        future.set_exception(e)
+        # Waiters receive the error; mark it retrieved so an unshared failure is not logged twice
+        future.exception()
+        raise
+    finally:
+        # Cancelled mid-build (client disconnect): release the waiters instead of leaving them hanging
+        if not future.done():
+            future.cancel()
+        _inflight.pop(auction_id, None)
+
+async def invalidate_dashboard(auction_id: int):
+    r = await get_redis()
+    await r.delete(_dashboard_key(auction_id))
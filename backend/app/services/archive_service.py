@@ -0,0 +1,84 @@
+"""Archiving of completed auctions.
+
+bids and auction_events are partitioned per auction (see
+migrations/partition_bids_events.sql), so a finished auction's history is a
+pair of partitions that are never written again. Archiving rewrites them
+compactly, onto ``archive_tablespace`` when one is configured, freezes and
+analyzes them, and drops all but the latest state snapshot.
+
+The partitions stay attached: exports, analytics and replay read archived
+auctions through the same tables, while queries for live auctions are pruned
+to their own partitions and never touch archived ones.
+"""
+from app.config.settings import settings
+from app.db.connection import get_pool
+
+PARTITIONED_TABLES = ("bids", "auction_events")
+
+# Rewriting a large auction's partitions can take a while; the pool's
+# statement timeouts are sized for request queries
+REWRITE_TIMEOUT = 3600
+
+class ArchiveError(Exception):
+    pass
+
+class AuctionNotFound(ArchiveError):
+    pass
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+async def _partition_sizes(conn, auction_id: int) -> dict:
+    return {
+        table: await conn.fetchval("SELECT pg_total_relation_size($1::regclass)", f"{table}_a{auction_id}")
+        for table in PARTITIONED_TABLES
+    }
+
+async def archive_auction(auction_id: int) -> dict:
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        auction = await conn.fetchrow("SELECT status FROM auctions WHERE id = $1", auction_id)
+        if not auction:
+            raise AuctionNotFound("Auction not found")
+        if auction['status'] != 'completed':
+            raise ArchiveError("Only completed auctions can be archived")
+
+        await conn.execute("SELECT ensure_auction_partitions($1)", auction_id)
+        # Session setting; the pool resets it when the connection is released
+        await conn.execute("SET statement_timeout = 0")
+        size_before = await _partition_sizes(conn, auction_id)
+
+        for table in PARTITIONED_TABLES:
+            partition = f"{table}_a{auction_id}"
+            if settings.archive_tablespace:
+                tablespace = _quote(settings.archive_tablespace)
+                # Moving a table rewrites it, so this compacts it as well
+                await conn.execute(f"ALTER TABLE {_quote(partition)} SET TABLESPACE {tablespace}", timeout=REWRITE_TIMEOUT)
+                indexes = await conn.fetch(
+                    "SELECT indexrelid::regclass::text AS name FROM pg_index WHERE indrelid = $1::regclass",
+                    partition
+                )
+                for index in indexes:
+                    await conn.execute(f"ALTER INDEX {index['name']} SET TABLESPACE {tablespace}", timeout=REWRITE_TIMEOUT)
+            else:
+                await conn.execute(f"VACUUM FULL {_quote(partition)}", timeout=REWRITE_TIMEOUT)
+            await conn.execute(f"VACUUM (FREEZE, ANALYZE) {_quote(partition)}", timeout=REWRITE_TIMEOUT)
+
+        snapshots = await conn.execute(
+            """
+            DELETE FROM auction_snapshots
+            WHERE auction_id = $1
+              AND seq < (SELECT MAX(seq) FROM auction_snapshots WHERE auction_id = $1)
+            """,
+            auction_id
+        )
+        await conn.execute("UPDATE auctions SET archived_at = CURRENT_TIMESTAMP WHERE id = $1", auction_id)
+        size_after = await _partition_sizes(conn, auction_id)
+
+    return {
+        "auction_id": auction_id,
+        "tablespace": settings.archive_tablespace,
+        "bytes_before": size_before,
+        "bytes_after": size_after,
+        "snapshots_dropped": int(snapshots.split()[-1])
+    }
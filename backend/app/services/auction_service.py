@@ -1,5 +1,7 @@
 from app.repositories import auction_repo, auction_player_repo, player_repo
 from app.schemas.auction import AuctionCreate, AuctionOut, AuctionStateOut
+from app.services.auction_actor import AuctionActor, auction_actors
+from app.services.event_recorder import record_event
 from typing import Optional
 
 async def create_auction(auction: AuctionCreate) -> AuctionOut:
@@ -8,40 +10,71 @@ async def create_auction(auction: AuctionCreate) -> AuctionOut:
 async def get_auction(auction_id: int) -> Optional[AuctionOut]:
     return await auction_repo.get_auction(auction_id)
 
+# Status and lot changes run on the auction's actor, ordered with the bids
+# around them, and are appended to the event log; moving to another lot drops
+# the actor's cached lot state
+
+def _reset_lots(actor: AuctionActor):
+    actor.state.pop("lots", None)
+    actor.state.pop("log", None)
+
 async def start_auction(auction_id: int) -> bool:
+    return await auction_actors.submit(auction_id, _start_auction)
+
+async def _start_auction(actor: AuctionActor) -> bool:
+    auction_id = actor.auction_id
     queue = await auction_player_repo.list_queue(auction_id)
     pending = [p for p in queue if p.status == 'pending']
     
     if not pending:
         return False
     
+    _reset_lots(actor)
     first_player = pending[0]
     await auction_repo.update_status(auction_id, "active")
     await auction_repo.set_current_player(auction_id, first_player.player_id)
+    await record_event(auction_id, "AUCTION_STATUS", {"status": "active"})
+    await record_event(auction_id, "LOT_OPENED", {"player_id": first_player.player_id})
     return True
 
 async def next_player(auction_id: int) -> Optional[int]:
+    return await auction_actors.submit(auction_id, _next_player)
+
+async def _next_player(actor: AuctionActor) -> Optional[int]:
+    auction_id = actor.auction_id
+    _reset_lots(actor)
     queue = await auction_player_repo.list_queue(auction_id)
     pending = [p for p in queue if p.status == 'pending']
     
     if pending:
         next_p = pending[0]
         await auction_repo.set_current_player(auction_id, next_p.player_id)
+        await record_event(auction_id, "LOT_OPENED", {"player_id": next_p.player_id})
         return next_p.player_id
     else:
         await auction_repo.update_status(auction_id, "completed")
         await auction_repo.set_current_player(auction_id, None)
+        await record_event(auction_id, "AUCTION_STATUS", {"status": "completed"})
         return None
 
 async def pause_auction(auction_id: int):
-    await auction_repo.update_status(auction_id, "paused")
+    await auction_actors.submit(auction_id, _set_status, "paused")
 
 async def resume_auction(auction_id: int):
-    await auction_repo.update_status(auction_id, "active")
+    await auction_actors.submit(auction_id, _set_status, "active")
+
+async def _set_status(actor: AuctionActor, status: str):
+    await auction_repo.update_status(actor.auction_id, status)
+    await record_event(actor.auction_id, "AUCTION_STATUS", {"status": status})
 
 async def complete_auction(auction_id: int):
-    await auction_repo.update_status(auction_id, "completed")
-    await auction_repo.set_current_player(auction_id, None)
+    await auction_actors.submit(auction_id, _complete_auction)
+
+async def _complete_auction(actor: AuctionActor):
+    _reset_lots(actor)
+    await auction_repo.update_status(actor.auction_id, "completed")
+    await auction_repo.set_current_player(actor.auction_id, None)
+    await record_event(actor.auction_id, "AUCTION_STATUS", {"status": "completed"})
 
 async def get_auction_state(auction_id: int) -> Optional[AuctionStateOut]:
     auction = await auction_repo.get_auction(auction_id)
@@ -53,8 +86,8 @@ async def get_auction_state(auction_id: int) -> Optional[AuctionStateOut]:
         player = await player_repo.get_player(auction.current_player_id)
         current_player = player.model_dump() if player else None
     
-    from app.repositories import bid_repo
-    highest_bid_data = await bid_repo.get_highest_bid(auction_id, auction.current_player_id) if auction.current_player_id else None
+    from app.services.bid_ledger import bid_ledger
+    highest_bid_data = await bid_ledger.highest(auction_id, auction.current_player_id) if auction.current_player_id else None
     
     return AuctionStateOut(
         auction=auction,
@@ -0,0 +1,193 @@
+"""Auction ownership across backend nodes.
+
+With ``sharding_enabled`` every live auction is owned by exactly one node
+(one uvicorn process with its own ``node_address``). Ownership is a Redis
+lease (``auction:{id}:owner``) that the owner renews; new leases go to the
+auction's position on a consistent-hash ring of live nodes, so placement is
+stable as nodes come and go. If the owner dies its heartbeat and leases
+lapse after ``shard_lease_ttl_seconds`` and the next node on the ring takes
+over on the auction's next request or timer tick.
+
+Non-owners redirect bids and WebSocket joins to the owner, which keeps an
+auction's sockets, timer and bid handling in one process.
+"""
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.config.settings import settings
+from app.core.redis_client import connect_redis
+
+logger = logging.getLogger(__name__)
+
+NODES_KEY = "shards:nodes"
+
+# Only the holder may renew or release a lease
+RENEW_LEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+def _lease_key(auction_id: int) -> str:
+    return f"auction:{auction_id}:owner"
+
+class HashRing:
+    def __init__(self, nodes: Iterable[str], replicas: int):
+        self.points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas))
+        self.keys = [point for point, _ in self.points]
+
+    def node_for(self, auction_id: int) -> Optional[str]:
+        if not self.points:
+            return None
+        index = bisect.bisect(self.keys, _hash(str(auction_id))) % len(self.points)
+        return self.points[index][1]
+
+class AuctionShardRegistry:
+    def __init__(self):
+        self.node_id = settings.node_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.address = settings.node_address
+        self.redis_client = None
+        self.background_task: Optional[asyncio.Task] = None
+        self.owned: set = set()
+        self.live_nodes: Dict[str, dict] = {}
+        self.ring = HashRing((), settings.shard_virtual_nodes)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.sharding_enabled
+
+    @property
+    def lease_ms(self) -> int:
+        return int(settings.shard_lease_ttl_seconds * 1000)
+
+    async def get_redis(self):
+        if not self.redis_client:
+            self.redis_client = await connect_redis()
+        return self.redis_client
+
+    async def heartbeat(self):
+        """Advertise this node and refresh the ring from the nodes still heartbeating"""
+        r = await self.get_redis()
+        now = time.time()
+        await r.hset(NODES_KEY, self.node_id, json.dumps({"address": self.address, "heartbeat": now}))
+
+        live, dead = {}, []
+        for node_id, raw in (await r.hgetall(NODES_KEY)).items():
+            node_id, info = node_id.decode(), json.loads(raw)
+            if now - info["heartbeat"] <= settings.shard_lease_ttl_seconds:
+                live[node_id] = info
+            else:
+                dead.append(node_id)
+        if dead:
+            await r.hdel(NODES_KEY, *dead)
+        if live.keys() != self.live_nodes.keys():
+            logger.info("Shard ring: %s", sorted(live))
+            self.ring = HashRing(live, settings.shard_virtual_nodes)
+        self.live_nodes = live
+
+    async def _renew(self):
+        from app.websocket.manager import manager
+
+        r = await self.get_redis()
+        for auction_id in list(self.owned):
+            idle = (
+                auction_id not in manager.active_connections
+                and not await r.exists(f"auction:{auction_id}:timer_status")
+            )
+            if idle:
+                await self.release(auction_id)
+            elif not await r.eval(RENEW_LEASE, 1, _lease_key(auction_id), self.node_id, self.lease_ms):
+                logger.warning("Lost the lease on auction %s", auction_id)
+                self.owned.discard(auction_id)
+
+    async def owner(self, auction_id: int) -> dict:
+        """The owning node of an auction, claiming it when this node is next in line"""
+        if not self.enabled or auction_id in self.owned:
+            return {"node_id": self.node_id, "address": self.address, "local": True}
+
+        r = await self.get_redis()
+        holder = await r.get(_lease_key(auction_id))
+        if holder is None and self.ring.node_for(auction_id) in (self.node_id, None):
+            if await r.set(_lease_key(auction_id), self.node_id, nx=True, px=self.lease_ms):
+                self.owned.add(auction_id)
+                return {"node_id": self.node_id, "address": self.address, "local": True}
+            holder = await r.get(_lease_key(auction_id))
+
+        node_id = holder.decode() if holder is not None else self.ring.node_for(auction_id)
+        if node_id == self.node_id:
+            self.owned.add(auction_id)
+            return {"node_id": node_id, "address": self.address, "local": True}
+        address = self.live_nodes.get(node_id, {}).get("address")
+        return {"node_id": node_id, "address": address, "local": False}
+
+    async def is_local(self, auction_id: int) -> bool:
+        return (await self.owner(auction_id))["local"]
+
+    async def release(self, auction_id: int):
+        self.owned.discard(auction_id)
+        r = await self.get_redis()
+        await r.eval(RELEASE_LEASE, 1, _lease_key(auction_id), self.node_id)
+
+    async def assignments(self, auction_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Current lease holder per auction, without claiming anything"""
+        if not self.enabled or not auction_ids:
+            return {}
+        r = await self.get_redis()
+        holders = await r.mget([_lease_key(auction_id) for auction_id in auction_ids])
+        return {
+            auction_id: holder.decode() if holder is not None else None
+            for auction_id, holder in zip(auction_ids, holders)
+        }
+
+    def nodes(self) -> List[dict]:
+        return [
+            {"node_id": node_id, "address": info["address"], "self": node_id == self.node_id}
+            for node_id, info in sorted(self.live_nodes.items())
+        ]
+
+    async def run_background(self):
+        while True:
+            try:
+                await self.heartbeat()
+                await self._renew()
+            except Exception as e:
+                logger.error(f"Shard registry error: {e}")
+            await asyncio.sleep(settings.shard_lease_ttl_seconds / 3)
+
+    async def start_background_task(self):
+        if self.enabled and not self.background_task:
+            await self.heartbeat()
+            self.background_task = asyncio.create_task(self.run_background())
+
+    async def stop_background_task(self):
+        if self.background_task:
+            self.background_task.cancel()
+            try:
+                await self.background_task
+            except asyncio.CancelledError:
+                pass
+            # Hand everything back so the next node on the ring takes over immediately
+            for auction_id in list(self.owned):
+                await self.release(auction_id)
+            await self.redis_client.hdel(NODES_KEY, self.node_id)
+        if self.redis_client:
+            await self.redis_client.close()
+
+shard_registry = AuctionShardRegistry()
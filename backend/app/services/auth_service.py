@@ -1,16 +1,79 @@
+import asyncio
+import hashlib
+import time
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from jose import jwt, JWTError
 from datetime import datetime, timedelta, timezone
 from app.config.settings import settings
+from app.core.metrics import Gauge, Histogram
 from app.schemas.auth import TokenData
+from app.utils.lru import LRUCache
 from typing import Optional
 
-def hash_password(password: str) -> str:
+class PasswordHasherBusy(Exception):
+    pass
+
+password_hash_pending = Gauge(
+    "password_hash_pending", "bcrypt operations queued or running in the hashing executor"
+)
+password_hash_seconds = Histogram(
+    "password_hash_seconds", "bcrypt operation latency including executor queueing", ("op",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+def _hash_password_sync(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
-def validate_password(plain_password: str, hashed_password: str) -> bool:
+def _validate_password_sync(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool so it never blocks the event loop.
+
+    ``workers`` caps how many hashes run at once (bcrypt releases the GIL), and
+    ``max_pending`` bounds the backlog so a login storm is shed with 503s instead
+    of queueing unboundedly.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+    async def _run(self, op: str, fn, *args):
+        if self.pending >= self.max_pending:
+            raise PasswordHasherBusy("Too many concurrent authentication requests")
+
+        self.pending += 1
+        password_hash_pending.set(self.pending)
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+            password_hash_pending.set(self.pending)
+            password_hash_seconds.observe(time.perf_counter() - start, op)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash_password_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", _validate_password_sync, plain_password, hashed_password)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_max_pending)
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+async def validate_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
+_verified_tokens = LRUCache(maxsize=settings.token_cache_size)
+
 def create_tokens(user_id: int, email: str, roles: list[str]) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_expiration_minutes)
     payload = {
@@ -22,12 +85,25 @@ def create_tokens(user_id: int, email: str, roles: list[str]) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 def decode_token(token: str) -> Optional[TokenData]:
+    """Verify a JWT, serving repeat tokens from an LRU of already-verified tokens.
+
+    Entries are keyed by the token's SHA-256 and expire with the token's own
+    ``exp`` claim, so a cached token is never accepted past its expiry.
+    """
+    key = hashlib.sha256(token.encode('utf-8')).digest()
+    cached = _verified_tokens.get(key)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
-        return TokenData(
+        token_data = TokenData(
             user_id=payload["user_id"],
             email=payload["email"],
             roles=payload["roles"]
         )
     except JWTError:
         return None
+
+    _verified_tokens.set(key, token_data, expires_at=payload.get("exp"))
+    return token_data
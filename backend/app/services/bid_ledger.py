@@ -0,0 +1,181 @@
+"""Per-lot bid ledger in Redis.
+
+Each lot's bids are kept as a Redis list in placement order, with team
+names, so the highest bid is the last entry (every accepted bid beats the
+previous one). Highest bid, recent bids and history pages are read from the
+list, and undo pops it in O(1).
+
+Postgres stays the source of truth. A ledger only counts as loaded while
+its ``bids_ready`` marker exists. The marker expires with the list after
+``bid_ledger_ttl_seconds`` and is dropped when a write fails. Readers fall
+back to Postgres for a lot that is not loaded. Only the auction's actor
+(the lot's single writer) rebuilds a ledger from Postgres, so a rebuild
+never races a bid.
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.redis_client import connect_redis
+from app.repositories import bid_repo
+from app.schemas.bid import BidWithTeamOut
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# Append only to a loaded ledger whose top is older than the bid (bids on a
+# lot are committed in id order); otherwise the writer rebuilds it instead
+PUSH_BID = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return 0
+end
+local top = redis.call('LINDEX', KEYS[1], -1)
+if top and cjson.decode(top)['id'] >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('RPUSH', KEYS[1], ARGV[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+redis.call('PEXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+# Drop the top bid and return the new top ({1} when the lot has no bids left)
+POP_BID = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return {0}
+end
+redis.call('RPOP', KEYS[1])
+return {1, redis.call('LINDEX', KEYS[1], -1)}
+"""
+
+def _keys(auction_id: int, player_id: int) -> Tuple[str, str]:
+    prefix = f"auction:{auction_id}:lot:{player_id}"
+    return f"{prefix}:bids", f"{prefix}:bids_ready"
+
+def _decode(raw) -> BidWithTeamOut:
+    return BidWithTeamOut.model_validate_json(raw)
+
+def _page(count: int, before: Optional[int], limit: int) -> Tuple[int, int, Optional[int]]:
+    """Positions [start, end) of a newest-first page ending before ``before``, and the next cursor"""
+    end = count if before is None else min(before, count)
+    start = max(end - limit, 0)
+    return start, end, start if start > 0 else None
+
+class BidLedger:
+    def __init__(self):
+        self.redis_client: Optional[redis.Redis] = None
+
+    async def get_redis(self):
+        if not self.redis_client:
+            self.redis_client = await connect_redis()
+        return self.redis_client
+
+    @property
+    def ttl_ms(self) -> int:
+        return settings.bid_ledger_ttl_seconds * 1000
+
+    # Writer side: only called from the auction's actor
+
+    async def rebuild(self, auction_id: int, player_id: int) -> List[BidWithTeamOut]:
+        """Reload a lot's ledger from Postgres"""
+        bids = await bid_repo.get_bids_for_player(auction_id, player_id)
+        bids_key, ready_key = _keys(auction_id, player_id)
+        r = await self.get_redis()
+        async with r.pipeline(transaction=True) as pipe:
+            pipe.delete(bids_key)
+            if bids:
+                pipe.rpush(bids_key, *(bid.model_dump_json() for bid in bids))
+                pipe.pexpire(bids_key, self.ttl_ms)
+            pipe.set(ready_key, 1, px=self.ttl_ms)
+            await pipe.execute()
+        return bids
+
+    async def last(self, auction_id: int, player_id: int) -> Optional[BidWithTeamOut]:
+        """Top of the lot's bid stack, loading the ledger if it is cold"""
+        bids_key, ready_key = _keys(auction_id, player_id)
+        r = await self.get_redis()
+        ready, raw = await r.pipeline(transaction=True).exists(ready_key).lindex(bids_key, -1).execute()
+        if ready:
+            return _decode(raw) if raw is not None else None
+        bids = await self.rebuild(auction_id, player_id)
+        return bids[-1] if bids else None
+
+    async def push(self, bid: BidWithTeamOut):
+        bids_key, ready_key = _keys(bid.auction_id, bid.player_id)
+        try:
+            r = await self.get_redis()
+            if not await r.eval(PUSH_BID, 2, bids_key, ready_key, bid.model_dump_json(), self.ttl_ms, bid.id):
+                await self.rebuild(bid.auction_id, bid.player_id)
+        except redis.RedisError as e:
+            # The bid is committed; make readers use Postgres until the next rebuild
+            logger.warning("Bid ledger push for auction %s lot %s failed: %s", bid.auction_id, bid.player_id, e)
+            await self.invalidate(bid.auction_id, bid.player_id)
+
+    async def pop(self, auction_id: int, player_id: int) -> Optional[BidWithTeamOut]:
+        """Drop the top bid (already deleted from Postgres) and return the new top"""
+        bids_key, ready_key = _keys(auction_id, player_id)
+        r = await self.get_redis()
+        result = await r.eval(POP_BID, 2, bids_key, ready_key)
+        if not result[0]:
+            bids = await self.rebuild(auction_id, player_id)
+            return bids[-1] if bids else None
+        return _decode(result[1]) if len(result) > 1 else None
+
+    async def invalidate(self, auction_id: int, player_id: int):
+        try:
+            r = await self.get_redis()
+            await r.delete(*_keys(auction_id, player_id))
+        except redis.RedisError as e:
+            logger.warning("Bid ledger invalidation for auction %s lot %s failed: %s", auction_id, player_id, e)
+
+    # Reader side: any request, falls back to Postgres for a cold ledger
+
+    async def _read(self, auction_id: int, player_id: int, start: int, end: int) -> Optional[List[BidWithTeamOut]]:
+        """Ledger entries at positions [start, end), or None if the ledger is not loaded"""
+        bids_key, ready_key = _keys(auction_id, player_id)
+        try:
+            r = await self.get_redis()
+            ready, raw = await r.pipeline(transaction=True).exists(ready_key).lrange(bids_key, start, end).execute()
+        except redis.RedisError as e:
+            logger.warning("Bid ledger read for auction %s lot %s failed: %s", auction_id, player_id, e)
+            return None
+        return [_decode(item) for item in raw] if ready else None
+
+    async def highest(self, auction_id: int, player_id: int) -> Optional[BidWithTeamOut]:
+        bids = await self._read(auction_id, player_id, -1, -1)
+        if bids is None:
+            return await bid_repo.get_highest_bid(auction_id, player_id)
+        return bids[0] if bids else None
+
+    async def recent(self, auction_id: int, player_id: int, limit: int = 10) -> List[BidWithTeamOut]:
+        """Latest bids on a lot, newest first"""
+        bids = await self._read(auction_id, player_id, -limit, -1)
+        if bids is None:
+            bids = (await bid_repo.get_bids_for_player(auction_id, player_id))[-limit:]
+        return bids[::-1]
+
+    async def history(
+        self, auction_id: int, player_id: int, before: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[BidWithTeamOut], Optional[int]]:
+        """A newest-first page of a lot's bids and the cursor (a ledger position) for the next page.
+
+        Bids are only ever appended or popped from the top, so positions of
+        older bids stay put while paging.
+        """
+        bids_key, ready_key = _keys(auction_id, player_id)
+        try:
+            r = await self.get_redis()
+            ready, count = await r.pipeline(transaction=True).exists(ready_key).llen(bids_key).execute()
+        except redis.RedisError:
+            ready = False
+
+        if ready:
+            start, end, next_before = _page(count, before, limit)
+            bids = await self._read(auction_id, player_id, start, end - 1) if end > start else []
+            if bids is not None:
+                return bids[::-1], next_before
+
+        bids = await bid_repo.get_bids_for_player(auction_id, player_id)
+        start, end, next_before = _page(len(bids), before, limit)
+        return bids[start:end][::-1], next_before
+
+bid_ledger = BidLedger()
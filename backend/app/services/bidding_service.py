@@ -1,50 +1,121 @@
 from app.repositories import bid_repo, team_repo, auction_repo, player_repo, auction_player_repo, tournament_repo, squad_repo
 from app.repositories.auto_bid_repo import AutoBidRepository
 from app.repositories.notification_repo import NotificationRepository
-from app.schemas.bid import BidCreate, BidOut
+from app.schemas.bid import BidCreate, BidOut, BidWithTeamOut
 from app.schemas.websocket import WSEvent, WSBidUpdated, WSPlayerSold, WSPlayerUnsold
 from app.websocket.manager import manager
 from app.services.timer_service import timer_service
-from app.services.event_recorder import record_event
+from app.services.event_recorder import record_event, rebuild_state, snapshot_if_due
+from app.services.analytics_service import invalidate_dashboard
+from app.services import live_analytics
+from app.services.auction_actor import AuctionActor, auction_actors
+from app.services.bid_ledger import bid_ledger
+from app.db.dataloader import loader_scope
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Union
 from datetime import datetime, timezone
-import redis.asyncio as redis
-from app.config.settings import settings
+from app.core import tracing
+from app.core.metrics import Histogram
+from contextlib import contextmanager
+from dataclasses import dataclass
 import asyncpg
+import time
+
+bid_stage_seconds = Histogram("bid_stage_seconds", "Time spent in each stage of placing a bid", ("stage",))
+bid_latency_seconds = Histogram("bid_latency_seconds", "End-to-end bid placement time", ("outcome",))
+
+@contextmanager
+def _stage(name: str):
+    start = time.perf_counter()
+    try:
+        with tracing.span(f"bid.{name}"):
+            yield
+    finally:
+        bid_stage_seconds.observe(time.perf_counter() - start, name)
 
 class BidError(Exception):
     pass
 
-redis_client: Optional[redis.Redis] = None
+@dataclass(slots=True)
+class LotState:
+    """Highest bid on a lot, held by the auction's actor between bids"""
+    highest_amount: Optional[Decimal] = None
+    highest_team_id: Optional[int] = None
+    # Closed when the timer runs out (reopened if it is restarted or extended)
+    # or when the lot is settled as sold/unsold (final)
+    closed: bool = False
+    settled: bool = False
+
+async def _lot(actor: AuctionActor, auction_id: int, player_id: int) -> LotState:
+    lots = actor.state.setdefault("lots", {})
+    lot = lots.get(player_id)
+    if lot is None:
+        # Recover from the event log (latest snapshot plus tail) once per actor
+        if "log" not in actor.state:
+            actor.state["log"] = await rebuild_state(auction_id, primary=True)
+        logged = actor.state["log"]["lots"].get(str(player_id))
+        if logged is not None:
+            amount = logged["highest_amount"]
+            lot = LotState(
+                Decimal(amount) if amount is not None else None,
+                logged["highest_team_id"],
+                logged["closed"],
+                logged["outcome"] is not None
+            )
+        else:
+            highest_bid = await bid_ledger.last(auction_id, player_id)
+            lot = LotState(
+                highest_bid.amount if highest_bid else None,
+                highest_bid.team_id if highest_bid else None
+            )
+        lots[player_id] = lot
+    return lot
+
+def _forget_lot(actor: AuctionActor, player_id: int, team_id: Optional[int] = None):
+    """Drop cached state the database has shown to be stale"""
+    actor.state.get("lots", {}).pop(player_id, None)
+    actor.state.pop("log", None)
+    if team_id is not None:
+        actor.state.get("spent", {}).pop(team_id, None)
+
+# Column default of auctions.bid_increment
+DEFAULT_BID_INCREMENT = Decimal("10000")
 
-async def get_redis():
-    global redis_client
-    if not redis_client:
-        redis_client = await redis.from_url(settings.redis_url)
-    return redis_client
+def _bid_increment(actor: AuctionActor, auction) -> Decimal:
+    # Loaded once per actor; the increment does not change while an auction runs
+    if "bid_increment" not in actor.state:
+        actor.state["bid_increment"] = auction.bid_increment if auction.bid_increment is not None else DEFAULT_BID_INCREMENT
+    return actor.state["bid_increment"]
 
-async def validate_bid(bid: BidCreate, team_id: int) -> tuple[bool, str]:
-    auction = await auction_repo.get_auction(bid.auction_id)
+async def _team_spent(actor: AuctionActor, team_id: int, auction_id: int) -> Decimal:
+    spent = actor.state.setdefault("spent", {})
+    if team_id not in spent:
+        spent[team_id] = await bid_repo.get_team_total_spent(team_id, auction_id)
+    return spent[team_id]
+
+async def validate_bid(actor: AuctionActor, bid: BidCreate, team_id: int, lot: LotState, total_spent: Decimal) -> tuple[bool, str]:
+    auction = await auction_repo.get_auction_ref(bid.auction_id)
     if not auction or auction.status != "active":
         return False, "Auction is not active"
     
     if auction.current_player_id != bid.player_id:
         return False, "This player is not currently up for auction"
     
-    team = await team_repo.get_team(team_id)
+    if lot.closed:
+        return False, "Bidding on this player has closed"
+    
+    team = await team_repo.get_team_ref(team_id)
     if not team:
         return False, "Team not found"
     
-    highest_bid = await bid_repo.get_highest_bid(bid.auction_id, bid.player_id)
-    player_data = await player_repo.get_player(bid.player_id)
-    
-    min_bid = highest_bid.amount + Decimal("1000") if highest_bid else player_data.base_price
+    if lot.highest_amount is not None:
+        min_bid = lot.highest_amount + _bid_increment(actor, auction)
+    else:
+        min_bid = (await player_repo.get_player_ref(bid.player_id)).base_price
     
     if bid.amount < min_bid:
         return False, f"Bid must be at least {min_bid}"
     
-    total_spent = await bid_repo.get_team_total_spent(team_id, bid.auction_id)
     available = team.budget - total_spent
     
     if bid.amount > available:
@@ -52,57 +123,87 @@ async def validate_bid(bid: BidCreate, team_id: int) -> tuple[bool, str]:
     
     return True, "Valid"
 
-async def update_redis_highest_bid(auction_id: int, player_id: int, team_id: int, amount: Decimal):
-    r = await get_redis()
-    await r.set(f"auction:{auction_id}:highest_bid:{player_id}", str(amount))
-    await r.set(f"auction:{auction_id}:highest_bidder:{player_id}", team_id)
-
-async def store_bid_in_db(bid: BidCreate, team_id: int) -> BidOut:
-    return await bid_repo.create_bid(bid, team_id)
+async def store_bid_in_db(bid: BidCreate, team_id: int, team_name: str) -> BidOut:
+    """Store the bid and its BID_PLACED event (for replay) atomically"""
+    new_bid, seq = await bid_repo.create_bid(bid, team_id, {
+        "team_id": team_id,
+        "team_name": team_name,
+        "player_id": bid.player_id,
+        "amount": float(bid.amount)
+    })
+    await snapshot_if_due(bid.auction_id, seq)
+    return new_bid
 
-async def broadcast_event(auction_id: int, event: WSEvent):
+async def broadcast_event(auction_id: int, event: Union[WSEvent, dict]):
     await manager.broadcast_to_auction(auction_id, event)
 
 async def place_bid(bid: BidCreate, team_id: int, pool: asyncpg.Pool = None) -> BidOut:
-    valid, error_msg = await validate_bid(bid, team_id)
+    """Queue the bid on its auction's actor, so bids are applied strictly in arrival order"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        new_bid = await auction_actors.submit(bid.auction_id, _place_bid_command, bid, team_id, pool)
+        outcome = "accepted"
+        return new_bid
+    except BidError:
+        outcome = "rejected"
+        raise
+    finally:
+        bid_latency_seconds.observe(time.perf_counter() - start, outcome)
+
+async def _place_bid_command(actor: AuctionActor, bid: BidCreate, team_id: int, pool: asyncpg.Pool = None) -> BidOut:
+    # Event scope: team/player lookups repeated across validation, broadcast
+    # and auto-bids are deduped into a single query each
+    with tracing.span("place_bid", auction_id=bid.auction_id, player_id=bid.player_id, team_id=team_id):
+        async with loader_scope():
+            return await _place_bid(actor, bid, team_id, pool)
+
+async def _place_bid(actor: AuctionActor, bid: BidCreate, team_id: int, pool: asyncpg.Pool = None) -> BidOut:
+    with _stage("validate"):
+        lot = await _lot(actor, bid.auction_id, bid.player_id)
+        total_spent = await _team_spent(actor, team_id, bid.auction_id)
+        valid, error_msg = await validate_bid(actor, bid, team_id, lot, total_spent)
     if not valid:
         raise BidError(error_msg)
     
-    new_bid = await store_bid_in_db(bid, team_id)
-    await update_redis_highest_bid(bid.auction_id, bid.player_id, team_id, bid.amount)
-    
-    team = await team_repo.get_team(team_id)
-    event = WSEvent(
-        type="BID_UPDATED",
-        data=WSBidUpdated(
-            bid_id=new_bid.id,
-            team_id=team_id,
-            team_name=team.name,
-            player_id=bid.player_id,
-            amount=bid.amount,
-            timestamp=datetime.now(timezone.utc)
-        ).model_dump()
-    )
-    await broadcast_event(bid.auction_id, event)
-    
-    # Record event for replay
-    await record_event(bid.auction_id, "BID_PLACED", {
-        "team_id": team_id,
-        "team_name": team.name,
-        "player_id": bid.player_id,
-        "amount": float(bid.amount)
-    })
+    team = await team_repo.get_team_ref(team_id)
+    with _stage("persist"):
+        try:
+            new_bid = await store_bid_in_db(bid, team_id, team.name)
+        except ValueError as e:
+            # Another worker's actor got there first; reload before the next bid
+            _forget_lot(actor, bid.player_id, team_id)
+            raise BidError(str(e))
+    lot.highest_amount, lot.highest_team_id = bid.amount, team_id
+    with _stage("redis"):
+        await bid_ledger.push(BidWithTeamOut(**new_bid.model_dump(), team_name=team.name))
+    with _stage("broadcast"):
+        await live_analytics.on_bid(bid.auction_id, bid.player_id, team_id, bid.amount)
+        event = WSEvent(
+            type="BID_UPDATED",
+            data=WSBidUpdated(
+                bid_id=new_bid.id,
+                team_id=team_id,
+                team_name=team.name,
+                player_id=bid.player_id,
+                amount=bid.amount,
+                timestamp=datetime.now(timezone.utc)
+            ).model_dump()
+        )
+        await broadcast_event(bid.auction_id, event)
     
     # Reset timer
-    await timer_service.start_timer(bid.auction_id, 30)
+    with _stage("redis"):
+        await timer_service.start_timer(bid.auction_id, 30)
     
     # Check and trigger auto-bids
     if pool:
-        await process_auto_bids(bid.auction_id, bid.player_id, bid.amount, team_id, pool)
+        with _stage("auto_bid"):
+            await process_auto_bids(actor, bid.auction_id, bid.player_id, bid.amount, team_id, pool)
     
     return new_bid
 
-async def process_auto_bids(auction_id: int, player_id: int, current_bid: Decimal, current_team_id: int, pool: asyncpg.Pool):
+async def process_auto_bids(actor: AuctionActor, auction_id: int, player_id: int, current_bid: Decimal, current_team_id: int, pool: asyncpg.Pool):
     auction_player = await auction_player_repo.get_auction_player(auction_id, player_id)
     if not auction_player:
         return
@@ -123,7 +224,8 @@ async def process_auto_bids(auction_id: int, player_id: int, current_bid: Decima
                         player_id=player_id,
                         amount=next_bid
                     )
-                    await place_bid(bid_create, auto_bid['team_id'], pool)
+                    # Already running on the auction's actor, so apply directly rather than queueing
+                    await _place_bid_command(actor, bid_create, auto_bid['team_id'], pool)
                     
                     # Notify user
                     notif_repo = NotificationRepository(pool)
@@ -145,8 +247,23 @@ async def process_auto_bids(auction_id: int, player_id: int, current_bid: Decima
                 )
 
 async def finalize_player_sale(auction_id: int, player_id: int, pool: asyncpg.Pool = None):
+    await auction_actors.submit(auction_id, _finalize_command, player_id, pool)
+    # Every outcome (sold or unsold) changes the dashboard
+    await invalidate_dashboard(auction_id)
+
+async def _finalize_command(actor: AuctionActor, player_id: int, pool: asyncpg.Pool = None):
+    async with loader_scope():
+        await _finalize_player_sale(actor, actor.auction_id, player_id, pool)
+
+async def _finalize_player_sale(actor: AuctionActor, auction_id: int, player_id: int, pool: asyncpg.Pool = None):
+    lot = await _lot(actor, auction_id, player_id)
+    lot.closed = lot.settled = True
+    # Sell from Postgres rather than the cached lot, which misses bids taken by
+    # another worker's actor for the same auction
     highest_bid = await bid_repo.get_highest_bid(auction_id, player_id)
-    player = await player_repo.get_player(player_id)
+    lot.highest_amount = highest_bid.amount if highest_bid else None
+    lot.highest_team_id = highest_bid.team_id if highest_bid else None
+    player = await player_repo.get_player_ref(player_id)
     
     # Deactivate all auto-bids for this player
     if pool:
@@ -155,61 +272,130 @@ async def finalize_player_sale(auction_id: int, player_id: int, pool: asyncpg.Po
             auto_bid_repo = AutoBidRepository(pool)
             await auto_bid_repo.deactivate_all_for_player(auction_player.id)
     
-    if highest_bid:
+    if lot.highest_team_id is not None:
         # Check reserve price
-        if player.reserve_price and highest_bid.amount < player.reserve_price:
-            await auction_player_repo.mark_unsold(auction_id, player_id)
-            event = WSEvent(
-                type="PLAYER_UNSOLD",
-                data=WSPlayerUnsold(
-                    player_id=player_id,
-                    player_name=f"{player.name} (Reserve not met)"
-                ).model_dump()
-            )
-            await broadcast_event(auction_id, event)
+        if player.reserve_price and lot.highest_amount < player.reserve_price:
+            await _close_unsold(auction_id, player, "Reserve not met")
             return
         
         # Check squad composition
-        auction = await auction_repo.get_auction(auction_id)
-        tournament = await tournament_repo.get_tournament(auction.tournament_id)
+        auction = await auction_repo.get_auction_ref(auction_id)
+        tournament = await tournament_repo.get_tournament_rules(auction.tournament_id)
         if tournament.squad_rules:
             valid, error = await squad_repo.validate_squad_rules(
-                highest_bid.team_id, auction_id, player.position, tournament.squad_rules
+                lot.highest_team_id, auction_id, player.position, tournament.squad_rules
             )
             if not valid:
-                await auction_player_repo.mark_unsold(auction_id, player_id)
-                event = WSEvent(
-                    type="PLAYER_UNSOLD",
-                    data=WSPlayerUnsold(
-                        player_id=player_id,
-                        player_name=f"{player.name} ({error})"
-                    ).model_dump()
-                )
-                await broadcast_event(auction_id, event)
+                await _close_unsold(auction_id, player, error)
                 return
         
-        await auction_player_repo.mark_sold(auction_id, player_id, highest_bid.team_id, highest_bid.amount)
-        await team_repo.update_team_budget(highest_bid.team_id, highest_bid.amount)
+        await auction_player_repo.mark_sold(auction_id, player_id, lot.highest_team_id, lot.highest_amount, player.position)
+        await team_repo.update_team_budget(lot.highest_team_id, lot.highest_amount)
+        spent = actor.state.get("spent", {})
+        if lot.highest_team_id in spent:
+            spent[lot.highest_team_id] += lot.highest_amount
         
-        team = await team_repo.get_team(highest_bid.team_id)
+        team = await team_repo.get_team_ref(lot.highest_team_id)
+        await record_event(auction_id, "PLAYER_SOLD", {
+            "player_id": player_id,
+            "player_name": player.name,
+            "team_id": lot.highest_team_id,
+            "team_name": team.name,
+            "amount": float(lot.highest_amount)
+        })
+        await live_analytics.on_sale(auction_id, player, lot.highest_team_id, team.name, lot.highest_amount)
         event = WSEvent(
             type="PLAYER_SOLD",
             data=WSPlayerSold(
                 player_id=player_id,
                 player_name=player.name,
-                team_id=highest_bid.team_id,
+                team_id=lot.highest_team_id,
                 team_name=team.name,
-                final_amount=highest_bid.amount
+                final_amount=lot.highest_amount
             ).model_dump()
         )
+        await broadcast_event(auction_id, event)
     else:
-        await auction_player_repo.mark_unsold(auction_id, player_id)
-        event = WSEvent(
-            type="PLAYER_UNSOLD",
-            data=WSPlayerUnsold(
-                player_id=player_id,
-                player_name=player.name
-            ).model_dump()
-        )
-    
+        await _close_unsold(auction_id, player)
+
+async def _close_unsold(auction_id: int, player, reason: Optional[str] = None):
+    await auction_player_repo.mark_unsold(auction_id, player.id)
+    await record_event(auction_id, "PLAYER_UNSOLD", {
+        "player_id": player.id,
+        "player_name": player.name,
+        "reason": reason
+    })
+    await live_analytics.on_unsold(auction_id, player)
+    event = WSEvent(
+        type="PLAYER_UNSOLD",
+        data=WSPlayerUnsold(
+            player_id=player.id,
+            player_name=f"{player.name} ({reason})" if reason else player.name
+        ).model_dump()
+    )
     await broadcast_event(auction_id, event)
+
+async def expire_lot(auction_id: int):
+    """Timer ran out: close the current lot so bids queued behind this are rejected"""
+    await auction_actors.submit(auction_id, _expire_lot_command)
+
+async def _expire_lot_command(actor: AuctionActor):
+    auction = await auction_repo.get_auction_ref(actor.auction_id)
+    player_id = auction.current_player_id if auction else None
+    if player_id:
+        lot = await _lot(actor, actor.auction_id, player_id)
+        lot.closed = True
+    await record_event(actor.auction_id, "TIMER_EXPIRED", {"player_id": player_id})
+    await broadcast_event(actor.auction_id, WSEvent(
+        type="TIMER_COMPLETE",
+        data={"auction_id": actor.auction_id}
+    ))
+
+async def reopen_lot(auction_id: int, event_type: str, data: dict):
+    """Reopen bidding on the current lot after its timer is restarted or extended"""
+    await auction_actors.submit(auction_id, _reopen_lot_command, event_type, data)
+
+async def _reopen_lot_command(actor: AuctionActor, event_type: str, data: dict):
+    auction = await auction_repo.get_auction_ref(actor.auction_id)
+    player_id = auction.current_player_id if auction else None
+    if player_id:
+        lot = await _lot(actor, actor.auction_id, player_id)
+        if not lot.settled:
+            lot.closed = False
+    await record_event(actor.auction_id, event_type, {**data, "player_id": player_id})
+
+async def undo_last_bid(auction_id: int, player_id: int) -> Optional[dict]:
+    """Remove the latest bid on a lot; returns the new highest bid, or None when there was nothing to undo"""
+    return await auction_actors.submit(auction_id, _undo_command, player_id)
+
+async def _undo_command(actor: AuctionActor, player_id: int) -> Optional[dict]:
+    auction_id = actor.auction_id
+    # The top of the lot's ledger is the latest bid; popping it exposes the previous one
+    last_bid = await bid_ledger.last(auction_id, player_id)
+    if not last_bid:
+        return None
+    
+    await bid_repo.delete_bid(auction_id, player_id, last_bid.id, last_bid.team_id)
+    new_highest = await bid_ledger.pop(auction_id, player_id)
+    
+    lot = await _lot(actor, auction_id, player_id)
+    lot.highest_amount = new_highest.amount if new_highest else None
+    lot.highest_team_id = new_highest.team_id if new_highest else None
+    new_amount = new_highest.amount if new_highest else None
+    await live_analytics.on_undo(auction_id, player_id, last_bid.team_id, new_amount)
+    
+    undo = {
+        "player_id": player_id,
+        "undone_bid": {
+            "team_id": last_bid.team_id,
+            "amount": float(last_bid.amount)
+        },
+        "new_highest": {
+            "team_id": new_highest.team_id,
+            "team_name": new_highest.team_name,
+            "amount": float(new_highest.amount)
+        } if new_highest else None
+    }
+    await record_event(auction_id, "BID_UNDONE", undo)
+    await broadcast_event(auction_id, {"type": "BID_UNDONE", "data": undo})
+    return {"new_highest": new_highest}
@@ -0,0 +1,158 @@
+"""Content-addressed blob storage for user media.
+
+Blobs are keyed by the SHA-256 of their bytes, so identical uploads share one
+object and a key never changes meaning, which lets the media route serve
+them as immutable. Thumbnail variants are stored under ``<key>_<size>``.
+"""
+import abc
+import asyncio
+import hashlib
+import io
+import os
+import re
+import tempfile
+from typing import Dict, Optional, Tuple
+from app.config.settings import settings
+
+THUMBNAIL_SIZES = (64, 256)
+THUMBNAIL_CONTENT_TYPE = "image/webp"
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}(_\d+)?$")
+
+class BlobNotFound(Exception):
+    pass
+
+def is_valid_key(key: str) -> bool:
+    return bool(_KEY_PATTERN.match(key))
+
+def content_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class BlobStore(abc.ABC):
+    @abc.abstractmethod
+    async def put(self, key: str, data: bytes, content_type: str):
+        ...
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Tuple[bytes, str]:
+        ...
+
+    @abc.abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def _write(self, key: str, data: bytes, content_type: str):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for target, payload in ((path + ".type", content_type.encode()), (path, data)):
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, target)
+
+    def _read(self, key: str) -> Tuple[bytes, str]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            with open(path + ".type", "r") as f:
+                content_type = f.read()
+        except FileNotFoundError:
+            raise BlobNotFound(key)
+        return data, content_type
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        await asyncio.to_thread(self._write, key, data, content_type)
+
+    async def get(self, key: str) -> Tuple[bytes, str]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self._path(key))
+
+class S3BlobStore(BlobStore):
+    """S3-compatible backend (AWS, MinIO, R2). Requires ``boto3``."""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        import boto3
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket, Key=self._object_key(key), Body=data, ContentType=content_type
+        )
+
+    async def get(self, key: str) -> Tuple[bytes, str]:
+        def _get():
+            try:
+                obj = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+            except self.client.exceptions.NoSuchKey:
+                raise BlobNotFound(key)
+            return obj["Body"].read(), obj["ContentType"]
+        return await asyncio.to_thread(_get)
+
+    async def exists(self, key: str) -> bool:
+        def _head():
+            try:
+                self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+                return True
+            except self.client.exceptions.ClientError:
+                return False
+        return await asyncio.to_thread(_head)
+
+_store: Optional[BlobStore] = None
+
+def get_blob_store() -> BlobStore:
+    global _store
+    if _store is None:
+        if settings.blob_store_backend == "s3":
+            _store = S3BlobStore(settings.blob_s3_bucket, settings.blob_s3_prefix, settings.blob_s3_endpoint_url)
+        else:
+            _store = LocalBlobStore(settings.blob_store_path)
+    return _store
+
+def _prepare_image(data: bytes) -> Tuple[str, Dict[int, bytes]]:
+    """Validate the upload is a real image and render its thumbnail variants"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.verify()
+    with Image.open(io.BytesIO(data)) as image:
+        content_type = Image.MIME.get(image.format, "application/octet-stream")
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        thumbnails = {}
+        for size in THUMBNAIL_SIZES:
+            thumb = image.copy()
+            thumb.thumbnail((size, size))
+            out = io.BytesIO()
+            thumb.save(out, format="WEBP", quality=80)
+            thumbnails[size] = out.getvalue()
+    return content_type, thumbnails
+
+async def store_image(data: bytes) -> str:
+    """Store an image and its thumbnails; returns the content key"""
+    content_type, thumbnails = await asyncio.to_thread(_prepare_image, data)
+    key = content_key(data)
+    store = get_blob_store()
+    await store.put(key, data, content_type)
+    for size, thumb in thumbnails.items():
+        await store.put(f"{key}_{size}", thumb, THUMBNAIL_CONTENT_TYPE)
+    return key
+
+def media_url(key: str) -> str:
+    return f"/api/v1/media/{key}"
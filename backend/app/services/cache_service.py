@@ -1,5 +1,5 @@
 import redis.asyncio as redis
-from app.config.settings import settings
+from app.core.redis_client import connect_redis
 import json
 from typing import Optional, Any
 
@@ -9,7 +9,7 @@ class CacheService:
 
     async def get_redis(self):
         if not self.redis_client:
-            self.redis_client = await redis.from_url(settings.redis_url)
+            self.redis_client = await connect_redis()
         return self.redis_client
 
     async def get(self, key: str) -> Optional[Any]:
@@ -1,13 +1,123 @@
-from app.db.connection import execute
-import json
-from datetime import datetime
-
-async def record_event(auction_id: int, event_type: str, event_data: dict):
-    """Record auction event for replay"""
-    await execute(
-        """
-        INSERT INTO auction_events (auction_id, event_type, event_data, timestamp)
-        VALUES ($1, $2, $3, $4)
-        """,
-        auction_id, event_type, json.dumps(event_data), datetime.utcnow()
-    )
+"""Append-only auction event log.
+
+Every state change (bids, undo, sales, unsold lots, lot changes, status and
+timer actions) is appended with the auction's next sequence number. Folding
+the events with ``apply_event`` reproduces the auction state at any point;
+a snapshot of that state is stored every ``event_snapshot_interval`` events,
+so ``rebuild_state`` only replays the tail after the latest snapshot.
+"""
+import logging
+from decimal import Decimal
+from typing import Optional
+
+from app.config.settings import settings
+from app.repositories import event_repo
+
+logger = logging.getLogger(__name__)
+
+REPLAY_BATCH = 1000
+
+TIMER_STATES = {
+    "TIMER_STARTED": "running",
+    "TIMER_RESUMED": "running",
+    "TIMER_PAUSED": "paused",
+    "TIMER_STOPPED": "stopped",
+    "TIMER_RESET": None,
+    "TIMER_EXTENDED": "running",
+}
+
+REOPENING_EVENTS = ("TIMER_STARTED", "TIMER_RESET", "TIMER_EXTENDED")
+
+def initial_state() -> dict:
+    # JSON-shaped so it can be stored as a snapshot as-is: string keys, string amounts
+    return {
+        "seq": 0,
+        "status": None,
+        "current_player_id": None,
+        "timer": None,
+        "lots": {},
+        "team_spent": {},
+    }
+
+def _lot(state: dict, player_id) -> dict:
+    return state["lots"].setdefault(str(player_id), {
+        "highest_amount": None,
+        "highest_team_id": None,
+        "bids": 0,
+        "outcome": None,
+        "closed": False,
+    })
+
+def _amount(value) -> str:
+    return str(Decimal(str(value)))
+
+def apply_event(state: dict, event_type: str, data: dict, seq: int) -> dict:
+    """Fold one event into the state (in place); unknown event types only advance seq"""
+    if event_type == "BID_PLACED":
+        lot = _lot(state, data["player_id"])
+        lot["highest_amount"] = _amount(data["amount"])
+        lot["highest_team_id"] = data["team_id"]
+        lot["bids"] += 1
+    elif event_type == "BID_UNDONE":
+        lot = _lot(state, data["player_id"])
+        new_highest = data.get("new_highest")
+        lot["highest_amount"] = _amount(new_highest["amount"]) if new_highest else None
+        lot["highest_team_id"] = new_highest["team_id"] if new_highest else None
+        lot["bids"] = max(lot["bids"] - 1, 0)
+    elif event_type == "PLAYER_SOLD":
+        lot = _lot(state, data["player_id"])
+        lot["outcome"], lot["closed"] = "sold", True
+        team = str(data["team_id"])
+        state["team_spent"][team] = _amount(Decimal(state["team_spent"].get(team, "0")) + Decimal(_amount(data["amount"])))
+    elif event_type == "PLAYER_UNSOLD":
+        lot = _lot(state, data["player_id"])
+        lot["outcome"], lot["closed"] = "unsold", True
+    elif event_type == "LOT_OPENED":
+        state["current_player_id"] = data["player_id"]
+        state["timer"] = None
+    elif event_type == "AUCTION_STATUS":
+        state["status"] = data["status"]
+        if data["status"] == "completed":
+            state["current_player_id"] = None
+    elif event_type == "TIMER_EXPIRED":
+        state["timer"] = "expired"
+        if data.get("player_id") is not None:
+            _lot(state, data["player_id"])["closed"] = True
+    elif event_type in TIMER_STATES:
+        state["timer"] = TIMER_STATES[event_type]
+        # A restarted timer reopens an expired (but not yet settled) lot
+        if event_type in REOPENING_EVENTS and data.get("player_id") is not None:
+            lot = _lot(state, data["player_id"])
+            lot["closed"] = lot["outcome"] is not None
+    state["seq"] = seq
+    return state
+
+async def rebuild_state(auction_id: int, at_seq: Optional[int] = None, primary: bool = False) -> dict:
+    """Auction state as of ``at_seq`` (default: the latest event), from the nearest snapshot plus the tail"""
+    snapshot = await event_repo.get_latest_snapshot(auction_id, at_seq, primary=primary)
+    state = snapshot["state"] if snapshot else initial_state()
+    while True:
+        events = await event_repo.list_events(auction_id, state["seq"], REPLAY_BATCH, at_seq, primary=primary)
+        for event in events:
+            apply_event(state, event["event_type"], event["event_data"], event["seq"])
+        if len(events) < REPLAY_BATCH:
+            return state
+
+async def take_snapshot(auction_id: int, seq: int):
+    state = await rebuild_state(auction_id, seq, primary=True)
+    await event_repo.save_snapshot(auction_id, state["seq"], state)
+
+async def record_event(auction_id: int, event_type: str, event_data: dict) -> int:
+    """Append an auction event and return its sequence number"""
+    seq = await event_repo.append_event(auction_id, event_type, event_data)
+    await snapshot_if_due(auction_id, seq)
+    return seq
+
+async def snapshot_if_due(auction_id: int, seq: int):
+    """Snapshot every event_snapshot_interval events; call after appending ``seq`` outside record_event"""
+    if seq % settings.event_snapshot_interval == 0:
+        try:
+            await take_snapshot(auction_id, seq)
+        except Exception as e:
+            # A missed snapshot only makes the next rebuild replay a longer tail
+            logger.warning("Snapshot of auction %s at seq %s failed: %s", auction_id, seq, e)
@@ -0,0 +1,229 @@
+"""Live analytics pushed over the auction WebSocket.
+
+The first analytics subscriber of an auction (per worker) seeds in-memory
+counters from one dashboard query; after that, bids and lot outcomes update
+the counters directly (an undone bid reverses its delta) and only the changed rows are pushed as deltas to
+subscribed sockets. Counters are dropped once nobody is subscribed.
+"""
+import asyncio
+import json
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from app.db.connection import get_read_pool, fetch_all_read
+from app.repositories import auction_repo
+from app.schemas.websocket import WSEvent
+from app.services.analytics_service import build_dashboard_json
+from app.websocket.manager import manager
+
+TOP_PLAYERS = 10
+
+def _jsonable(value: Any) -> Any:
+    """Money is kept as Decimal in the counters but sent as JSON numbers, like the REST endpoints"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    return value
+
+class AuctionAnalytics:
+    def __init__(self, dashboard: dict):
+        self.summary: Dict[str, Any] = dashboard["summary"]
+        self.teams: Dict[int, dict] = {}
+        for row in dashboard["team_spending"]:
+            self.teams[row["team_id"]] = dict(row, total_bids=0, players_bid_on=0, players_won=0)
+        for row in dashboard["bidding_activity"]:
+            self.teams.setdefault(row["team_id"], {}).update(row)
+        self.positions: Dict[Optional[str], dict] = {row["position"]: row for row in dashboard["position_spending"]}
+        self.top_players: List[dict] = dashboard["top_players"]
+        self.unsold: List[dict] = dashboard["unsold_players"]
+        # Per-lot state for lots bid on since the counters were seeded
+        self.lot_bidders: Dict[int, Dict[int, int]] = {}
+        self.lot_bids: Dict[int, int] = {}
+        self.lot_highest: Dict[int, Decimal] = {}
+
+    def snapshot(self) -> dict:
+        teams = list(self.teams.values())
+        return _jsonable({
+            "summary": self.summary,
+            "team_spending": sorted(teams, key=lambda t: t["spent"], reverse=True),
+            "bidding_activity": sorted(teams, key=lambda t: t["total_bids"], reverse=True),
+            "top_players": self.top_players,
+            "position_spending": sorted(self.positions.values(), key=lambda p: p["total_spent"], reverse=True),
+            "unsold_players": self.unsold,
+        })
+
+    def apply_bid(self, player_id: int, team_id: int, amount: Decimal) -> dict:
+        self.summary["total_bids"] += 1
+        self.lot_bids[player_id] = self.lot_bids.get(player_id, 0) + 1
+        self.lot_highest[player_id] = max(amount, self.lot_highest.get(player_id, amount))
+
+        team = self.teams.get(team_id)
+        if team is not None:
+            team["total_bids"] += 1
+            bidders = self.lot_bidders.setdefault(player_id, {})
+            if team_id not in bidders:
+                team["players_bid_on"] += 1
+            bidders[team_id] = bidders.get(team_id, 0) + 1
+
+        return {
+            "event": "bid",
+            "summary": {"total_bids": self.summary["total_bids"]},
+            "teams": [team] if team else [],
+        }
+
+    def apply_undo(self, player_id: int, team_id: int, new_highest: Optional[Decimal]) -> dict:
+        self.summary["total_bids"] -= 1
+        if player_id in self.lot_bids:
+            self.lot_bids[player_id] -= 1
+        if new_highest is None:
+            self.lot_highest.pop(player_id, None)
+        else:
+            self.lot_highest[player_id] = new_highest
+
+        team = self.teams.get(team_id)
+        if team is not None:
+            team["total_bids"] -= 1
+            bidders = self.lot_bidders.get(player_id)
+            if bidders and team_id in bidders:
+                bidders[team_id] -= 1
+                if not bidders[team_id]:
+                    del bidders[team_id]
+                    team["players_bid_on"] -= 1
+
+        return {
+            "event": "undo",
+            "summary": {"total_bids": self.summary["total_bids"]},
+            "teams": [team] if team else [],
+        }
+
+    def apply_sale(self, player: Any, team_id: int, team_name: str, amount: Decimal) -> dict:
+        delta: Dict[str, Any] = {"event": "sale", "player_id": player.id}
+
+        summary = self.summary
+        summary["players_sold"] += 1
+        summary["total_spent"] += amount
+        summary["avg_price"] = summary["total_spent"] / summary["players_sold"]
+        summary["highest_price"] = max(summary["highest_price"], amount)
+        if any(row["id"] == player.id for row in self.unsold):
+            self.unsold = [row for row in self.unsold if row["id"] != player.id]
+            summary["players_unsold"] -= 1
+            delta["unsold_players"] = self.unsold
+        delta["summary"] = summary
+
+        team = self.teams.get(team_id)
+        if team is not None:
+            team["spent"] += amount
+            team["remaining_budget"] -= amount
+            team["players_won"] += 1
+            team["players_bought"] = team["players_won"]
+            team["avg_player_price"] = team["spent"] / team["players_won"]
+            delta["teams"] = [team]
+
+        position = self.positions.get(player.position)
+        if position is None:
+            position = self.positions[player.position] = {
+                "position": player.position, "players_count": 0,
+                "total_spent": Decimal(0), "avg_price": Decimal(0), "max_price": Decimal(0),
+            }
+        position["players_count"] += 1
+        position["total_spent"] += amount
+        position["avg_price"] = position["total_spent"] / position["players_count"]
+        position["max_price"] = max(position["max_price"], amount)
+        delta["positions"] = [position]
+
+        if len(self.top_players) < TOP_PLAYERS or amount > self.top_players[-1]["sold_price"]:
+            self.top_players.append({
+                "id": player.id, "name": player.name, "position": player.position, "sport": player.sport,
+                "sold_price": amount, "team_name": team_name, "bid_count": self.lot_bids.get(player.id, 0),
+            })
+            self.top_players.sort(key=lambda row: row["sold_price"], reverse=True)
+            del self.top_players[TOP_PLAYERS:]
+            delta["top_players"] = self.top_players
+        return delta
+
+    def apply_unsold(self, player: Any) -> Optional[dict]:
+        if any(row["id"] == player.id for row in self.unsold):
+            return None
+        self.summary["players_unsold"] += 1
+        self.unsold.append({
+            "id": player.id, "name": player.name, "position": player.position,
+            "base_price": player.base_price, "sport": player.sport,
+            "bid_count": self.lot_bids.get(player.id, 0),
+            "highest_bid": self.lot_highest.get(player.id, Decimal(0)),
+        })
+        self.unsold.sort(key=lambda row: row["base_price"], reverse=True)
+        return {
+            "event": "unsold",
+            "player_id": player.id,
+            "summary": {"players_unsold": self.summary["players_unsold"]},
+            "unsold_players": self.unsold,
+        }
+
+_counters: Dict[int, AuctionAnalytics] = {}
+_locks: Dict[int, asyncio.Lock] = {}
+
+async def _seed(auction_id: int) -> AuctionAnalytics:
+    body = await build_dashboard_json(auction_id, get_read_pool())
+    counters = AuctionAnalytics(json.loads(body, parse_float=Decimal))
+
+    # Bidders on the lot currently under the hammer, so players_bid_on stays exact
+    auction = await auction_repo.get_auction_ref(auction_id)
+    if auction and auction.current_player_id:
+        rows = await fetch_all_read(
+            """
+            SELECT team_id, COUNT(*) as bids, MAX(amount) as highest
+            FROM bids WHERE auction_id = $1 AND player_id = $2
+            GROUP BY team_id
+            """,
+            auction_id, auction.current_player_id
+        )
+        lot = auction.current_player_id
+        counters.lot_bidders[lot] = {row['team_id']: row['bids'] for row in rows}
+        counters.lot_bids[lot] = sum(row['bids'] for row in rows)
+        if rows:
+            counters.lot_highest[lot] = max(row['highest'] for row in rows)
+    return counters
+
+async def subscribe(auction_id: int) -> dict:
+    """Load (or reuse) the auction's counters and return a full snapshot"""
+    lock = _locks.setdefault(auction_id, asyncio.Lock())
+    async with lock:
+        counters = _counters.get(auction_id)
+        if counters is None:
+            counters = _counters[auction_id] = await _seed(auction_id)
+    return counters.snapshot()
+
+def _active(auction_id: int) -> Optional[AuctionAnalytics]:
+    counters = _counters.get(auction_id)
+    if counters is not None and not manager.has_analytics_subscribers(auction_id):
+        del _counters[auction_id]
+        _locks.pop(auction_id, None)
+        return None
+    return counters
+
+async def _push(auction_id: int, delta: Optional[dict]):
+    if delta is not None:
+        await manager.broadcast_to_analytics(auction_id, WSEvent(type="ANALYTICS_DELTA", data=_jsonable(delta)))
+
+async def on_bid(auction_id: int, player_id: int, team_id: int, amount: Decimal):
+    counters = _active(auction_id)
+    if counters is not None:
+        await _push(auction_id, counters.apply_bid(player_id, team_id, amount))
+
+async def on_undo(auction_id: int, player_id: int, team_id: int, new_highest: Optional[Decimal]):
+    counters = _active(auction_id)
+    if counters is not None:
+        await _push(auction_id, counters.apply_undo(player_id, team_id, new_highest))
+
+async def on_sale(auction_id: int, player: Any, team_id: int, team_name: str, amount: Decimal):
+    counters = _active(auction_id)
+    if counters is not None:
+        await _push(auction_id, counters.apply_sale(player, team_id, team_name, amount))
+
+async def on_unsold(auction_id: int, player: Any):
+    counters = _active(auction_id)
+    if counters is not None:
+        await _push(auction_id, counters.apply_unsold(player))
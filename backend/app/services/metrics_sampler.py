@@ -0,0 +1,124 @@
+"""Background sampler for /monitoring/metrics.
+
+System, database and Redis stats are collected every
+``metrics_sample_interval_seconds`` into a fixed-size ring buffer, so the
+endpoint only reads memory. psutil's CPU percentage is measured between
+consecutive samples instead of blocking for an interval.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Optional
+
+import psutil
+
+from app.config.settings import settings
+from app.db.connection import get_pool, get_read_pool
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+def _system_stats() -> dict:
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    return {
+        "cpu_percent": psutil.cpu_percent(interval=None),
+        "memory_percent": memory.percent,
+        "memory_used_gb": memory.used / (1024**3),
+        "disk_percent": disk.percent,
+        "disk_used_gb": disk.used / (1024**3)
+    }
+
+class MetricsSampler:
+    def __init__(self):
+        self.samples: Deque[dict] = deque(maxlen=settings.metrics_history_size)
+        self.background_task: Optional[asyncio.Task] = None
+        # Prime psutil so the first real sample reports usage since startup
+        psutil.cpu_percent(interval=None)
+
+    async def _database_stats(self) -> dict:
+        pool = get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow("""
+                SELECT pg_database_size(current_database()) as db_size,
+                       (SELECT count(*) FROM pg_stat_activity WHERE state = 'active') as active_connections
+            """)
+        return {
+            "size_mb": row['db_size'] / (1024**2),
+            "active_connections": row['active_connections'],
+            "pool": {
+                "size": pool.get_size(),
+                "idle": pool.get_idle_size(),
+                "max_size": pool.get_max_size(),
+                "replica": get_read_pool() is not pool
+            }
+        }
+
+    async def _redis_stats(self) -> dict:
+        # Shares the cache's connection pool rather than holding one of its own
+        r = await cache_service.get_redis()
+        start = time.perf_counter()
+        info = await r.info()
+        return {
+            "ping_ms": (time.perf_counter() - start) * 1000,
+            "used_memory_mb": info.get("used_memory", 0) / (1024**2),
+            "connected_clients": info.get("connected_clients"),
+            "ops_per_sec": info.get("instantaneous_ops_per_sec")
+        }
+
+    async def sample(self) -> dict:
+        """Collect one sample; a failing source is reported without stopping the others"""
+        sample = {"timestamp": time.time()}
+        collectors = {
+            "system": asyncio.to_thread(_system_stats),
+            "database": self._database_stats(),
+            "redis": self._redis_stats(),
+        }
+        results = await asyncio.gather(*collectors.values(), return_exceptions=True)
+        for name, result in zip(collectors, results):
+            if isinstance(result, Exception):
+                logger.warning("Metrics sampler: %s unavailable: %s", name, result)
+                result = {"error": str(result)}
+            sample[name] = result
+        self.samples.append(sample)
+        return sample
+
+    def latest(self) -> Optional[dict]:
+        return self.samples[-1] if self.samples else None
+
+    def history(self) -> list:
+        """Compact per-sample series for trend graphs"""
+        return [
+            {
+                "timestamp": s["timestamp"],
+                "cpu_percent": s["system"].get("cpu_percent"),
+                "memory_percent": s["system"].get("memory_percent"),
+                "db_active_connections": s["database"].get("active_connections"),
+                "db_pool_idle": s["database"].get("pool", {}).get("idle"),
+                "redis_ops_per_sec": s["redis"].get("ops_per_sec"),
+            }
+            for s in self.samples
+        ]
+
+    async def run_background(self):
+        while True:
+            try:
+                await self.sample()
+            except Exception as e:
+                logger.error(f"Metrics sampler error: {e}")
+            await asyncio.sleep(settings.metrics_sample_interval_seconds)
+
+    def start_background_task(self):
+        if not self.background_task:
+            self.background_task = asyncio.create_task(self.run_background())
+
+    async def stop_background_task(self):
+        if self.background_task:
+            self.background_task.cancel()
+            try:
+                await self.background_task
+            except asyncio.CancelledError:
+                pass
+
+metrics_sampler = MetricsSampler()
@@ -1,7 +1,7 @@
 from app.repositories import auction_repo, player_repo, snapshot_repo
 from app.schemas.snapshot import AuctionSnapshot, TeamBudgetSnapshot, QueuePlayerSnapshot
-from app.schemas.bid import BidWithTeamOut
 from app.services.timer_service import timer_service
+from app.services.bid_ledger import bid_ledger
 from typing import Optional
 
 async def get_auction_snapshot(auction_id: int) -> Optional[AuctionSnapshot]:
@@ -17,8 +17,7 @@ async def get_auction_snapshot(auction_id: int) -> Optional[AuctionSnapshot]:
     # Get recent bids for current player
     recent_bids = []
     if auction.current_player_id:
-        bid_rows = await snapshot_repo.get_recent_bids(auction_id, auction.current_player_id, 10)
-        recent_bids = [BidWithTeamOut(**row) for row in bid_rows]
+        recent_bids = await bid_ledger.recent(auction_id, auction.current_player_id, 10)
     
     # Get team budgets
     budget_rows = await snapshot_repo.get_team_budgets(auction.tournament_id)
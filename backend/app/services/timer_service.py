@@ -1,17 +1,29 @@
 import asyncio
+import time
 import redis.asyncio as redis
-from app.config.settings import settings
+from app.core.metrics import Histogram
+from app.core.redis_client import connect_redis
+from app.services.auction_shards import shard_registry
 from app.schemas.timer import TimerState, TimerOut
 from app.schemas.websocket import WSTimerUpdate
-from typing import Optional
+from typing import Optional, Set
+
+TICK_INTERVAL = 1.0
+
+timer_tick_lag_seconds = Histogram(
+    "timer_tick_lag_seconds", "How late each timer tick woke up relative to its schedule",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
 
 class TimerService:
     def __init__(self):
         self.redis_client: redis.Redis = None
         self.background_task: Optional[asyncio.Task] = None
+        # In-flight lot expiries; held here so they are not garbage collected
+        self.expiries: Set[asyncio.Task] = set()
     
     async def connect(self):
-        self.redis_client = await redis.from_url(settings.redis_url)
+        self.redis_client = await connect_redis()
     
     async def start_timer(self, auction_id: int, seconds: int):
         await self.redis_client.set(f"auction:{auction_id}:timer_status", "running")
@@ -57,13 +69,18 @@ class TimerService:
         
         while True:
             try:
-                await asyncio.sleep(1)
+                scheduled = time.perf_counter() + TICK_INTERVAL
+                await asyncio.sleep(TICK_INTERVAL)
+                timer_tick_lag_seconds.observe(max(time.perf_counter() - scheduled, 0.0))
                 
                 # Get all active auction timers
                 keys = await self.redis_client.keys("auction:*:timer_status")
                 
                 for key in keys:
                     auction_id = int(key.decode().split(":")[1])
+                    # With sharding, only the auction's owner ticks its timer
+                    if not await shard_registry.is_local(auction_id):
+                        continue
                     status = await self.redis_client.get(f"auction:{auction_id}:timer_status")
                     
                     if status == b"running":
@@ -86,16 +103,21 @@ class TimerService:
                                 )
                                 await manager.broadcast_to_auction(auction_id, ws_event)
                             else:
-                                # Timer finished
+                                # Timer finished; the auction's actor closes the lot and announces it.
+                                # Not awaited: a busy actor must not hold up other auctions' ticks
                                 await self.finish_if_zero(auction_id)
-                                from app.schemas.websocket import WSEvent
-                                await manager.broadcast_to_auction(auction_id, WSEvent(
-                                    type="TIMER_COMPLETE",
-                                    data={"auction_id": auction_id}
-                                ))
+                                from app.services.bidding_service import expire_lot
+                                task = asyncio.create_task(expire_lot(auction_id))
+                                self.expiries.add(task)
+                                task.add_done_callback(self._expiry_done)
             except Exception as e:
                 print(f"Timer tick error: {e}")
     
+    def _expiry_done(self, task: asyncio.Task):
+        self.expiries.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"Timer expiry error: {task.exception()}")
+    
     def start_background_task(self):
         if not self.background_task:
             self.background_task = asyncio.create_task(self.tick_background())
@@ -0,0 +1,17 @@
+import base64
+import json
+from typing import Any, List
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str, arity: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError("Malformed cursor")
+    if not isinstance(values, list) or len(values) != arity:
+        raise ValueError("Malformed cursor")
+    return values
@@ -1,16 +1,20 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, HTTPException
 from app.websocket.manager import manager
 from app.services.auth_service import decode_token
-from app.services import bidding_service
+from app.services import bidding_service, live_analytics
 from app.repositories import team_repo, auction_repo, player_repo
 from app.repositories.chat_repo import ChatRepository
 from app.schemas.websocket import WSClientMessage, WSEvent, WSPlaceBid, WSPlayerOnBlock, WSError
 from app.schemas.bid import BidCreate
 from app.core.database import get_db_pool
+from app.core import tracing
+from app.services.auction_shards import shard_registry
 import json
 
 router = APIRouter()
 
+SHARD_REDIRECT_CLOSE_CODE = 4307
+
 @router.websocket("/ws/auction/{auction_id}")
 async def websocket_auction(websocket: WebSocket, auction_id: int, token: str = Query(...)):
     token_data = decode_token(token)
@@ -19,22 +23,35 @@ async def websocket_auction(websocket: WebSocket, auction_id: int, token: str =
         return
     
     # Get user's team for this auction
-    auction = await auction_repo.get_auction(auction_id)
+    auction = await auction_repo.get_auction_ref(auction_id)
     if not auction:
         await websocket.close(code=1008)
         return
     
-    team = await team_repo.get_team_by_owner(auction.tournament_id, token_data.user_id)
+    owner = await shard_registry.owner(auction_id)
+    if not owner["local"]:
+        # Clients reconnect to the owning node's address from the SHARD_REDIRECT event
+        await websocket.accept()
+        await manager.send_personal_message(websocket, WSEvent(
+            type="SHARD_REDIRECT",
+            data={"auction_id": auction_id, "node_id": owner["node_id"], "address": owner["address"]}
+        ))
+        await websocket.close(code=SHARD_REDIRECT_CLOSE_CODE)
+        return
+    
+    team = await team_repo.get_team_ref_by_owner(auction.tournament_id, token_data.user_id)
     team_id = team.id if team else None
     
     pool = await get_db_pool()
     chat_repo = ChatRepository(pool)
+    # Bids over this socket are always traced if the handshake asked for it
+    force_trace = websocket.headers.get(tracing.TRACE_HEADER, "").strip() in ("1", "true")
     
     await manager.connect(websocket, auction_id, token_data.user_id, team_id)
     
     # Send current auction state
     if auction.current_player_id:
-        player = await player_repo.get_player(auction.current_player_id)
+        player = await player_repo.get_player_ref(auction.current_player_id)
         if player:
             event = WSEvent(
                 type="PLAYER_ON_BLOCK",
@@ -74,6 +91,14 @@ async def websocket_auction(websocket: WebSocket, auction_id: int, token: str =
                         )
                         await manager.broadcast_to_auction(auction_id, chat_event)
                 
+                elif client_msg.type == "SUBSCRIBE_ANALYTICS":
+                    manager.set_analytics_subscription(websocket, auction_id, True)
+                    snapshot = await live_analytics.subscribe(auction_id)
+                    await manager.send_personal_message(websocket, WSEvent(type="ANALYTICS_SNAPSHOT", data=snapshot))
+                
+                elif client_msg.type == "UNSUBSCRIBE_ANALYTICS":
+                    manager.set_analytics_subscription(websocket, auction_id, False)
+                
                 elif client_msg.type == "PLACE_BID":
                     if not team_id:
                         error_event = WSEvent(
@@ -91,7 +116,8 @@ async def websocket_auction(websocket: WebSocket, auction_id: int, token: str =
                     )
                     
                     try:
-                        await bidding_service.place_bid(bid_create, team_id)
+                        with tracing.trace("WS PLACE_BID", forced=force_trace, auction_id=auction_id):
+                            await bidding_service.place_bid(bid_create, team_id)
                     except bidding_service.BidError as e:
                         error_event = WSEvent(
                             type="ERROR",
@@ -1,12 +1,28 @@
 from fastapi import WebSocket
-from typing import Dict, List, Optional
+from fastapi.encoders import jsonable_encoder
+from typing import Dict, List, Optional, Union
 from app.schemas.websocket import WSEvent
+from app.core import tracing
+from app.core.metrics import Gauge, Histogram
+import time
+
+ws_connections = Gauge("ws_connections", "Open auction WebSocket connections")
+ws_broadcast_seconds = Histogram("ws_broadcast_seconds", "Time to fan one event out to every recipient", ("type",))
+# Sends are awaited one after another, so the recipient count is the depth of the fan-out queue
+ws_broadcast_recipients = Histogram(
+    "ws_broadcast_recipients", "Recipients per broadcast",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+)
+
+def _event_type(event) -> str:
+    return event.type if isinstance(event, WSEvent) else str(event.get("type", "unknown"))
 
 class ConnectionInfo:
     def __init__(self, websocket: WebSocket, user_id: int, team_id: Optional[int]):
         self.websocket = websocket
         self.user_id = user_id
         self.team_id = team_id
+        self.analytics = False
 
 class ConnectionManager:
     def __init__(self):
@@ -19,32 +35,68 @@ class ConnectionManager:
         
         conn_info = ConnectionInfo(websocket, user_id, team_id)
         self.active_connections[auction_id].append(conn_info)
+        ws_connections.inc()
     
     def disconnect(self, websocket: WebSocket, auction_id: int):
         if auction_id in self.active_connections:
+            before = len(self.active_connections[auction_id])
             self.active_connections[auction_id] = [
                 conn for conn in self.active_connections[auction_id]
                 if conn.websocket != websocket
             ]
+            ws_connections.dec(before - len(self.active_connections[auction_id]))
             if not self.active_connections[auction_id]:
                 del self.active_connections[auction_id]
     
-    async def broadcast_to_auction(self, auction_id: int, event: WSEvent):
+    async def broadcast_to_auction(self, auction_id: int, event: Union[WSEvent, dict]):
         if auction_id in self.active_connections:
             disconnected = []
-            message = event.model_dump()
+            # jsonable_encoder, not model_dump(): Decimal amounts are not JSON serializable
+            message = jsonable_encoder(event)
+            recipients = self.active_connections[auction_id]
+            start = time.perf_counter()
             
-            for conn_info in self.active_connections[auction_id]:
+            with tracing.span("ws.broadcast", type=_event_type(event), recipients=len(recipients)):
+                for conn_info in recipients:
+                    try:
+                        await conn_info.websocket.send_json(message)
+                    except:
+                        disconnected.append(conn_info.websocket)
+            
+            ws_broadcast_seconds.observe(time.perf_counter() - start, _event_type(event))
+            ws_broadcast_recipients.observe(len(recipients))
+            for ws in disconnected:
+                self.disconnect(ws, auction_id)
+    
+    async def broadcast_to_analytics(self, auction_id: int, event: WSEvent):
+        """Send to the auction's connections that opted in with SUBSCRIBE_ANALYTICS"""
+        disconnected = []
+        message = jsonable_encoder(event)
+        recipients = [conn for conn in self.active_connections.get(auction_id, []) if conn.analytics]
+        start = time.perf_counter()
+        with tracing.span("ws.broadcast", type=event.type, recipients=len(recipients), analytics=True):
+            for conn_info in recipients:
                 try:
                     await conn_info.websocket.send_json(message)
                 except:
                     disconnected.append(conn_info.websocket)
-            
-            for ws in disconnected:
-                self.disconnect(ws, auction_id)
+        
+        ws_broadcast_seconds.observe(time.perf_counter() - start, event.type)
+        ws_broadcast_recipients.observe(len(recipients))
+        for ws in disconnected:
+            self.disconnect(ws, auction_id)
+    
+    def set_analytics_subscription(self, websocket: WebSocket, auction_id: int, enabled: bool):
+        for conn_info in self.active_connections.get(auction_id, []):
+            if conn_info.websocket == websocket:
+                conn_info.analytics = enabled
+    
+    def has_analytics_subscribers(self, auction_id: int) -> bool:
+        return any(conn.analytics for conn in self.active_connections.get(auction_id, []))
     
     async def send_personal_message(self, websocket: WebSocket, event: WSEvent):
-        await websocket.send_json(event.model_dump())
+        with tracing.span("ws.send", type=event.type):
+            await websocket.send_json(jsonable_encoder(event))
     
     def get_user_team(self, websocket: WebSocket, auction_id: int) -> Optional[int]:
         if auction_id in self.active_connections:
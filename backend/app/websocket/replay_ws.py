@@ -0,0 +1,104 @@
+"""Server-paced auction replay over WebSocket.
+
+Events are sent in (timestamp, id) order with the original gaps between
+them divided by the replay speed. Quiet stretches are capped at
+MAX_GAP_SECONDS so a lunch break does not stall the replay. Clients can send
+PAUSE, RESUME and SET_SPEED ({"speed": 1|4|16}) while it runs.
+"""
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from app.websocket.manager import manager
+from app.services.auth_service import decode_token
+from app.repositories import event_repo
+from app.schemas.websocket import WSEvent, WSError
+from datetime import datetime
+from typing import List, Optional
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+REPLAY_SPEEDS = (1, 4, 16)
+MAX_GAP_SECONDS = 5.0
+PAGE_SIZE = 500
+
+class ReplayControl:
+    def __init__(self, speed: int):
+        self.speed = speed
+        self.running = asyncio.Event()
+        self.running.set()
+
+async def _pace(websocket: WebSocket, auction_id: int, control: ReplayControl, filters: dict):
+    try:
+        sent = await _send_events(websocket, auction_id, control, filters)
+    except Exception as e:
+        logger.error(f"Replay of auction {auction_id} failed: {e}")
+        await websocket.close(code=1011)
+        return
+
+    await manager.send_personal_message(websocket, WSEvent(
+        type="REPLAY_COMPLETE",
+        data={"auction_id": auction_id, "events": sent}
+    ))
+    await websocket.close()
+
+async def _send_events(websocket: WebSocket, auction_id: int, control: ReplayControl, filters: dict) -> int:
+    after, previous, sent = None, None, 0
+    while True:
+        events = await event_repo.page_events(auction_id, after, PAGE_SIZE, **filters)
+        for event in events:
+            if previous is not None:
+                gap = min((event['timestamp'] - previous).total_seconds(), MAX_GAP_SECONDS)
+                await asyncio.sleep(max(gap, 0) / control.speed)
+            await control.running.wait()
+            previous = event['timestamp']
+            await manager.send_personal_message(websocket, WSEvent(type="REPLAY_EVENT", data=event))
+            sent += 1
+        if len(events) < PAGE_SIZE:
+            break
+        after = (events[-1]['timestamp'], events[-1]['id'])
+    return sent
+
+@router.websocket("/ws/replay/{auction_id}")
+async def websocket_replay(
+    websocket: WebSocket,
+    auction_id: int,
+    token: str = Query(...),
+    speed: int = Query(1),
+    from_ts: Optional[datetime] = None,
+    to_ts: Optional[datetime] = None,
+    event_types: Optional[List[str]] = Query(None)
+):
+    if not decode_token(token) or speed not in REPLAY_SPEEDS:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    control = ReplayControl(speed)
+    filters = {"from_ts": from_ts, "to_ts": to_ts, "event_types": event_types}
+    pacer = asyncio.create_task(_pace(websocket, auction_id, control, filters))
+
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                message = None
+            message_type = message.get("type") if isinstance(message, dict) else None
+            if message_type == "PAUSE":
+                control.running.clear()
+            elif message_type == "RESUME":
+                control.running.set()
+            elif message_type == "SET_SPEED" and (message.get("data") or {}).get("speed") in REPLAY_SPEEDS:
+                control.speed = message["data"]["speed"]
+            else:
+                await manager.send_personal_message(websocket, WSEvent(
+                    type="ERROR",
+                    data=WSError(message=f"Invalid replay message: {message_type}").model_dump()
+                ))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pacer.cancel()
@@ -0,0 +1,151 @@
+"""Analytics regression benchmark against a seeded large auction.
+
+Seeds one auction (default 1M bids over 500 lots and 10 teams) inside a
+transaction, times every live ``AnalyticsRepository`` query and rolls the
+seed back, so it is safe to point at a development database. Needs
+DATABASE_URL (or --dsn) with the schema from migrations/ applied.
+
+    python -m benchmarks.bench_analytics --bids 1000000 --max-ms 500
+
+Exits non-zero if any query's median exceeds --max-ms.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+
+import asyncpg
+
+from app.config.settings import settings
+from app.repositories.analytics_repo import AnalyticsRepository
+
+class _SingleConnectionPool:
+    """Lets the repository run on the seeding connection, inside its transaction"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+async def seed(conn, bids: int, lots: int, teams: int) -> dict:
+    user_id = await conn.fetchval(
+        "INSERT INTO users (email, password_hash, full_name) VALUES ('bench-analytics@example.invalid', 'x', 'Bench') RETURNING id"
+    )
+    tournament_id = await conn.fetchval(
+        "INSERT INTO tournaments (name, start_date, created_by) VALUES ('bench', CURRENT_TIMESTAMP, $1) RETURNING id",
+        user_id
+    )
+    team_ids = await conn.fetch(
+        """
+        INSERT INTO teams (tournament_id, name, owner_id, budget, remaining_budget)
+        SELECT $1, 'bench team ' || i, $2, 100000000, 100000000 FROM generate_series(1, $3) i
+        RETURNING id
+        """,
+        tournament_id, user_id, teams
+    )
+    player_ids = await conn.fetch(
+        """
+        INSERT INTO players (name, sport, position, base_price, rating)
+        SELECT 'bench player ' || i, 'cricket', (ARRAY['batsman', 'bowler', 'all-rounder', 'keeper'])[1 + i % 4], 10000, 5
+        FROM generate_series(1, $1) i
+        RETURNING id
+        """,
+        lots
+    )
+    auction_id = await conn.fetchval(
+        "INSERT INTO auctions (tournament_id, name, status) VALUES ($1, 'bench', 'completed') RETURNING id",
+        tournament_id
+    )
+    team_ids = [r['id'] for r in team_ids]
+    player_ids = [r['id'] for r in player_ids]
+
+    # Four in five lots sold to a rotating team, the rest unsold
+    await conn.execute(
+        """
+        INSERT INTO auction_players (auction_id, player_id, order_index, status, sold_to_team_id, final_price)
+        SELECT $1, p.id, p.ord,
+               CASE WHEN p.ord % 5 = 0 THEN 'unsold' ELSE 'completed' END,
+               CASE WHEN p.ord % 5 = 0 THEN NULL ELSE ($2::int[])[1 + p.ord % array_length($2::int[], 1)] END,
+               CASE WHEN p.ord % 5 = 0 THEN NULL ELSE 10000 + p.ord * 100 END
+        FROM unnest($3::int[]) WITH ORDINALITY AS p(id, ord)
+        """,
+        auction_id, team_ids, player_ids
+    )
+    await conn.execute(
+        """
+        INSERT INTO bids (auction_id, player_id, team_id, amount)
+        SELECT $1,
+               ($2::int[])[1 + i % array_length($2::int[], 1)],
+               ($3::int[])[1 + (i / 7) % array_length($3::int[], 1)],
+               10000 + i
+        FROM generate_series(1, $4) i
+        """,
+        auction_id, player_ids, team_ids, bids
+    )
+    await conn.execute("ANALYZE bids")
+    await conn.execute("ANALYZE auction_players")
+    return {"auction_id": auction_id, "team_id": team_ids[0]}
+
+async def time_query(fn, repeat: int) -> dict:
+    await fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 2), "max_ms": round(max(samples), 2)}
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=settings.database_url)
+    parser.add_argument("--bids", type=int, default=1_000_000)
+    parser.add_argument("--lots", type=int, default=500)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=500.0, help="fail if any query median exceeds this")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(args.dsn)
+    tx = conn.transaction()
+    await tx.start()
+    try:
+        start = time.perf_counter()
+        ids = await seed(conn, args.bids, args.lots, args.teams)
+        seed_seconds = time.perf_counter() - start
+
+        repo = AnalyticsRepository(_SingleConnectionPool(conn))
+        auction_id = ids["auction_id"]
+        queries = {
+            "auction_summary": lambda: repo.get_auction_summary(auction_id),
+            "team_spending": lambda: repo.get_team_spending(auction_id),
+            "most_expensive_players": lambda: repo.get_most_expensive_players(auction_id),
+            "position_wise_spending": lambda: repo.get_position_wise_spending(auction_id),
+            "bidding_activity": lambda: repo.get_bidding_activity(auction_id),
+            "squad_composition": lambda: repo.get_squad_composition(ids["team_id"], auction_id),
+            "unsold_players": lambda: repo.get_unsold_players(auction_id),
+        }
+        timings = {name: await time_query(fn, args.repeat) for name, fn in queries.items()}
+    finally:
+        await tx.rollback()
+        await conn.close()
+
+    failures = [name for name, t in timings.items() if t["median_ms"] > args.max_ms]
+    print(json.dumps({
+        "bids": args.bids,
+        "lots": args.lots,
+        "teams": args.teams,
+        "seed_seconds": round(seed_seconds, 1),
+        "max_ms": args.max_ms,
+        "queries": timings,
+        "failed": failures,
+    }, indent=2))
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""Micro-benchmark: rows/sec for the row -> object decode paths.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_decode --rows 50000
+"""
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from app.db.connection import record_decoder
+from app.schemas.player import PlayerOut
+
+@dataclass(slots=True)
+class PlayerRow:
+    id: int
+    name: str
+    sport: str
+    position: Optional[str]
+    base_price: Decimal
+    reserve_price: Optional[Decimal]
+    rating: Optional[Decimal]
+    image_url: Optional[str]
+    metadata: Optional[dict]
+    created_at: datetime
+    updated_at: datetime
+
+def make_rows(count: int) -> list[dict]:
+    now = datetime.now()
+    return [
+        {
+            "id": i,
+            "name": f"Player {i}",
+            "sport": "Cricket",
+            "position": "Batsman",
+            "base_price": Decimal("200000.00"),
+            "reserve_price": Decimal("250000.00"),
+            "rating": Decimal("8.5"),
+            "image_url": None,
+            "metadata": json.dumps({"team": "IND", "age": 30}),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+def validated(row):
+    data = dict(row)
+    data["metadata"] = json.loads(data["metadata"])
+    return PlayerOut(**data)
+
+def bench(label: str, decode, rows: list, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for row in rows:
+            decode(row)
+        best = min(best, time.perf_counter() - start)
+    return {"decoder": label, "rows_per_sec": round(len(rows) / best)}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = [
+        bench("dict + pydantic validate", validated, rows, args.repeat),
+        bench("model_construct", record_decoder(PlayerOut, ("metadata",)), rows, args.repeat),
+        bench("slotted dataclass", record_decoder(PlayerRow, ("metadata",)), rows, args.repeat),
+    ]
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""End-to-end load test: bidding and WebSocket fan-out against a running server.
+
+Seeds N active auctions, each with M team owners and K spectators, opens a
+``/ws/auction/{id}`` socket for every participant, then has every owner place
+bids through ``POST /api/v1/bids`` for --duration seconds. Reports bids/sec,
+bid-to-broadcast latency measured at every receiving socket, TIMER_TICK drift
+and (with --server-pid) server memory per connection. The seed is deleted
+afterwards unless --keep is given.
+
+Needs the server running against the same DATABASE_URL / REDIS_URL /
+JWT_SECRET as this process (tokens are minted locally), e.g.
+
+    uvicorn app.main:app --port 8000 &
+    python -m benchmarks.bench_load --auctions 5 --bidders 8 --spectators 200 \\
+        --duration 30 --server-pid $! --output load.json
+
+The API rate limiter allows 100 requests/minute per client IP, so sustained
+HTTP bidding from one machine is throttled; --transport ws places the same
+bids as PLACE_BID messages instead. Exits non-zero if the bid-to-broadcast
+p99 exceeds --max-p99-ms.
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import asyncpg
+import psutil
+import redis.asyncio as redis
+import websockets
+
+from app.config.settings import settings
+from app.services.auth_service import create_tokens
+
+BASE_PRICE = 10000
+BID_STEP = 1000
+
+def percentiles(samples: List[float]) -> Optional[dict]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+    return {"p50": at(0.50), "p95": at(0.95), "p99": at(0.99), "max": round(ordered[-1], 2), "count": len(ordered)}
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class HttpClient:
+    """Minimal keep-alive HTTP/1.1 client, so the harness needs nothing beyond the app's own dependencies"""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def post_json(self, path: str, payload: dict, token: str) -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode()
+        self.writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\nAuthorization: Bearer {token}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while size := int((await self.reader.readline()).strip(), 16):
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            await self.reader.readline()
+            data = b"".join(chunks)
+        else:
+            data = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            await self.close()
+        return status, data
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+async def seed(conn, run_id: str, auctions: int, bidders: int) -> dict:
+    """One tournament per auction; the same bidder users own a team in each"""
+    user_rows = await conn.fetch(
+        """
+        INSERT INTO users (email, password_hash, full_name, is_approved)
+        SELECT 'bench-load-' || $1 || '-' || i || '@example.invalid', 'x', 'Load ' || i, TRUE
+        FROM generate_series(0, $2) i
+        RETURNING id, email
+        """,
+        run_id, bidders
+    )
+    # The first user creates the tournaments and acts as every spectator
+    spectator, owners = user_rows[0], user_rows[1:]
+
+    seeded = []
+    for index in range(auctions):
+        tournament_id = await conn.fetchval(
+            "INSERT INTO tournaments (name, start_date, created_by) VALUES ($1, CURRENT_TIMESTAMP, $2) RETURNING id",
+            f"bench-load {run_id} {index}", spectator['id']
+        )
+        team_rows = await conn.fetch(
+            """
+            INSERT INTO teams (tournament_id, name, owner_id, budget, remaining_budget)
+            SELECT $1, 'load team ' || o.ord, o.id, 1000000000000, 1000000000000
+            FROM unnest($2::int[]) WITH ORDINALITY AS o(id, ord)
+            RETURNING id, owner_id
+            """,
+            tournament_id, [row['id'] for row in owners]
+        )
+        player_id = await conn.fetchval(
+            "INSERT INTO players (name, sport, position, base_price, rating) VALUES ($1, 'cricket', 'batsman', $2, 5) RETURNING id",
+            f"load player {run_id} {index}", BASE_PRICE
+        )
+        auction_id = await conn.fetchval(
+            """
+            INSERT INTO auctions (tournament_id, name, status, current_player_id, started_at)
+            VALUES ($1, $2, 'active', $3, CURRENT_TIMESTAMP) RETURNING id
+            """,
+            tournament_id, f"bench-load {run_id} {index}", player_id
+        )
+        await conn.execute("SELECT ensure_auction_partitions($1)", auction_id)
+        await conn.execute(
+            "INSERT INTO auction_players (auction_id, player_id, order_index, status) VALUES ($1, $2, 0, 'in_progress')",
+            auction_id, player_id
+        )
+        seeded.append({
+            "auction_id": auction_id,
+            "tournament_id": tournament_id,
+            "player_id": player_id,
+            "teams": {row['owner_id']: row['id'] for row in team_rows},
+        })
+
+    tokens = {row['id']: create_tokens(row['id'], row['email'], ["team_owner"]) for row in owners}
+    return {
+        "user_ids": [row['id'] for row in user_rows],
+        "spectator_token": create_tokens(spectator['id'], spectator['email'], ["viewer"]),
+        "owner_tokens": tokens,
+        "auctions": seeded,
+    }
+
+async def cleanup(conn, redis_client, data: dict):
+    auction_ids = [a["auction_id"] for a in data["auctions"]]
+    for auction_id in auction_ids:
+        keys = [key async for key in redis_client.scan_iter(f"auction:{auction_id}:*")]
+        if keys:
+            await redis_client.delete(*keys)
+    # Tournaments cascade to teams, auctions, bids and events
+    await conn.execute("DELETE FROM tournaments WHERE id = ANY($1::int[])", [a["tournament_id"] for a in data["auctions"]])
+    await conn.execute("DELETE FROM players WHERE id = ANY($1::int[])", [a["player_id"] for a in data["auctions"]])
+    await conn.execute("DELETE FROM users WHERE id = ANY($1::int[])", data["user_ids"])
+
+class Stats:
+    def __init__(self):
+        self.sent_at: Dict[Tuple[int, int, float], float] = {}
+        self.broadcast_ms: List[float] = []
+        self.request_ms: List[float] = []
+        self.tick_drift_ms: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.delivered = set()
+        self.accepted = 0
+
+    def count(self, status: str):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+async def listen(ws, auction_id: int, stats: Stats, stop: asyncio.Event, track_timer: bool):
+    last_tick = None
+    async for raw in ws:
+        if stop.is_set():
+            break
+        now = time.perf_counter()
+        event = json.loads(raw)
+        kind, data = event.get("type"), event.get("data") or {}
+        if kind == "BID_UPDATED":
+            key = (auction_id, data.get("team_id"), float(data.get("amount", 0)))
+            sent = stats.sent_at.get(key)
+            if sent is not None:
+                stats.broadcast_ms.append((now - sent) * 1000)
+                stats.delivered.add(key)
+        elif kind == "TIMER_TICK" and track_timer:
+            if last_tick is not None:
+                stats.tick_drift_ms.append(abs((now - last_tick) - 1.0) * 1000)
+            last_tick = now
+
+async def bidder(auction: dict, owner_id: int, token: str, args, stats: Stats, next_amount: dict,
+                 ws, stop: asyncio.Event):
+    http = HttpClient(args.base_url) if args.transport == "http" else None
+    team_id = auction["teams"][owner_id]
+    try:
+        while not stop.is_set():
+            next_amount[auction["auction_id"]] += BID_STEP
+            amount = next_amount[auction["auction_id"]]
+            payload = {"auction_id": auction["auction_id"], "player_id": auction["player_id"], "amount": amount}
+            start = time.perf_counter()
+            stats.sent_at[(auction["auction_id"], team_id, float(amount))] = start
+            try:
+                if http is not None:
+                    status, _ = await http.post_json("/api/v1/bids", payload, token)
+                    stats.request_ms.append((time.perf_counter() - start) * 1000)
+                    stats.count(str(status))
+                    if status == 200:
+                        stats.accepted += 1
+                else:
+                    await ws.send(json.dumps({"type": "PLACE_BID", "data": payload}))
+                    stats.count("sent")
+            except (OSError, ValueError, asyncio.IncompleteReadError, websockets.ConnectionClosed) as e:
+                stats.count(type(e).__name__)
+                if http is not None:
+                    await http.close()
+            await asyncio.sleep(args.bid_interval)
+    finally:
+        if http is not None:
+            await http.close()
+
+def server_rss(pid: Optional[int]) -> Optional[int]:
+    return psutil.Process(pid).memory_info().rss if pid else None
+
+async def run(args, data: dict) -> dict:
+    ws_base = args.base_url.replace("http", "ws", 1)
+    stats, stop = Stats(), asyncio.Event()
+    rss_before = server_rss(args.server_pid)
+
+    start = time.perf_counter()
+    sockets = []
+    for auction in data["auctions"]:
+        url = f"{ws_base}/ws/auction/{auction['auction_id']}?token="
+        for _ in range(args.spectators):
+            sockets.append((auction, None, await websockets.connect(url + data["spectator_token"], max_size=None)))
+        for owner_id, token in data["owner_tokens"].items():
+            sockets.append((auction, owner_id, await websockets.connect(url + token, max_size=None)))
+    connect_seconds = time.perf_counter() - start
+    await asyncio.sleep(1)
+    rss_after = server_rss(args.server_pid)
+
+    listeners, timer_tracked = [], set()
+    for auction, owner_id, ws in sockets:
+        track = auction["auction_id"] not in timer_tracked
+        timer_tracked.add(auction["auction_id"])
+        listeners.append(asyncio.create_task(listen(ws, auction["auction_id"], stats, stop, track)))
+
+    next_amount = {a["auction_id"]: BASE_PRICE for a in data["auctions"]}
+    bidders = [
+        asyncio.create_task(bidder(auction, owner_id, data["owner_tokens"][owner_id], args, stats, next_amount, ws, stop))
+        for auction, owner_id, ws in sockets if owner_id is not None
+    ]
+
+    bid_start = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*bidders)
+    elapsed = time.perf_counter() - bid_start
+    # Let in-flight broadcasts land before closing
+    await asyncio.sleep(1)
+    for _, _, ws in sockets:
+        await ws.close()
+    await asyncio.gather(*listeners, return_exceptions=True)
+
+    sent = sum(stats.statuses.values())
+    if args.transport == "ws":
+        # PLACE_BID has no reply on success; accepted bids are the ones that were broadcast
+        stats.accepted = len(stats.delivered)
+    memory = None
+    if rss_before is not None:
+        memory = {
+            "server_rss_before_mb": round(rss_before / 2**20, 1),
+            "server_rss_after_mb": round(rss_after / 2**20, 1),
+            "bytes_per_connection": round((rss_after - rss_before) / len(sockets)),
+        }
+    return {
+        "bids": {
+            "sent": sent,
+            "accepted": stats.accepted,
+            "statuses": stats.statuses,
+            "sent_per_sec": round(sent / elapsed, 1),
+            "accepted_per_sec": round(stats.accepted / elapsed, 1),
+        },
+        "request_ms": percentiles(stats.request_ms),
+        "bid_to_broadcast_ms": percentiles(stats.broadcast_ms),
+        "timer_drift_ms": percentiles(stats.tick_drift_ms),
+        "connections": {"count": len(sockets), "connect_seconds": round(connect_seconds, 2), "memory": memory},
+    }
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--dsn", default=settings.database_url)
+    parser.add_argument("--auctions", type=int, default=2)
+    parser.add_argument("--bidders", type=int, default=4, help="team owners per auction")
+    parser.add_argument("--spectators", type=int, default=50, help="watch-only sockets per auction")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of bidding")
+    parser.add_argument("--bid-interval", type=float, default=0.2, help="pause between one bidder's bids")
+    parser.add_argument("--transport", choices=("http", "ws"), default="http")
+    parser.add_argument("--server-pid", type=int, help="measure server RSS growth per connection")
+    parser.add_argument("--max-p99-ms", type=float, help="fail if bid-to-broadcast p99 exceeds this")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded auctions in place")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    conn = await asyncpg.connect(args.dsn)
+    redis_client = redis.from_url(settings.redis_url)
+    data = await seed(conn, run_id, args.auctions, args.bidders)
+    try:
+        results = await run(args, data)
+    finally:
+        if not args.keep:
+            await cleanup(conn, redis_client, data)
+        await redis_client.close()
+        await conn.close()
+
+    p99 = (results["bid_to_broadcast_ms"] or {}).get("p99")
+    failed = args.max_p99_ms is not None and (p99 is None or p99 > args.max_p99_ms)
+    report = {
+        "commit": git_commit(),
+        "run_id": run_id,
+        "config": {
+            "auctions": args.auctions,
+            "bidders": args.bidders,
+            "spectators": args.spectators,
+            "duration": args.duration,
+            "bid_interval": args.bid_interval,
+            "transport": args.transport,
+        },
+        **results,
+        "max_p99_ms": args.max_p99_ms,
+        "failed": failed,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
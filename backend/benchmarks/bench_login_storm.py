@@ -0,0 +1,70 @@
+"""Login-storm benchmark: event-loop stall while many bcrypt verifications run.
+
+Compares verifying inline on the event loop (the old behaviour) with the
+bounded hashing executor used by ``auth_service``. A ticker task sleeps 10ms
+in a loop and records how late it wakes up, which is what timer ticks and
+WebSocket broadcasts experience during a burst of logins.
+
+    python -m benchmarks.bench_login_storm --logins 50 --rounds 12
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import bcrypt
+
+from app.services.auth_service import PasswordHasher, _validate_password_sync
+
+TICK = 0.01
+
+async def ticker(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+async def run(label: str, verify, logins: int, hashed: str) -> dict:
+    lags, stop = [], asyncio.Event()
+    tick_task = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(verify("password123", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await tick_task
+    lags.sort()
+    return {
+        "mode": label,
+        "logins": logins,
+        "all_valid": all(results),
+        "wall_seconds": round(elapsed, 3),
+        "logins_per_sec": round(logins / elapsed, 1),
+        "max_loop_lag_ms": round(lags[-1] * 1000, 1) if lags else None,
+        "p99_loop_lag_ms": round(lags[int(len(lags) * 0.99) - 1] * 1000, 1) if lags else None,
+    }
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    hashed = bcrypt.hashpw(b"password123", bcrypt.gensalt(args.rounds)).decode()
+
+    async def inline(plain, hashed_password):
+        return _validate_password_sync(plain, hashed_password)
+
+    hasher = PasswordHasher(workers=args.workers, max_pending=args.logins)
+    results = [
+        await run("inline", inline, args.logins, hashed),
+        await run(f"executor[{args.workers}]", hasher.verify, args.logins, hashed),
+    ]
+    hasher.shutdown()
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
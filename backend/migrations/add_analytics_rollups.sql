@@ -0,0 +1,64 @@
+-- Per-auction analytics rollups, maintained incrementally by
+-- app/repositories/analytics_rollup_repo.py as bids are accepted and lots close.
+-- An auction has rollups once its auction_stats row exists; older auctions can
+-- be backfilled with scripts/rebuild_analytics_rollups.py.
+
+CREATE TABLE IF NOT EXISTS auction_stats (
+    auction_id INTEGER PRIMARY KEY,
+    total_players INTEGER NOT NULL DEFAULT 0,
+    players_sold INTEGER NOT NULL DEFAULT 0,
+    players_unsold INTEGER NOT NULL DEFAULT 0,
+    total_spent DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    highest_price DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    total_bids INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS auction_team_stats (
+    auction_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    bids_count INTEGER NOT NULL DEFAULT 0,
+    players_bid_on INTEGER NOT NULL DEFAULT 0,
+    players_won INTEGER NOT NULL DEFAULT 0,
+    spent DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (auction_id, team_id),
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE,
+    FOREIGN KEY (team_id) REFERENCES teams(id) ON DELETE CASCADE
+);
+
+-- position is '' for players without one (primary key columns cannot be NULL)
+CREATE TABLE IF NOT EXISTS auction_position_stats (
+    auction_id INTEGER NOT NULL,
+    position VARCHAR(100) NOT NULL,
+    players_count INTEGER NOT NULL DEFAULT 0,
+    total_spent DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    max_price DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (auction_id, position),
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS auction_lot_stats (
+    auction_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'open',
+    bids_count INTEGER NOT NULL DEFAULT 0,
+    highest_bid DECIMAL(15, 2),
+    sold_to_team_id INTEGER,
+    sold_price DECIMAL(15, 2),
+    PRIMARY KEY (auction_id, player_id),
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE,
+    FOREIGN KEY (player_id) REFERENCES players(id) ON DELETE CASCADE
+);
+
+-- Distinct (lot, team) pairs, so players_bid_on stays exact without COUNT(DISTINCT)
+CREATE TABLE IF NOT EXISTS auction_lot_team_stats (
+    auction_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    bids_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (auction_id, player_id, team_id),
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_lot_stats_sold ON auction_lot_stats(auction_id, sold_price DESC) WHERE status = 'sold';
+CREATE INDEX IF NOT EXISTS idx_lot_stats_unsold ON auction_lot_stats(auction_id) WHERE status = 'unsold';
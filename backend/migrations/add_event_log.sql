@@ -0,0 +1,50 @@
+-- Append-only auction event log with per-auction sequence numbers and state
+-- snapshots (see app/services/event_recorder.py). Existing rows are numbered
+-- in timestamp order.
+
+ALTER TABLE auction_events ADD COLUMN IF NOT EXISTS seq BIGINT;
+
+UPDATE auction_events e
+SET seq = numbered.seq
+FROM (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY auction_id ORDER BY timestamp, id) AS seq
+    FROM auction_events
+) numbered
+WHERE e.id = numbered.id AND e.seq IS NULL;
+
+ALTER TABLE auction_events ALTER COLUMN seq SET NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_auction_events_seq ON auction_events(auction_id, seq);
+
+-- Last assigned sequence number per auction; the row lock taken by the
+-- upsert serializes appends for one auction without blocking others
+CREATE TABLE IF NOT EXISTS auction_event_heads (
+    auction_id INTEGER PRIMARY KEY,
+    last_seq BIGINT NOT NULL,
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE
+);
+
+INSERT INTO auction_event_heads (auction_id, last_seq)
+SELECT auction_id, MAX(seq) FROM auction_events GROUP BY auction_id
+ON CONFLICT (auction_id) DO UPDATE SET last_seq = GREATEST(auction_event_heads.last_seq, EXCLUDED.last_seq);
+
+-- Folded auction state as of an event, written every EVENT_SNAPSHOT_INTERVAL events
+CREATE TABLE IF NOT EXISTS auction_snapshots (
+    auction_id INTEGER NOT NULL,
+    seq BIGINT NOT NULL,
+    state JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (auction_id, seq),
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE
+);
+
+-- Events are never rewritten; deletes stay allowed for auction cascades
+CREATE OR REPLACE FUNCTION auction_events_immutable() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'auction_events is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_auction_events_immutable ON auction_events;
+CREATE TRIGGER trg_auction_events_immutable
+    BEFORE UPDATE ON auction_events
+    FOR EACH ROW EXECUTE FUNCTION auction_events_immutable();
@@ -12,6 +12,7 @@ CREATE INDEX IF NOT EXISTS idx_auction_players_team ON auction_players(sold_to_t
 
 -- Teams indexes
 CREATE INDEX IF NOT EXISTS idx_teams_tournament ON teams(tournament_id);
+CREATE INDEX IF NOT EXISTS idx_teams_tournament_id ON teams(tournament_id, id);
 CREATE INDEX IF NOT EXISTS idx_teams_owner ON teams(owner_id);
 
 -- Auctions indexes
@@ -31,9 +32,29 @@ CREATE INDEX IF NOT EXISTS idx_auto_bids_active ON auto_bids(auction_id, player_
 CREATE INDEX IF NOT EXISTS idx_auto_bids_team ON auto_bids(team_id);
 
 -- Auction events indexes
-CREATE INDEX IF NOT EXISTS idx_events_auction ON auction_events(auction_id);
+-- Replay pages walk an auction's events in (timestamp, id) order, optionally
+-- bounded by a time range; supersedes the auction_id-only index
+CREATE INDEX IF NOT EXISTS idx_events_auction_timestamp ON auction_events(auction_id, timestamp, id);
+DROP INDEX IF EXISTS idx_events_auction;
 CREATE INDEX IF NOT EXISTS idx_events_timestamp ON auction_events(timestamp);
 
 -- Composite indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_bids_auction_amount ON bids(auction_id, amount DESC);
 CREATE INDEX IF NOT EXISTS idx_auction_players_sold ON auction_players(auction_id, status, sold_to_team_id);
+
+-- Users indexes
+CREATE INDEX IF NOT EXISTS idx_users_approved ON users(is_approved, id);
+CREATE INDEX IF NOT EXISTS idx_user_roles_role ON user_roles(role_id, user_id);
+
+-- Player listing: keyset order (name, id), optionally narrowed by sport/position
+CREATE INDEX IF NOT EXISTS idx_players_name_id ON players(name, id);
+CREATE INDEX IF NOT EXISTS idx_players_sport_position_name ON players(sport, position, name, id);
+CREATE INDEX IF NOT EXISTS idx_players_sport_rating ON players(sport, rating);
+CREATE INDEX IF NOT EXISTS idx_players_sport_price ON players(sport, base_price);
+
+-- Tournament listing: keyset order (created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_tournaments_created ON tournaments(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tournaments_status_created ON tournaments(status, created_at DESC, id DESC);
+
+-- Per-team bid aggregates for analytics (index-only scan of one auction's bids)
+CREATE INDEX IF NOT EXISTS idx_bids_auction_team_player ON bids(auction_id, team_id, player_id);
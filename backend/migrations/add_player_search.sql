@@ -0,0 +1,22 @@
+-- Player search: full-text over name/position/sport/selected metadata keys,
+-- plus trigram matching on name for typo tolerance
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Expression index target; must stay IMMUTABLE and be called with the same
+-- arguments as app/repositories/player_repo.py:search_players
+CREATE OR REPLACE FUNCTION player_search_document(p_name TEXT, p_position TEXT, p_sport TEXT, p_metadata JSONB)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple', coalesce(p_name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(p_position, '') || ' ' || coalesce(p_sport, '')), 'B')
+        || setweight(to_tsvector('simple',
+               coalesce(p_metadata->>'team', '') || ' ' ||
+               coalesce(p_metadata->>'country', '') || ' ' ||
+               coalesce(p_metadata->>'nationality', '') || ' ' ||
+               coalesce(p_metadata->>'role', '')), 'C')
+$$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
+
+CREATE INDEX IF NOT EXISTS idx_players_search
+    ON players USING GIN (player_search_document(name, position, sport, metadata));
+CREATE INDEX IF NOT EXISTS idx_players_name_trgm
+    ON players USING GIN (name gin_trgm_ops);
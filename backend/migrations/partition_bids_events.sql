@@ -0,0 +1,118 @@
+-- Partition bids and auction_events by auction (LIST on auction_id, one
+-- partition per auction). Every hot-path query filters on auction_id, so it
+-- is pruned to the live auction's partition and only touches that
+-- partition's indexes, which stay small and cache-resident however much
+-- history accumulates. Completed auctions are compacted in place by
+-- POST /admin/auctions/{id}/archive (see app/services/archive_service.py).
+--
+-- Requires PostgreSQL 13+ (row triggers on partitioned tables). Run after
+-- add_indexes.sql and add_event_log.sql; the conversion copies both tables.
+
+BEGIN;
+
+ALTER TABLE bids RENAME TO bids_unpartitioned;
+ALTER TABLE auction_events RENAME TO auction_events_unpartitioned;
+
+-- The partition key has to be part of every unique constraint
+CREATE TABLE bids (
+    id INTEGER NOT NULL DEFAULT nextval('bids_id_seq'),
+    auction_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    amount DECIMAL(15, 2) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (auction_id, id),
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE,
+    FOREIGN KEY (player_id) REFERENCES players(id) ON DELETE CASCADE,
+    FOREIGN KEY (team_id) REFERENCES teams(id) ON DELETE CASCADE
+) PARTITION BY LIST (auction_id);
+
+CREATE TABLE auction_events (
+    id INTEGER NOT NULL DEFAULT nextval('auction_events_id_seq'),
+    auction_id INTEGER NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    event_data JSONB NOT NULL,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    seq BIGINT NOT NULL,
+    PRIMARY KEY (auction_id, id),
+    FOREIGN KEY (auction_id) REFERENCES auctions(id) ON DELETE CASCADE
+) PARTITION BY LIST (auction_id);
+
+ALTER SEQUENCE bids_id_seq OWNED BY bids.id;
+ALTER SEQUENCE auction_events_id_seq OWNED BY auction_events.id;
+
+-- Rows for auctions that have no partition yet (e.g. auctions inserted by
+-- hand); ensure_auction_partitions moves them out
+CREATE TABLE bids_default PARTITION OF bids DEFAULT;
+CREATE TABLE auction_events_default PARTITION OF auction_events DEFAULT;
+
+-- Indexes on the parents are created on every partition. These replace the
+-- bids/auction_events indexes from add_indexes.sql and add_event_log.sql,
+-- which went with the renamed tables: idx_bids_auction_player, idx_bids_team,
+-- idx_bids_created_at, idx_bids_auction_amount, idx_bids_auction_team_player,
+-- idx_events_auction_timestamp, idx_events_timestamp and idx_auction_events_seq
+-- (idx_events_auction was already dropped by add_indexes.sql)
+DROP INDEX IF EXISTS idx_bids_auction_player;
+DROP INDEX IF EXISTS idx_bids_team;
+DROP INDEX IF EXISTS idx_bids_created_at;
+DROP INDEX IF EXISTS idx_bids_auction_amount;
+DROP INDEX IF EXISTS idx_bids_auction_team_player;
+DROP INDEX IF EXISTS idx_events_auction;
+DROP INDEX IF EXISTS idx_events_auction_timestamp;
+DROP INDEX IF EXISTS idx_events_timestamp;
+DROP INDEX IF EXISTS idx_auction_events_seq;
+
+CREATE INDEX idx_bids_auction_player ON bids(auction_id, player_id);
+CREATE INDEX idx_bids_team ON bids(team_id);
+CREATE INDEX idx_bids_created_at ON bids(created_at DESC);
+CREATE INDEX idx_bids_auction_amount ON bids(auction_id, amount DESC);
+CREATE INDEX idx_bids_auction_team_player ON bids(auction_id, team_id, player_id);
+CREATE INDEX idx_events_auction_timestamp ON auction_events(auction_id, timestamp, id);
+CREATE INDEX idx_events_timestamp ON auction_events(timestamp);
+CREATE UNIQUE INDEX idx_auction_events_seq ON auction_events(auction_id, seq);
+
+DROP TRIGGER IF EXISTS trg_auction_events_immutable ON auction_events_unpartitioned;
+CREATE TRIGGER trg_auction_events_immutable
+    BEFORE UPDATE ON auction_events
+    FOR EACH ROW EXECUTE FUNCTION auction_events_immutable();
+
+-- Give an auction its own bids/auction_events partitions (idempotent).
+-- The partition is built detached and then attached, which only takes a
+-- SHARE UPDATE EXCLUSIVE lock on the parent, so live bidding on other
+-- auctions is not blocked.
+CREATE OR REPLACE FUNCTION ensure_auction_partitions(p_auction_id INTEGER) RETURNS void AS $$
+DECLARE
+    parent TEXT;
+    part TEXT;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['bids', 'auction_events'] LOOP
+        part := format('%s_a%s', parent, p_auction_id);
+        IF to_regclass(part) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part, parent);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM %I WHERE auction_id = $1 RETURNING *) INSERT INTO %I SELECT * FROM moved',
+                parent || '_default', part
+            ) USING p_auction_id;
+            EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES IN (%s)', parent, part, p_auction_id);
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_auction_partitions(id) FROM auctions;
+
+INSERT INTO bids (id, auction_id, player_id, team_id, amount, created_at)
+SELECT id, auction_id, player_id, team_id, amount, created_at FROM bids_unpartitioned;
+
+INSERT INTO auction_events (id, auction_id, event_type, event_data, timestamp, seq)
+SELECT id, auction_id, event_type, event_data, timestamp, seq FROM auction_events_unpartitioned;
+
+DROP TABLE bids_unpartitioned;
+DROP TABLE auction_events_unpartitioned;
+
+ALTER TABLE auctions ADD COLUMN IF NOT EXISTS archived_at TIMESTAMP;
+
+COMMIT;
+
+ANALYZE bids;
+ANALYZE auction_events;
@@ -0,0 +1,52 @@
+"""Move inline data-URL profile photos into the blob store.
+
+Rows written before the blob store kept the whole image base64-encoded in
+users.profile_photo. This rewrites each one to its short media URL.
+
+    cd backend && python -m scripts.migrate_profile_photos
+"""
+import asyncio
+import base64
+import logging
+
+from app.db.connection import init_db, close_db, fetch_all, execute
+from app.services.blob_store import store_image, media_url
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+
+async def migrate():
+    await init_db()
+    migrated = failed = 0
+    last_id = 0
+    try:
+        while True:
+            rows = await fetch_all(
+                """
+                SELECT id, profile_photo FROM users
+                WHERE id > $1 AND profile_photo LIKE 'data:%'
+                ORDER BY id LIMIT $2
+                """,
+                last_id, BATCH_SIZE
+            )
+            if not rows:
+                break
+            for row in rows:
+                last_id = row['id']
+                try:
+                    encoded = row['profile_photo'].split(",", 1)[1]
+                    key = await store_image(base64.b64decode(encoded))
+                except Exception as e:
+                    logger.warning("Skipping user %s: %s", row['id'], e)
+                    failed += 1
+                    continue
+                await execute("UPDATE users SET profile_photo = $1 WHERE id = $2", media_url(key), row['id'])
+                migrated += 1
+    finally:
+        await close_db()
+    print(f"Migrated {migrated} photos, skipped {failed}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate())
@@ -0,0 +1,36 @@
+"""Backfill or repair per-auction analytics rollups from bids and auction_players.
+
+Auctions created before migrations/add_analytics_rollups.sql have no rollup
+rows and are served by the live analytics queries until rebuilt.
+
+    cd backend && python -m scripts.rebuild_analytics_rollups [auction_id ...]
+
+With no ids, every auction without rollups is rebuilt. Rebuild an auction
+only while it is not taking bids.
+"""
+import asyncio
+import sys
+
+from app.db.connection import init_db, close_db, fetch_all
+from app.repositories import analytics_rollup_repo
+
+async def rebuild(auction_ids):
+    await init_db()
+    try:
+        if not auction_ids:
+            rows = await fetch_all(
+                """
+                SELECT a.id FROM auctions a
+                WHERE NOT EXISTS (SELECT 1 FROM auction_stats s WHERE s.auction_id = a.id)
+                ORDER BY a.id
+                """
+            )
+            auction_ids = [row['id'] for row in rows]
+        for auction_id in auction_ids:
+            await analytics_rollup_repo.rebuild(auction_id)
+            print(f"Rebuilt rollups for auction {auction_id}")
+    finally:
+        await close_db()
+
+if __name__ == "__main__":
+    asyncio.run(rebuild([int(arg) for arg in sys.argv[1:]]))
@@ -4,6 +4,7 @@ import axios from 'axios';
 
 interface ReplayEvent {
   id: number;
+  seq: number;
   event_type: string;
   event_data: any;
   timestamp: string;
@@ -36,8 +37,16 @@ export const AuctionReplay: React.FC<AuctionReplayProps> = ({ auctionId }) => {
 
   const loadEvents = async () => {
     try {
-      const { data } = await axios.get(`/api/v1/replay/auctions/${auctionId}/events`);
-      setEvents(data);
+      const loaded: ReplayEvent[] = [];
+      let after: string | undefined;
+      do {
+        const response = await axios.get(`/api/v1/replay/auctions/${auctionId}/events`, {
+          params: { after, limit: 5000 },
+        });
+        loaded.push(...response.data);
+        after = response.headers['x-next-cursor'];
+      } while (after);
+      setEvents(loaded);
     } catch (err) {
       console.error('Failed to load events:', err);
     } finally {
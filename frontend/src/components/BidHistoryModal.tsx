@@ -30,9 +30,15 @@ export const BidHistoryModal: React.FC<BidHistoryModalProps> = ({
   const loadBids = async () => {
     setLoading(true);
     try {
-      const response = await fetch(`/api/v1/bids/auction/${auctionId}/player/${playerId}`);
-      const data = await response.json();
-      setBids(data);
+      const loaded: BidWithTeam[] = [];
+      let after: string | null = null;
+      do {
+        const query = after ? `?after=${encodeURIComponent(after)}&limit=1000` : '?limit=1000';
+        const response = await fetch(`/api/v1/bids/auction/${auctionId}/player/${playerId}${query}`);
+        loaded.push(...(await response.json()));
+        after = response.headers.get('X-Next-Cursor');
+      } while (after);
+      setBids(loaded);
     } catch (err) {
       console.error('Failed to load bids:', err);
     } finally {
@@ -13,6 +13,20 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// Keyset-paged list endpoints: follow X-Next-Cursor until the last page
+const PAGE_SIZE = 1000;
+
+async function listAll<T>(url: string): Promise<{ data: T[] }> {
+  const data: T[] = [];
+  let after: string | undefined;
+  do {
+    const response = await api.get<T[]>(url, { params: { after, limit: PAGE_SIZE } });
+    data.push(...response.data);
+    after = response.headers['x-next-cursor'];
+  } while (after);
+  return { data };
+}
+
 // Auth
 export const authApi = {
   login: (email: string, password: string) =>
@@ -37,7 +51,7 @@ export const authApi = {
 
 // Tournaments
 export const tournamentApi = {
-  list: () => api.get<Tournament[]>('/tournaments'),
+  list: () => listAll<Tournament>('/tournaments'),
   get: (id: number) => api.get<Tournament>(`/tournaments/${id}`),
   create: (data: Partial<Tournament>) => api.post<Tournament>('/tournaments', data),
   update: (id: number, data: Partial<Tournament>) => api.patch<Tournament>(`/tournaments/${id}`, data),
@@ -45,7 +59,7 @@ export const tournamentApi = {
 
 // Teams
 export const teamApi = {
-  list: (tournamentId: number) => api.get<Team[]>(`/teams/tournament/${tournamentId}`),
+  list: (tournamentId: number) => listAll<Team>(`/teams/tournament/${tournamentId}`),
   listMyTeams: () => api.get<Team[]>('/teams/my-teams'),
   get: (id: number) => api.get<Team>(`/teams/${id}`),
   create: (data: Partial<Team>) => api.post<Team>('/teams', data),
@@ -53,7 +67,7 @@ export const teamApi = {
 
 // Players
 export const playerApi = {
-  list: () => api.get<Player[]>('/players'),
+  list: () => listAll<Player>('/players'),
   get: (id: number) => api.get<Player>(`/players/${id}`),
   create: (data: Partial<Player>) => api.post<Player>('/players', data),
   update: (id: number, data: Partial<Player>) => api.patch<Player>(`/players/${id}`, data),
@@ -83,7 +97,7 @@ export const autoBidApi = {
 
 // Admin
 export const adminApi = {
-  listUsers: () => api.get<User[]>('/admin/users'),
+  listUsers: () => listAll<User>('/admin/users'),
   deleteUser: (userId: number) => api.delete(`/admin/users/${userId}`),
   approveUser: (userId: number) => api.post(`/admin/users/${userId}/approve`),
   updateRoles: (userId: number, roles: string[]) => api.put(`/admin/users/${userId}/roles`, roles),